@@ -0,0 +1,250 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import toml
+
+from bench.catalog_data import DEFAULT_CUSTOM, DEFAULT_FAVORITES, generate_catalog, generate_user_state
+from core.catalog_store import MEMORY_DATABASE, CatalogStore
+from core.config_manager import ConfigManager
+from core.model_list_logic import filter_models, merge_models
+from core.model_service import ModelService
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.25
+# (收藏数, 隐藏数, 自定义模型数)，隐藏数为 None 时取目录的 10%
+DEFAULT_PROFILE = (DEFAULT_FAVORITES, None, DEFAULT_CUSTOM)
+# 绝对差值低于该值时视为计时噪声，不判定为回退
+MIN_REGRESSION_MS = 0.1
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+# (名称, 搜索词, 仅收藏, 仅隐藏)
+QUERY_PATTERNS = (
+    ("all", "", False, False),
+    ("short", "q", False, False),
+    ("org", "qwen/", False, False),
+    ("substring", "instruct", False, False),
+    ("miss", "no-such-model", False, False),
+    ("favorites", "", True, False),
+    ("hidden", "", False, True),
+)
+
+# 模拟逐字输入再逐字删除
+TYPING_SEQUENCE = ("q", "qw", "qwe", "qwen", "qwen3", "qwen3-", "qwen3-8", "qwen3-", "qwen3", "qwen")
+
+
+def measure(func, repeat, setup=None):
+    """运行 repeat 次并返回耗时的最小值与中位数 (毫秒)，setup 不计入耗时。"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+    }
+
+
+def create_config_manager(directory, user_state):
+    config_path = Path(directory) / "config.toml"
+    config_path.write_text(toml.dumps(user_state), encoding="utf-8")
+    return ConfigManager(config_path)
+
+
+def bench_store(config_manager, api_models, repeat):
+    """SQLite 存储后端：目录写入、未命中缓存的筛选与计数。"""
+    results = {}
+    config_manager.attach_store(CatalogStore(MEMORY_DATABASE))
+    service = ModelService(config_manager)
+
+    store = config_manager.get_store()
+
+    def reset_catalog():
+        service.reset_store_sync()
+        store.invalidate_catalog()
+
+    results["store/sync"] = measure(lambda: service.sync_store(store, api_models), repeat, setup=reset_catalog)
+    # 重启后目录未变化：只计算摘要，不重写
+    results["store/sync_unchanged"] = measure(
+        lambda: service.sync_store(store, api_models),
+        repeat,
+        setup=service.reset_store_sync,
+    )
+    for name, query, favorites_only, hidden_only in QUERY_PATTERNS:
+        results[f"store/build_items/{name}"] = measure(
+            lambda: service.build_model_items(api_models, query, favorites_only, hidden_only),
+            repeat,
+            setup=service.query_cache.clear,
+        )
+    results["store/count"] = measure(lambda: service.count_models(api_models, "instruct"), repeat)
+    results["store/count_by_org"] = measure(lambda: service.count_models_by_org(api_models), repeat)
+    store.close()
+    config_manager.attach_store(None)
+    return results
+
+
+def bench_size(size, repeat, directory, store=False, profile=DEFAULT_PROFILE):
+    api_models = generate_catalog(size)
+    favorites, hidden, custom = profile
+    user_state = generate_user_state(api_models, favorites, hidden, custom)
+    custom_models = user_state["custom_models"]
+    config_manager = create_config_manager(directory, user_state)
+    merged = merge_models(api_models, custom_models)
+    results = {}
+
+    results["merge"] = measure(lambda: merge_models(api_models, custom_models), repeat)
+
+    for name, query, favorites_only, hidden_only in QUERY_PATTERNS:
+        results[f"filter/{name}"] = measure(
+            lambda: filter_models(
+                merged,
+                query,
+                favorites_only,
+                hidden_only,
+                config_manager.is_favorite,
+                config_manager.is_invisible,
+            ),
+            repeat,
+        )
+
+    # 冷启动：包含搜索索引的构建
+    results["build_items/cold"] = measure(
+        lambda: ModelService(config_manager).build_model_items(api_models, "", False, False),
+        repeat,
+    )
+
+    # 热路径：索引已构建，每次运行前清空查询缓存
+    service = ModelService(config_manager)
+    service.get_search_index(api_models)
+    for name, query, favorites_only, hidden_only in QUERY_PATTERNS:
+        results[f"build_items/{name}"] = measure(
+            lambda: service.build_model_items(api_models, query, favorites_only, hidden_only),
+            repeat,
+            setup=service.query_cache.clear,
+        )
+
+    def type_queries():
+        for query in TYPING_SEQUENCE:
+            service.build_model_items(api_models, query, False, False)
+
+    results["build_items/typing"] = measure(type_queries, repeat, setup=service.query_cache.clear)
+    results["count_by_org"] = measure(lambda: service.count_models_by_org(api_models), repeat)
+
+    if store:
+        results.update(bench_store(config_manager, api_models, repeat))
+    return results
+
+
+def profile_label(profile):
+    """用户状态规模的标签；默认规模不加标签，结果键与已有基线保持一致。"""
+    if profile == DEFAULT_PROFILE:
+        return ""
+    favorites, hidden, custom = profile
+    return f"fav{favorites}-hidden{'10%' if hidden is None else hidden}-custom{custom}/"
+
+
+def build_profiles(favorites, hidden, custom):
+    """收藏、隐藏与自定义模型数量的所有组合。"""
+    return [
+        (favorite_count, hidden_count, custom_count)
+        for favorite_count in favorites
+        for hidden_count in hidden
+        for custom_count in custom
+    ]
+
+
+def run(sizes, repeat, store=False, profiles=(DEFAULT_PROFILE,)):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for profile in profiles:
+                label = profile_label(profile)
+                for case, timing in bench_size(size, repeat, directory, store, profile).items():
+                    results[f"{size}/{label}{case}"] = timing
+                    print(f"{size:>7} {label + case:<48} min {timing['min_ms']:>10.3f} ms  "
+                          f"median {timing['median_ms']:>10.3f} ms")
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": repeat,
+            "profiles": [list(profile) for profile in profiles],
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold):
+    """按中位数与基线比较，返回变慢超过 threshold 的用例。"""
+    regressions = []
+    print(f"\n{'用例':<56}{'基线 (ms)':>12}{'当前 (ms)':>12}{'变化':>10}")
+    for key, timing in current["results"].items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        before = base["median_ms"]
+        after = timing["median_ms"]
+        change = (after - before) / before if before > 0 else 0.0
+        regressed = change > threshold and after - before > MIN_REGRESSION_MS
+        marker = "  <-- 变慢" if regressed else ""
+        print(f"{key:<56}{before:>12.3f}{after:>12.3f}{change:>+10.1%}{marker}")
+        if regressed:
+            regressions.append(key)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.catalog_bench",
+        description="模型目录合并、筛选与列表项构建的性能基准",
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--output", type=Path, default=RESULTS_DIR / "latest.json")
+    parser.add_argument("--baseline", type=Path, default=RESULTS_DIR / "baseline.json")
+    parser.add_argument("--update-baseline", action="store_true", help="把本次结果保存为新的基线")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="中位数变慢超过该比例视为回退 (默认 0.25)")
+    parser.add_argument("--store", action="store_true", help="同时测量 SQLite 存储后端 (store/*)")
+    parser.add_argument("--favorites", type=int, nargs="+", default=[DEFAULT_FAVORITES],
+                        help="收藏列表的长度，可给出多个，例如 --favorites 0 100 5000")
+    parser.add_argument("--hidden", type=int, nargs="+", default=[None],
+                        help="隐藏列表的长度，可给出多个 (默认为目录的 10%%)")
+    parser.add_argument("--custom", type=int, nargs="+", default=[DEFAULT_CUSTOM],
+                        help="自定义模型列表的长度，可给出多个")
+    args = parser.parse_args(argv)
+
+    profiles = build_profiles(args.favorites, args.hidden, args.custom)
+    current = run(args.sizes, max(args.repeat, 1), args.store, profiles)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(current, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    exit_code = 0
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(current, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n已更新基线: {args.baseline}")
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} 个用例比基线慢 {args.threshold:.0%} 以上")
+            exit_code = 1
+    else:
+        print(f"\n未找到基线 {args.baseline}，可使用 --update-baseline 生成")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import random
+
+# 仿照 ModelScope 推理目录的组织名、模型系列与后缀
+ORGS = (
+    "Qwen", "deepseek-ai", "LLM-Research", "PaddlePaddle", "mistralai", "ZhipuAI",
+    "MiniMax", "moonshotai", "stepfun-ai", "XGenerationLab", "Shanghai_AI_Laboratory",
+    "opencompass", "Menlo", "XiaomiMiMo", "baichuan-inc", "01ai", "internlm", "THUDM",
+)
+FAMILIES = (
+    "Qwen3", "Qwen2.5", "Qwen2.5-Coder", "Qwen2.5-VL", "QwQ", "DeepSeek-R1", "DeepSeek-V3",
+    "DeepSeek-R1-Distill-Qwen", "Llama-4", "Meta-Llama-3.1", "ERNIE-4.5", "Mistral-Large",
+    "GLM-4", "MiniMax-M1", "Kimi-K2", "step3", "XiYanSQL-QwenCoder", "Intern-S1", "MiMo",
+    "Baichuan2", "Yi-1.5", "internlm3",
+)
+SIZES = ("0.6B", "1.5B", "1.7B", "3B", "4B", "7B", "8B", "14B", "30B-A3B", "32B", "72B", "235B-A22B")
+SUFFIXES = ("", "-Instruct", "-Chat", "-Thinking", "-Instruct-1M", "-Preview", "-AWQ", "-FP8", "-GGUF", "-2507")
+
+# 默认的用户状态规模：收藏与自定义模型为固定个数，隐藏为目录的一定比例
+DEFAULT_FAVORITES = 50
+DEFAULT_HIDDEN_RATIO = 0.1
+DEFAULT_CUSTOM = 20
+
+
+def generate_catalog(size, seed=0):
+    """生成 size 个互不重复、形如 "组织/系列-规模-后缀" 的模型 ID，结果可复现。"""
+    rng = random.Random(seed)
+    models = []
+    seen = set()
+    serial = 0
+    while len(models) < size:
+        model_id = (
+            f"{rng.choice(ORGS)}/{rng.choice(FAMILIES)}-{rng.choice(SIZES)}{rng.choice(SUFFIXES)}"
+        )
+        if model_id in seen:
+            # 组合用尽后追加版本号，保证任意规模下都能生成足够多的 ID
+            serial += 1
+            model_id = f"{model_id}-v{serial}"
+        seen.add(model_id)
+        models.append(model_id)
+    return models
+
+
+def generate_user_state(models, favorites=DEFAULT_FAVORITES, hidden=None, custom=DEFAULT_CUSTOM, seed=0):
+    """生成收藏、隐藏与自定义模型列表。
+
+    favorites/hidden/custom 为各列表的长度，收藏与隐藏不超过目录大小；hidden 为 None 时隐藏目录的 10%。
+    其中约四分之一的自定义模型与目录重复，用于覆盖 merge_models 的去重分支。
+    """
+    if hidden is None:
+        hidden = int(len(models) * DEFAULT_HIDDEN_RATIO)
+    rng = random.Random(seed + 1)
+    favorite_ids = rng.sample(models, min(favorites, len(models)))
+    hidden_ids = rng.sample(models, min(hidden, len(models)))
+    # 重复项计入 custom 的长度之内
+    overlap = min(custom // 4, len(models))
+    custom_ids = [f"custom-org/private-model-{i}" for i in range(custom - overlap)]
+    custom_ids.extend(rng.sample(models, overlap))
+    return {
+        "favorites": favorite_ids,
+        "invisible": hidden_ids,
+        "custom_models": custom_ids,
+    }
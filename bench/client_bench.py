@@ -0,0 +1,99 @@
+import argparse
+import statistics
+import sys
+import time
+
+from bench.stub_server import StubOptions, StubServer
+from core import async_runtime, http_session
+from core.errors import CoreError
+from core.modelscope_client import ModelScopeClient
+from core.modelscope_service import ModelScopeService
+
+API_KEY = "bench-key"
+
+
+def timed(func):
+    started = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def bench_list_models(client, repeat):
+    """完整拉取目录与携带 ETag 的条件请求 (304) 各执行 repeat 次，注入的错误只计数。"""
+    full = []
+    conditional = []
+    failed = 0
+    etag = None
+    for _ in range(repeat):
+        try:
+            result, elapsed = timed(lambda: client.list_models(API_KEY))
+        except CoreError:
+            failed += 1
+            continue
+        full.append(elapsed)
+        etag = result["etag"]
+    for _ in range(repeat if etag else 0):
+        try:
+            _, elapsed = timed(lambda: client.list_models(API_KEY, etag))
+        except CoreError:
+            failed += 1
+            continue
+        conditional.append(elapsed)
+    return full, conditional, failed
+
+
+def format_median(samples):
+    return f"{statistics.median(samples):8.1f} ms" if samples else "     n/a"
+
+
+def bench_sweep(service, models, concurrency):
+    results, elapsed = timed(lambda: service.sweep_quota(models, API_KEY, concurrency))
+    failed = sum(1 for result in results if not result["ok"] or result.get("status_code") != 200)
+    return elapsed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.client_bench",
+        description="使用本地替身服务测量模型目录拉取与批量额度检查的耗时",
+    )
+    parser.add_argument("--models", type=int, default=10000, help="替身服务目录中的模型数量")
+    parser.add_argument("--sweep", type=int, default=64, help="批量额度检查的模型数量")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency", type=float, default=20.0, help="服务端延迟 (毫秒)")
+    parser.add_argument("--jitter", type=float, default=5.0, help="服务端延迟抖动 (毫秒)")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    options = StubOptions(
+        catalog_size=args.models,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        user_limit=10 ** 9,
+        model_limit=10 ** 9,
+    )
+    with StubServer(options=options) as server:
+        client = ModelScopeClient(base_url=server.base_url)
+        service = ModelScopeService(client=client)
+
+        full, conditional, failed = bench_list_models(client, max(args.repeat, 1))
+        print(f"list_models ({args.models} models)  200: median {format_median(full)}  "
+              f"304: median {format_median(conditional)}  ({failed} failed)")
+
+        models = [f"bench/model-{i}" for i in range(args.sweep)]
+        for concurrency in args.concurrency:
+            elapsed, failed = bench_sweep(service, models, concurrency)
+            print(f"sweep_quota {args.sweep} models, concurrency {concurrency:>3}: "
+                  f"{elapsed:8.1f} ms ({args.sweep / elapsed * 1000:6.1f} req/s, {failed} failed)")
+
+    http_session.close_session()
+    async_runtime.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
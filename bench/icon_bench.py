@@ -0,0 +1,67 @@
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# 无显示环境下也能运行
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from bench.catalog_data import generate_catalog
+from gui.ui import icon_registry
+from gui.ui.ui_model_list import ModelListUI
+
+
+def build_items(models):
+    return [
+        {"model_id": model_id, "is_favorite": i % 7 == 0, "is_custom": i % 11 == 0, "is_hidden": False}
+        for i, model_id in enumerate(models)
+    ]
+
+
+def paint_once(widget):
+    """把模型列表完整绘制一次，返回耗时 (毫秒)。"""
+    started = time.perf_counter()
+    widget.model_list.viewport().grab()
+    return (time.perf_counter() - started) * 1000
+
+
+def format_bytes(size):
+    return f"{size / 1024:.1f} KiB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.icon_bench",
+        description="测量模型列表绘制耗时，以及图标注册表缓存的图标数、位图数与占用内存",
+    )
+    parser.add_argument("--models", type=int, default=1000, help="列表中的模型数量")
+    parser.add_argument("--height", type=int, default=800, help="列表高度 (像素)，决定可见行数")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    widget = ModelListUI()
+    widget.resize(480, args.height)
+    widget.model_list_model.set_items(build_items(generate_catalog(args.models)))
+    widget.show()
+    app.processEvents()
+
+    # 冷启动：清空缓存后的第一次绘制需要解码图标并渲染位图
+    icon_registry.clear_cache()
+    cold = paint_once(widget)
+    warm = [paint_once(widget) for _ in range(max(args.repeat, 1))]
+    stats = icon_registry.get_cache_stats()
+
+    print(f"paint ({args.models} models, {args.height}px)  cold: {cold:8.2f} ms  "
+          f"warm: median {statistics.median(warm):8.2f} ms")
+    print(f"icon cache  icons: {stats['icons']}  pixmaps: {stats['pixmaps']}  "
+          f"pixmap memory: {format_bytes(stats['pixmap_bytes'])}")
+    widget.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
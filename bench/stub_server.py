@@ -0,0 +1,323 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bench.catalog_data import generate_catalog
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_CATALOG_SIZE = 200
+DEFAULT_USER_LIMIT = 2000
+DEFAULT_MODEL_LIMIT = 500
+RETRY_AFTER_SECONDS = 1
+
+
+class StubOptions:
+    """替身服务的行为参数。
+
+    latency/jitter 以毫秒计，每个请求额外等待 latency ± jitter；
+    rate_429/rate_5xx 为随机返回 429/503 的概率；额度按 API Key 与模型分别计数。
+    """
+
+    def __init__(self, catalog_size=DEFAULT_CATALOG_SIZE, latency=0.0, jitter=0.0,
+                 rate_429=0.0, rate_5xx=0.0, user_limit=DEFAULT_USER_LIMIT,
+                 model_limit=DEFAULT_MODEL_LIMIT, seed=0):
+        self.catalog_size = catalog_size
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.user_limit = user_limit
+        self.model_limit = model_limit
+        self.seed = seed
+
+
+class StubState:
+    """服务端共享状态：预先序列化的目录与按 Key/模型计数的额度。"""
+
+    def __init__(self, options):
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.user_used = {}
+        self.model_used = {}
+        self.requests = 0
+        self.catalog_modified_at = 0
+        self.set_catalog(generate_catalog(options.catalog_size, options.seed))
+
+    def set_catalog(self, model_ids):
+        """替换目录；ETag 与 Last-Modified 随之变化，客户端下一次条件请求会拿到新目录。"""
+        created = int(time.time())
+        body = json.dumps(
+            {
+                "object": "list",
+                "data": [
+                    {"id": model_id, "object": "model", "created": created, "owned_by": model_id.split("/")[0]}
+                    for model_id in model_ids
+                ],
+            }
+        ).encode("utf-8")
+        with self.lock:
+            self.catalog_body = body
+            self.catalog_etag = '"%s"' % hashlib.sha256(body).hexdigest()[:16]
+            # HTTP 日期精确到秒，同一秒内多次替换时顺延，保证每次替换后的时间都更新
+            self.catalog_modified_at = max(created, self.catalog_modified_at + 1)
+            self.catalog_last_modified = formatdate(self.catalog_modified_at, usegmt=True)
+
+    def is_catalog_fresh(self, if_none_match, if_modified_since):
+        """按 RFC 7232 判断条件请求能否返回 304：携带 If-None-Match 时只比较 ETag。"""
+        if if_none_match:
+            return if_none_match == self.catalog_etag
+        if not if_modified_since:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return self.catalog_modified_at <= since
+
+    def next_delay(self):
+        with self.lock:
+            offset = self.random.uniform(-self.options.jitter, self.options.jitter)
+        return max(self.options.latency + offset, 0.0) / 1000
+
+    def roll_failure(self):
+        """按配置的概率返回 429、503 或 None。"""
+        with self.lock:
+            self.requests += 1
+            value = self.random.random()
+        if value < self.options.rate_429:
+            return 429
+        if value < self.options.rate_429 + self.options.rate_5xx:
+            return 503
+        return None
+
+    def consume(self, api_key, model_id):
+        """消耗一次用户与模型额度，任一额度已用尽时返回 False。"""
+        with self.lock:
+            user_used = self.user_used.get(api_key, 0)
+            model_key = (api_key, model_id)
+            model_used = self.model_used.get(model_key, 0)
+            if user_used >= self.options.user_limit or model_used >= self.options.model_limit:
+                return False
+            self.user_used[api_key] = user_used + 1
+            self.model_used[model_key] = model_used + 1
+            return True
+
+    def peek(self, api_key):
+        with self.lock:
+            return self.user_used.get(api_key, 0)
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "ModelScopeStub/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    @property
+    def state(self):
+        return self.server.state
+
+    def do_HEAD(self):
+        # 客户端预热连接时只发 HEAD，不计入额度
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path.rstrip("/") != "/v1/models":
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        api_key = self.authorize()
+        if api_key is None or self.apply_faults():
+            return
+
+        if self.state.is_catalog_fresh(self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")):
+            self.send_response(304)
+            self.send_quota_headers(api_key)
+            self.send_header("ETag", self.state.catalog_etag)
+            self.send_header("Last-Modified", self.state.catalog_last_modified)
+            self.end_headers()
+            return
+
+        body = self.state.catalog_body
+        self.send_response(200)
+        self.send_quota_headers(api_key)
+        self.send_header("ETag", self.state.catalog_etag)
+        self.send_header("Last-Modified", self.state.catalog_last_modified)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self.send_json(404, {"error": {"message": "not found"}})
+            return
+        api_key = self.authorize()
+        if api_key is None or self.apply_faults():
+            return
+
+        try:
+            model_id = json.loads(raw or b"{}").get("model", "")
+        except ValueError:
+            self.send_json(400, {"error": {"message": "invalid json"}})
+            return
+
+        if not self.state.consume(api_key, model_id):
+            self.send_json(429, {"error": {"message": "rate limit exceeded"}}, api_key, model_id, retry=True)
+            return
+
+        self.send_json(
+            200,
+            {
+                "id": f"chatcmpl-{self.state.requests}",
+                "object": "chat.completion",
+                "model": model_id,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "Hi"}, "finish_reason": "length"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            },
+            api_key,
+            model_id,
+        )
+
+    def authorize(self):
+        header = self.headers.get("Authorization", "")
+        if not header.startswith("Bearer ") or not header[len("Bearer "):].strip():
+            self.send_json(401, {"error": {"message": "missing api key"}})
+            return None
+        return header[len("Bearer "):].strip()
+
+    def apply_faults(self):
+        """注入延迟与随机错误，已发送错误响应时返回 True。"""
+        delay = self.state.next_delay()
+        if delay:
+            time.sleep(delay)
+        status = self.state.roll_failure()
+        if status is None:
+            return False
+        self.send_json(status, {"error": {"message": "injected failure"}}, retry=status == 429)
+        return True
+
+    def send_quota_headers(self, api_key, model_id=None):
+        options = self.state.options
+        user_used = self.state.peek(api_key)
+        self.send_header("modelscope-ratelimit-requests-limit", str(options.user_limit))
+        self.send_header("modelscope-ratelimit-requests-remaining", str(options.user_limit - user_used))
+        if model_id is not None:
+            with self.state.lock:
+                model_used = self.state.model_used.get((api_key, model_id), 0)
+            self.send_header("modelscope-ratelimit-model-requests-limit", str(options.model_limit))
+            self.send_header(
+                "modelscope-ratelimit-model-requests-remaining",
+                str(options.model_limit - model_used),
+            )
+
+    def send_json(self, status, payload, api_key=None, model_id=None, retry=False):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        if api_key is not None:
+            self.send_quota_headers(api_key, model_id)
+        if retry:
+            self.send_header("Retry-After", str(RETRY_AFTER_SECONDS))
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    # 默认监听队列只有 5，高并发建连时会被丢弃并等待 SYN 重传
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class StubServer:
+    """在后台线程中运行的 ModelScope API 替身服务，可在基准与调试脚本中直接使用。"""
+
+    def __init__(self, host=DEFAULT_HOST, port=0, options=None, verbose=False):
+        self.options = options or StubOptions()
+        self.httpd = StubHTTPServer((host, port), StubRequestHandler)
+        self.httpd.state = StubState(self.options)
+        self.httpd.verbose = verbose
+        self.thread = None
+
+    @property
+    def state(self):
+        return self.httpd.state
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bench.stub_server",
+        description="本地 ModelScope API 替身服务 (/v1/models 与 /v1/chat/completions)",
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--models", type=int, default=DEFAULT_CATALOG_SIZE, help="目录中的模型数量")
+    parser.add_argument("--latency", type=float, default=0.0, help="每个请求的固定延迟 (毫秒)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="延迟的随机抖动幅度 (毫秒)")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="随机返回 429 的概率")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="随机返回 503 的概率")
+    parser.add_argument("--user-limit", type=int, default=DEFAULT_USER_LIMIT)
+    parser.add_argument("--model-limit", type=int, default=DEFAULT_MODEL_LIMIT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="打印每个请求的访问日志")
+    args = parser.parse_args(argv)
+
+    options = StubOptions(
+        catalog_size=args.models,
+        latency=args.latency,
+        jitter=args.jitter,
+        rate_429=args.rate_429,
+        rate_5xx=args.rate_5xx,
+        user_limit=args.user_limit,
+        model_limit=args.model_limit,
+        seed=args.seed,
+    )
+    server = StubServer(args.host, args.port, options, args.verbose)
+    print(f"Stub server listening on {server.base_url}")
+    print(f"Use MODELSCOPE_BASE_URL={server.base_url} to point the app or CLI at it")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
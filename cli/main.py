@@ -0,0 +1,286 @@
+import argparse
+import json
+import os
+import sys
+
+from core import app_paths, async_runtime, http_session
+from core.account_service import AccountService
+from core.account_store import AccountStore
+from core.catalog_cache import CatalogCache
+from core.catalog_store import CatalogStore
+from core.config_manager import ConfigManager
+from core.errors import AccountNotFoundError, CoreError
+from core.model_service import ModelService
+from core.modelscope_client import ModelScopeClient
+from core.modelscope_service import ModelScopeService
+from core.quota_history import QuotaHistory
+from core.rate_limiter import configure_rate_limiter
+
+DEFAULT_ACCOUNT_NAME = "默认"
+
+
+class JsonOutput:
+    """逐行输出 JSONL；--json 时先收集，结束时输出一个 JSON 数组。"""
+
+    def __init__(self, as_array=False, stream=None):
+        self.as_array = as_array
+        self.stream = stream or sys.stdout
+        self.records = []
+
+    def emit(self, record):
+        if self.as_array:
+            self.records.append(record)
+            return
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def flush(self):
+        if self.as_array:
+            self.stream.write(json.dumps(self.records, ensure_ascii=False, indent=2) + "\n")
+            self.records = []
+        self.stream.flush()
+
+
+class CliContext:
+    """命令行共用的配置、账号与服务对象，与 GUI 共享同一份配置与缓存。"""
+
+    def __init__(self, account=None, base_url=None):
+        self.config_manager = ConfigManager(app_paths.get_config_file())
+        # GUI 可能正在写配置日志，命令行只读重放，不追加也不压缩
+        self.config_manager.load_journal(app_paths.get_config_journal_file())
+        if self.config_manager.get_storage_config()["backend"] == "sqlite":
+            self.config_manager.attach_store(CatalogStore(app_paths.get_catalog_store_file()))
+        self.account_service = AccountService(
+            self.config_manager,
+            AccountStore(app_paths.get_env_file(), DEFAULT_ACCOUNT_NAME),
+            DEFAULT_ACCOUNT_NAME,
+        )
+        history_config = self.config_manager.get_quota_history_config()
+        self.quota_history = None
+        if history_config["enabled"]:
+            self.quota_history = QuotaHistory(app_paths.get_quota_history_file(), history_config["retention_days"])
+        self.model_service = ModelService(self.config_manager, self.quota_history)
+        rate_limit_config = self.config_manager.get_rate_limit_config()
+        configure_rate_limiter(
+            rate_limit_config["enabled"],
+            rate_limit_config["max_wait"],
+        )
+        self.modelscope_service = ModelScopeService(
+            app_paths.get_env_file(),
+            client=ModelScopeClient(base_url=base_url),
+            catalog_cache=CatalogCache(app_paths.get_catalog_cache_dir()),
+        )
+        self.account = account
+        self._accounts = None
+
+    def get_accounts(self):
+        if self._accounts is None:
+            self._accounts = self.account_service.load_accounts()
+        return self._accounts
+
+    def get_api_key(self):
+        """--account 指定的账号优先，否则使用当前激活的账号。"""
+        accounts = self.get_accounts()
+        if self.account:
+            if self.account not in accounts:
+                raise AccountNotFoundError(context={"account": self.account})
+            return accounts[self.account]
+        return self.account_service.get_active_api_key(accounts) or None
+
+    def load_models(self, cached_only=False):
+        api_key = self.get_api_key()
+        if cached_only:
+            return self.modelscope_service.get_cached_models(api_key) or []
+        result = self.modelscope_service.list_models(api_key)
+        self.model_service.update_quota_from_list(result)
+        return result["models"]
+
+    def close(self):
+        self.config_manager.flush_config()
+        http_session.close_session()
+        async_runtime.close()
+        if self.quota_history is not None:
+            self.quota_history.close()
+        if self.config_manager.get_store() is not None:
+            self.config_manager.get_store().close()
+
+
+def cmd_list(context, args, output):
+    models = context.load_models(args.cached)
+    if args.by_org:
+        for org, count in context.model_service.count_models_by_org(models, args.query, args.favorites, args.hidden):
+            output.emit({"org": org, "count": count})
+        return
+    if args.count:
+        output.emit({"count": context.model_service.count_models(models, args.query, args.favorites, args.hidden)})
+        return
+    for item in context.model_service.build_model_items(
+        models,
+        args.query,
+        args.favorites,
+        args.hidden,
+    ):
+        output.emit(item)
+
+
+def cmd_quota(context, args, output):
+    model_ids = list(args.model_ids)
+    if args.favorites:
+        model_ids.extend(m for m in context.model_service.get_favorites() if m not in model_ids)
+    if not model_ids:
+        args.parser.error("需要至少一个 MODEL_ID，或使用 --favorites")
+
+    api_key = context.get_api_key()
+    if len(model_ids) == 1:
+        try:
+            result = context.modelscope_service.check_quota(model_ids[0], api_key)
+        except CoreError as e:
+            output.emit({"model_id": model_ids[0], "ok": False, "code": e.code, "context": e.context})
+            return 1
+        output.emit({"model_id": model_ids[0], "ok": True, **result})
+        context.model_service.update_quota_from_check(result)
+        return 0
+
+    def on_result(result):
+        output.emit(result)
+        if not output.as_array:
+            output.stream.flush()
+
+    concurrency = args.concurrency or context.model_service.get_quota_sweep_concurrency()
+    results = context.modelscope_service.sweep_quota(model_ids, api_key, concurrency, on_result=on_result)
+    summary = context.model_service.update_quota_from_sweep(results)
+    return 0 if summary["failed"] == 0 else 1
+
+
+def cmd_toggle(context, args, output):
+    config_manager = context.config_manager
+    if args.command == "favorite":
+        is_set, add, remove, field = (
+            config_manager.is_favorite,
+            config_manager.add_favorite,
+            config_manager.remove_favorite,
+            "is_favorite",
+        )
+    else:
+        is_set, add, remove, field = (
+            config_manager.is_invisible,
+            config_manager.add_invisible,
+            config_manager.remove_invisible,
+            "is_hidden",
+        )
+
+    for model_id in args.model_ids:
+        if args.action == "add":
+            add(model_id)
+        elif args.action == "remove":
+            remove(model_id)
+        output.emit({"model_id": model_id, field: is_set(model_id)})
+    if args.action != "show":
+        config_manager.save_config()
+
+
+def cmd_accounts(context, args, output):
+    accounts = context.get_accounts()
+    if args.activate:
+        if args.activate not in accounts:
+            raise AccountNotFoundError(context={"account": args.activate})
+        context.account_service.activate_account(args.activate, accounts)
+
+    active_account = context.config_manager.get_active_account()
+    for account_name in accounts:
+        quota = context.config_manager.get_account_quota(account_name)
+        output.emit(
+            {
+                "account": account_name,
+                "active": account_name == active_account,
+                "user_remaining": quota["user_remaining"],
+                "user_limit": quota["user_limit"],
+            }
+        )
+
+
+def cmd_history(context, args, output):
+    if context.quota_history is None:
+        args.parser.error("额度历史未启用 ([quota_history] enabled = false)")
+    accounts = [context.account] if context.account else list(context.get_accounts())
+    for account_name in accounts:
+        output.emit(
+            {
+                "account": account_name,
+                "model_id": args.model,
+                "sparkline": context.quota_history.get_sparkline(account_name, args.model, args.hours * 3600),
+                "forecast": context.quota_history.forecast(account_name, args.model),
+            }
+        )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m cli",
+        description="ModelScope Manager 命令行工具 (默认逐行输出 JSONL)",
+    )
+    parser.add_argument("--account", help="使用指定账号，默认使用当前激活的账号")
+    parser.add_argument("--json", action="store_true", help="输出一个 JSON 数组而不是 JSONL")
+    parser.add_argument("--base-url", help="API 根地址，默认读取环境变量 MODELSCOPE_BASE_URL 或使用官方地址")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="列出模型")
+    list_parser.add_argument("--cached", action="store_true", help="只读取本地缓存的目录，不发起请求")
+    list_parser.add_argument("--favorites", action="store_true", help="只显示收藏的模型")
+    list_parser.add_argument("--hidden", action="store_true", help="只显示隐藏的模型")
+    list_parser.add_argument("--count", action="store_true", help="只输出匹配的模型数量")
+    list_parser.add_argument("--by-org", action="store_true", help="按组织输出匹配的模型数量")
+    list_parser.set_defaults(func=cmd_list, query="")
+
+    filter_parser = subparsers.add_parser("filter", help="按关键字筛选模型")
+    filter_parser.add_argument("query", help="模型 ID 中包含的关键字 (不区分大小写)")
+    filter_parser.add_argument("--cached", action="store_true", help="只读取本地缓存的目录，不发起请求")
+    filter_parser.add_argument("--favorites", action="store_true", help="只显示收藏的模型")
+    filter_parser.add_argument("--hidden", action="store_true", help="只显示隐藏的模型")
+    filter_parser.add_argument("--count", action="store_true", help="只输出匹配的模型数量")
+    filter_parser.add_argument("--by-org", action="store_true", help="按组织输出匹配的模型数量")
+    filter_parser.set_defaults(func=cmd_list)
+
+    quota_parser = subparsers.add_parser("quota", help="检查模型额度")
+    quota_parser.add_argument("model_ids", nargs="*", metavar="MODEL_ID")
+    quota_parser.add_argument("--favorites", action="store_true", help="同时检查全部收藏的模型")
+    quota_parser.add_argument("--concurrency", type=int, help="并发请求数，默认读取配置")
+    quota_parser.set_defaults(func=cmd_quota, parser=quota_parser)
+
+    for name, help_text in (("favorite", "管理收藏"), ("hide", "管理隐藏")):
+        toggle_parser = subparsers.add_parser(name, help=help_text)
+        toggle_parser.add_argument("action", choices=("add", "remove", "show"))
+        toggle_parser.add_argument("model_ids", nargs="+", metavar="MODEL_ID")
+        toggle_parser.set_defaults(func=cmd_toggle)
+
+    accounts_parser = subparsers.add_parser("accounts", help="列出账号")
+    accounts_parser.add_argument("--activate", metavar="NAME", help="切换当前激活的账号")
+    accounts_parser.set_defaults(func=cmd_accounts)
+
+    history_parser = subparsers.add_parser("history", help="额度历史与耗尽预测")
+    history_parser.add_argument("--model", metavar="MODEL_ID", help="查看模型级额度，默认为账号级额度")
+    history_parser.add_argument("--hours", type=int, default=24, help="迷你折线覆盖的小时数")
+    history_parser.set_defaults(func=cmd_history, parser=history_parser)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    output = JsonOutput(args.json)
+    context = CliContext(args.account, args.base_url)
+    exit_code = 0
+    try:
+        exit_code = args.func(context, args, output) or 0
+        output.flush()
+    except CoreError as e:
+        output.flush()
+        error = {"error": e.code, "message": e.message, "context": e.context}
+        sys.stderr.write(json.dumps(error, ensure_ascii=False) + "\n")
+        exit_code = 1
+    except BrokenPipeError:
+        # 输出被 head 等命令提前关闭时静默退出，并避免解释器退出时再次写入报错
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+    finally:
+        context.close()
+    return exit_code
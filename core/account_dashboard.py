@@ -0,0 +1,95 @@
+from core.model_list_logic import accounts_from_bitmap, build_visibility_bitmap
+
+
+class AccountDashboard:
+    """多账号总览：保存各账号的目录与额度，并维护模型的账号可见位图。"""
+
+    def __init__(self, config_manager, quota_history=None):
+        self.config_manager = config_manager
+        self.quota_history = quota_history
+        self.account_names = []
+        self.results = {}
+        self.visibility = {}
+
+    def start(self, account_names):
+        """开始一轮刷新，位图中的位序即 account_names 的顺序。"""
+        self.account_names = list(account_names)
+        self.results = {}
+        self.visibility = {}
+
+    def apply_result(self, result):
+        """记录单个账号的刷新结果，返回用于展示的行数据。"""
+        account = result["account"]
+        self.results[account] = result
+
+        if not result.get("ok"):
+            quota = self.config_manager.get_account_quota(account)
+            return {
+                "account": account,
+                "ok": False,
+                "model_count": None,
+                "user_remaining": quota["user_remaining"],
+                "user_limit": quota["user_limit"],
+                "code": result.get("code"),
+                "context": result.get("context", {}),
+            }
+
+        user_remaining = result.get("user_remaining", "N/A")
+        user_limit = result.get("user_limit", "N/A")
+        if user_remaining != "N/A" and user_limit != "N/A":
+            self.config_manager.set_account_quota(account, user_remaining, user_limit)
+            if self.quota_history is not None:
+                self.quota_history.record(account, user_remaining, user_limit)
+        else:
+            quota = self.config_manager.get_account_quota(account)
+            user_remaining = quota["user_remaining"]
+            user_limit = quota["user_limit"]
+
+        return {
+            "account": account,
+            "ok": True,
+            "model_count": len(result.get("models") or []),
+            "user_remaining": user_remaining,
+            "user_limit": user_limit,
+            "from_cache": result.get("from_cache", False),
+        }
+
+    def finish(self):
+        """一轮刷新结束：构建可见位图并保存额度，返回汇总信息。"""
+        catalogs = []
+        store = self.config_manager.get_store()
+        for account in self.account_names:
+            result = self.results.get(account, {})
+            catalogs.append(result.get("models") or [] if result.get("ok") else [])
+            if store is not None and result.get("ok"):
+                store.set_account_models(account, result.get("models") or [])
+        self.visibility = build_visibility_bitmap(catalogs)
+        self.config_manager.save_config()
+
+        ok_mask = 0
+        for bit, account in enumerate(self.account_names):
+            if self.results.get(account, {}).get("ok"):
+                ok_mask |= 1 << bit
+
+        return {
+            "total_models": len(self.visibility),
+            "shared_models": sum(1 for mask in self.visibility.values() if mask == ok_mask),
+            "succeeded": bin(ok_mask).count("1"),
+            "failed": len(self.results) - bin(ok_mask).count("1"),
+        }
+
+    def get_quota_trend(self, account):
+        """返回账号最近 24 小时的额度迷你折线与耗尽预测，未启用额度历史时返回 None。"""
+        if self.quota_history is None:
+            return None
+        return {
+            "sparkline": self.quota_history.get_sparkline(account),
+            "forecast": self.quota_history.forecast(account),
+        }
+
+    def get_model_accounts(self, model_id):
+        """返回可见该模型的账号名列表；本次尚未刷新时使用 SQLite 存储中上一次保存的结果。"""
+        store = self.config_manager.get_store()
+        if not self.visibility and store is not None:
+            return store.get_model_accounts(model_id)
+        return accounts_from_bitmap(self.visibility.get(model_id, 0), self.account_names)
@@ -1,44 +1,72 @@
 import os
-from pathlib import Path
-from dotenv import load_dotenv, set_key, unset_key
+from contextlib import contextmanager
+from core.api_key_provider import invalidate_api_key_cache
+from core.env_file import EnvFile
+
+ACCOUNT_KEY_PREFIX = "API_KEY_"
 
 class AccountStore:
+    """基于 .env 的账号存储。
+
+    .env 只解析一次并在内存中按键索引，修改不会写入进程环境变量；
+    进程环境变量中的 API_KEY / API_KEY_* 同样作为账号加载，同名时以 .env 为准；
+    修改前如未读取过文件会先读取，每次修改原子重写一次文件，batch() 内的多次修改合并为一次重写。
+    """
+
     def __init__(self, env_path, default_account_name="默认"):
-        self.env_path = Path(env_path)
+        self.env_file = EnvFile(env_path)
+        self.env_path = self.env_file.path
         self.default_account_name = default_account_name
+        self._batch_depth = 0
 
     def load_accounts(self):
-        load_dotenv(self.env_path, override=True)
-        accounts = {}
-
-        default_key = os.getenv("API_KEY")
-        if default_key:
-            accounts[self.default_account_name] = default_key
-
-        for key, value in os.environ.items():
-            if key.startswith("API_KEY_"):
-                account_name = key[8:]
-                accounts[account_name] = value
+        self.env_file.load()
+        accounts = self._collect_accounts(os.environ.items())
+        accounts.update(self._collect_accounts(self.env_file.items()))
+        return accounts
 
+    def _collect_accounts(self, entries):
+        accounts = {}
+        for key, value in entries:
+            if key == "API_KEY":
+                if value:
+                    accounts[self.default_account_name] = value
+            elif key.startswith(ACCOUNT_KEY_PREFIX):
+                accounts[key[len(ACCOUNT_KEY_PREFIX):]] = value
         return accounts
 
     def add_account(self, account_name, api_key):
-        env_key = self._get_env_key(account_name)
-        set_key(str(self.env_path), env_key, api_key)
-        os.environ[env_key] = api_key
+        self.env_file.ensure_loaded()
+        self.env_file.set(self._get_env_key(account_name), api_key)
+        self._commit()
 
     def update_account(self, account_name, api_key):
-        env_key = self._get_env_key(account_name)
-        set_key(str(self.env_path), env_key, api_key)
-        os.environ[env_key] = api_key
+        self.env_file.ensure_loaded()
+        self.env_file.set(self._get_env_key(account_name), api_key)
+        self._commit()
 
     def delete_account(self, account_name):
-        env_key = self._get_env_key(account_name)
-        unset_key(str(self.env_path), env_key)
-        if env_key in os.environ:
-            del os.environ[env_key]
+        self.env_file.ensure_loaded()
+        self.env_file.unset(self._get_env_key(account_name))
+        self._commit()
+
+    @contextmanager
+    def batch(self):
+        """批量修改：退出时统一写回一次 .env。"""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            self._commit()
+
+    def _commit(self):
+        if self._batch_depth == 0 and self.env_file.dirty:
+            self.env_file.save()
+            # 通知 API Key 缓存，下一次请求会读取新内容
+            invalidate_api_key_cache(self.env_path)
 
     def _get_env_key(self, account_name):
         if account_name == self.default_account_name:
             return "API_KEY"
-        return f"API_KEY_{account_name}"
+        return f"{ACCOUNT_KEY_PREFIX}{account_name}"
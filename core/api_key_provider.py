@@ -1,10 +1,77 @@
 import os
-from dotenv import load_dotenv
+import threading
+import time
+from pathlib import Path
+from dotenv import find_dotenv
+from core.env_file import EnvFile
+
+# 两次检查 .env 文件状态之间的最短间隔 (秒)，间隔内直接使用缓存
+STAT_CHECK_INTERVAL = 2.0
+
+_cache = {}
+_cache_lock = threading.Lock()
+_default_env_path = None
 
 
 def resolve_api_key(env_path=None):
-    if env_path:
-        load_dotenv(env_path, override=True)
-    else:
-        load_dotenv()
-    return os.getenv("API_KEY")
+    """解析默认 API Key：优先取 .env 中的 API_KEY，其次取进程环境变量。
+
+    .env 的解析结果按路径缓存，文件的 mtime/inode/大小变化或收到
+    invalidate_api_key_cache 通知时才重新读取。
+    """
+    path = Path(env_path) if env_path else _get_default_env_path()
+    api_key = _get_file_api_key(path) if path else None
+    return api_key or os.getenv("API_KEY")
+
+
+def invalidate_api_key_cache(env_path=None):
+    """使缓存失效 (不指定路径时清空全部缓存，并重新查找默认 .env)。"""
+    global _default_env_path
+    with _cache_lock:
+        if env_path is None:
+            _cache.clear()
+            _default_env_path = None
+        else:
+            _cache.pop(str(Path(env_path)), None)
+
+
+def _get_default_env_path():
+    # 只缓存找到的路径：未找到时下次重新查找，之后创建的 .env 也能被发现
+    global _default_env_path
+    if _default_env_path is None:
+        _default_env_path = find_dotenv(usecwd=True) or None
+    return Path(_default_env_path) if _default_env_path else None
+
+
+def _get_file_stamp(path):
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+
+def _get_file_api_key(path):
+    cache_key = str(path)
+    now = time.monotonic()
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None and now - entry["checked_at"] < STAT_CHECK_INTERVAL:
+            return entry["api_key"]
+
+    stamp = _get_file_stamp(path)
+    with _cache_lock:
+        entry = _cache.get(cache_key)
+        if entry is not None and entry["stamp"] == stamp:
+            entry["checked_at"] = now
+            return entry["api_key"]
+
+    api_key = None
+    if stamp is not None:
+        env_file = EnvFile(path)
+        env_file.load()
+        api_key = env_file.get("API_KEY")
+
+    with _cache_lock:
+        _cache[cache_key] = {"stamp": stamp, "checked_at": now, "api_key": api_key}
+    return api_key
@@ -21,11 +21,31 @@ def get_data_path():
     return data_dir
 
 
+def get_catalog_cache_dir():
+    """获取模型目录缓存目录。"""
+    return get_data_path() / "catalog_cache"
+
+
+def get_quota_history_file():
+    """获取额度历史数据库路径。"""
+    return get_data_path() / "quota_history.sqlite3"
+
+
+def get_catalog_store_file():
+    """获取 SQLite 目录与用户状态存储路径。"""
+    return get_data_path() / "catalog.sqlite3"
+
+
 def get_config_file():
     """获取 config.toml 路径。"""
     return get_app_root() / "gui" / "config.toml"
 
 
+def get_config_journal_file():
+    """获取配置修改日志路径。"""
+    return get_data_path() / "config.journal"
+
+
 def get_env_file():
     """获取 .env 文件路径。"""
     return get_app_root() / ".env"
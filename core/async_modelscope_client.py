@@ -0,0 +1,136 @@
+import asyncio
+import json
+import time
+import aiohttp
+from core import metrics
+from core.errors import ApiKeyMissingError, RateLimitedError, RequestFailedError
+from core.modelscope_client import (
+    REQUEST_TIMEOUT,
+    build_quota_payload,
+    get_base_url,
+    parse_quota_headers,
+)
+from core.rate_limiter import get_rate_limiter
+
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class AsyncModelScopeClient:
+    """ModelScopeClient 的 asyncio 版本，返回结构与异常类型保持一致。
+
+    同一实例内的所有请求共享一个连接池，并由信号量限制并发数，
+    适合在单个线程里对大量模型或账号发起批量请求。实例需在同一个事件循环内使用。
+    """
+
+    def __init__(self, request_timeout=REQUEST_TIMEOUT, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 base_url=None, rate_limiter=None):
+        self.request_timeout = request_timeout
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.max_concurrency = max(int(max_concurrency), 1)
+        self.base_url = get_base_url(base_url)
+        self.models_url = f"{self.base_url}/models"
+        self.quota_url = f"{self.base_url}/chat/completions"
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+            timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def list_models(self, api_key, etag=None, last_modified=None):
+        if not api_key:
+            raise ApiKeyMissingError("未找到 API Key")
+
+        headers = {"Authorization": f"Bearer {api_key}"}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        async with self._semaphore:
+            metrics.increment("http.requests")
+            # 耗时从获得并发名额开始计算，不包含排队时间
+            started = time.perf_counter()
+            try:
+                async with self._get_session().get(self.models_url, headers=headers) as response:
+                    # 与同步版本一致，成功时耗时包含下载响应体
+                    body = await response.read() if response.status == 200 else None
+                    metrics.observe("http.list_models", time.perf_counter() - started)
+                    self.rate_limiter.observe(api_key, None, response.status, response.headers, reserved=False)
+                    if response.status == 304:
+                        metrics.increment("http.not_modified")
+                        model_ids = None
+                    elif response.status != 200:
+                        metrics.increment("http.errors")
+                        raise RequestFailedError(response.status, await response.text())
+                    else:
+                        with metrics.span("json.parse_models"):
+                            resp_json = json.loads(body)
+                            models = resp_json.get("data") or []
+                            model_ids = [model["id"] for model in models if "id" in model]
+
+                    return {
+                        **parse_quota_headers(response.headers),
+                        "models": model_ids,
+                        "not_modified": model_ids is None,
+                        "etag": response.headers.get("ETag", etag),
+                        "last_modified": response.headers.get("Last-Modified", last_modified),
+                    }
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                # 连接失败、超时等传输错误同样计入错误数
+                metrics.increment("http.errors")
+                raise
+
+    async def check_quota(self, model_id, api_key, is_cancelled=None):
+        if not api_key:
+            raise ApiKeyMissingError("未找到 API Key")
+
+        headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+
+        # 在占用连接名额之前按额度排队，等待期间不阻塞其他模型的请求
+        delay = await self.rate_limiter.wait_async(api_key, model_id, is_cancelled)
+        if delay:
+            metrics.increment("http.rate_limited")
+            raise RateLimitedError(delay, {"model_id": model_id})
+
+        async with self._semaphore:
+            metrics.increment("http.requests")
+            started = time.perf_counter()
+            try:
+                async with self._get_session().post(
+                    self.quota_url,
+                    headers=headers,
+                    json=build_quota_payload(model_id),
+                ) as response:
+                    metrics.observe("http.check_quota", time.perf_counter() - started)
+                    self.rate_limiter.observe(api_key, model_id, response.status, response.headers)
+                    if response.status != 200:
+                        metrics.increment("http.errors")
+                    # 与同步版本一致：只关心响应头，不读取响应体
+                    return {
+                        **parse_quota_headers(response.headers),
+                        "model_id": model_id,
+                        "status_code": response.status,
+                        "next_allowed_in": self.rate_limiter.time_until_next(api_key, model_id),
+                    }
+            except Exception:
+                metrics.increment("http.errors")
+                self.rate_limiter.observe(api_key, model_id, None, {})
+                raise
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+import threading
+
+CLOSE_TIMEOUT = 5
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+# 只在后台事件循环线程中访问
+_clients = {}
+
+
+def run(coro):
+    """在进程级共享的后台事件循环中执行协程，阻塞调用线程直到得到结果。
+
+    asyncio.run 每次都会新建并关闭事件循环，绑定在循环上的连接池无法跨调用复用；
+    所有批量请求共用这一个常驻循环，客户端与其连接池由 get_client 缓存。
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+def get_client(key, factory):
+    """获取 key 对应的异步客户端，没有时用 factory() 创建。只能在 run() 执行的协程中调用。"""
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = factory()
+    return client
+
+
+def close():
+    """关闭全部缓存的客户端并停止后台事件循环，之后再调用 run() 会重新启动。"""
+    global _loop, _thread
+    with _lock:
+        loop, thread = _loop, _thread
+        _loop = _thread = None
+    if loop is None:
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_clients(), loop).result(CLOSE_TIMEOUT)
+    except Exception as e:
+        logging.warning(f"Failed to close async clients: {e}")
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(CLOSE_TIMEOUT)
+    if not thread.is_alive():
+        loop.close()
+
+
+def _get_loop():
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_run_loop, args=(_loop,), name="async-runtime", daemon=True)
+            _thread.start()
+        return _loop
+
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+async def _close_clients():
+    # 关闭时仍未结束的批量请求直接取消，等待结果的线程随之收到 CancelledError
+    current = asyncio.current_task()
+    for task in asyncio.all_tasks():
+        if task is not current:
+            task.cancel()
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.close()
@@ -0,0 +1,64 @@
+import os
+import stat
+import tempfile
+from pathlib import Path
+
+
+def _read_umask():
+    # os.umask 只能通过设置来读取，在导入时读一次，避免运行中与其他线程创建文件竞争
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+_UMASK = _read_umask()
+
+
+def atomic_write_text(path, text, encoding="utf-8"):
+    """原子地写入文本文件：写临时文件并 fsync 后再替换目标文件。
+
+    写入过程中崩溃时，目标文件要么保持旧内容，要么是完整的新内容。
+    替换后保留目标文件原有的权限，新文件使用 umask 决定的默认权限。
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    mode = _target_mode(path)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp 创建的文件权限为 0600，替换前改回目标文件应有的权限
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def _target_mode(path):
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+def _fsync_dir(directory):
+    # 持久化目录项，保证重命名本身落盘 (Windows 不支持对目录 fsync)
+    if os.name != "posix":
+        return
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
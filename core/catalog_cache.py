@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from core.atomic_file import atomic_write_text
+
+# 进程内常驻的缓存条目数上限，超出后淘汰最久未使用的账号
+DEFAULT_MAX_RESIDENT = 8
+
+
+class CatalogCache:
+    """按账号把模型目录及其 ETag/Last-Modified 缓存到数据目录。
+
+    缓存文件以 API Key 的摘要命名，不在磁盘上保存明文 Key。
+    读写过的条目在实例内常驻 (最多 max_resident 个，按最近使用淘汰)，切换账号时无需再读盘；
+    需要共享常驻条目的调用方应复用同一个实例。
+    """
+
+    def __init__(self, cache_dir, max_resident=DEFAULT_MAX_RESIDENT):
+        self.cache_dir = Path(cache_dir)
+        self.max_resident = max(int(max_resident), 0)
+        self._resident = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_resident(self, path):
+        with self._lock:
+            entry = self._resident.get(path)
+            if entry is not None:
+                self._resident.move_to_end(path)
+            return entry
+
+    def _set_resident(self, path, entry):
+        with self._lock:
+            self._resident[path] = entry
+            self._resident.move_to_end(path)
+            while len(self._resident) > self.max_resident:
+                self._resident.popitem(last=False)
+
+    def _drop_resident(self, path):
+        with self._lock:
+            self._resident.pop(path, None)
+
+    def _entry_path(self, api_key):
+        digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:24]
+        return self.cache_dir / f"{digest}.json"
+
+    def load(self, api_key):
+        """读取缓存条目，不存在或损坏时返回 None。"""
+        if not api_key:
+            return None
+        path = self._entry_path(api_key)
+        entry = self._get_resident(str(path))
+        if entry is not None:
+            return entry
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception as e:
+            logging.error(f"Failed to load catalog cache: {e}")
+            return None
+        if not isinstance(entry, dict) or not isinstance(entry.get("models"), list):
+            return None
+        self._set_resident(str(path), entry)
+        return entry
+
+    def save(self, api_key, models, etag=None, last_modified=None):
+        """写入缓存条目 (原子写入，并发保存同一账号也不会产生残缺文件)。"""
+        if not api_key:
+            return
+        entry = {
+            "models": list(models),
+            "etag": etag,
+            "last_modified": last_modified,
+            "saved_at": time.time(),
+        }
+        path = self._entry_path(api_key)
+        self._set_resident(str(path), entry)
+        try:
+            atomic_write_text(path, json.dumps(entry, ensure_ascii=False))
+        except Exception as e:
+            logging.error(f"Failed to save catalog cache: {e}")
+
+    def delete(self, api_key):
+        if not api_key:
+            return
+        path = self._entry_path(api_key)
+        self._drop_resident(str(path))
+        try:
+            path.unlink(missing_ok=True)
+        except Exception as e:
+            logging.error(f"Failed to delete catalog cache: {e}")
@@ -0,0 +1,218 @@
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from core.model_list_logic import get_org
+from core.model_search_index import fold_text
+
+MEMORY_DATABASE = ":memory:"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS models (
+    model_id TEXT PRIMARY KEY,
+    org TEXT NOT NULL,
+    folded TEXT NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_models_position ON models (position);
+CREATE INDEX IF NOT EXISTS idx_models_org ON models (org, position);
+CREATE TABLE IF NOT EXISTS account_models (
+    account TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    PRIMARY KEY (account, model_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_account_models_model ON account_models (model_id);
+CREATE TABLE IF NOT EXISTS flags (
+    flag TEXT NOT NULL,
+    model_id TEXT NOT NULL,
+    PRIMARY KEY (flag, model_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_flags_model ON flags (model_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quotas (
+    account TEXT PRIMARY KEY,
+    user_remaining TEXT NOT NULL,
+    user_limit TEXT NOT NULL
+);
+"""
+
+
+class CatalogStore:
+    """模型目录与用户状态的 SQLite 存储。
+
+    models 按合并顺序保存目录，并在模型 ID 与组织前缀上建立索引；
+    account_models 记录各账号可见的模型，flags 保存收藏/隐藏/自定义标记，quotas 保存各账号额度。
+    config.toml 仍是用户状态的权威来源，这里的数据由 ConfigManager 同步写入，用于索引查询。
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path if db_path == MEMORY_DATABASE else Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            if self.db_path != MEMORY_DATABASE:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _write(self, statements):
+        """在一个事务中执行 [(sql, 参数或参数列表, 是否 executemany)]。"""
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    for sql, params, many in statements:
+                        if many:
+                            conn.executemany(sql, params)
+                        else:
+                            conn.execute(sql, params)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to write catalog store: {e}")
+
+    def _read(self, sql, params=()):
+        try:
+            with self._lock:
+                return self._connect().execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to read catalog store: {e}")
+            return []
+
+    def replace_catalog(self, model_ids):
+        """用合并后的模型目录整体替换 models 表，顺序即结果的排列顺序。
+
+        目录摘要与上次写入的相同时跳过重写 (例如重启后目录未变化)，返回是否实际写入。
+        """
+        digest = hashlib.sha256("\n".join(model_ids).encode("utf-8")).hexdigest()
+        if self._read("SELECT 1 FROM meta WHERE key = 'catalog_digest' AND value = ?", (digest,)):
+            return False
+        self._write([
+            ("DELETE FROM models", (), False),
+            (
+                "INSERT OR IGNORE INTO models (model_id, org, folded, position) VALUES (?, ?, ?, ?)",
+                ((model_id, get_org(model_id), fold_text(model_id), position)
+                 for position, model_id in enumerate(model_ids)),
+                True,
+            ),
+            ("INSERT OR REPLACE INTO meta (key, value) VALUES ('catalog_digest', ?)", (digest,), False),
+        ])
+        return True
+
+    def invalidate_catalog(self):
+        """清除目录摘要，下一次 replace_catalog 无论内容是否变化都会重写 models 表。"""
+        self._write([("DELETE FROM meta WHERE key = 'catalog_digest'", (), False)])
+
+    def set_account_models(self, account, model_ids):
+        """替换账号可见的模型集合。"""
+        self._write([
+            ("DELETE FROM account_models WHERE account = ?", (account,), False),
+            (
+                "INSERT OR IGNORE INTO account_models (account, model_id) VALUES (?, ?)",
+                ((account, model_id) for model_id in model_ids),
+                True,
+            ),
+        ])
+
+    def get_model_accounts(self, model_id):
+        rows = self._read("SELECT account FROM account_models WHERE model_id = ? ORDER BY account", (model_id,))
+        return [row[0] for row in rows]
+
+    def sync_user_state(self, flag_lists, quotas):
+        """用 {标记: 模型 ID 列表} 与 {账号: 额度} 整体替换 flags 与 quotas 表。"""
+        statements = [("DELETE FROM flags", (), False), ("DELETE FROM quotas", (), False)]
+        for flag, model_ids in flag_lists.items():
+            statements.append((
+                "INSERT OR IGNORE INTO flags (flag, model_id) VALUES (?, ?)",
+                [(flag, model_id) for model_id in model_ids],
+                True,
+            ))
+        statements.append((
+            "INSERT INTO quotas (account, user_remaining, user_limit) VALUES (?, ?, ?)",
+            [
+                (account, str(quota.get("user_remaining", "N/A")), str(quota.get("user_limit", "N/A")))
+                for account, quota in quotas.items()
+            ],
+            True,
+        ))
+        self._write(statements)
+
+    def add_flag(self, flag, model_id):
+        self._write([("INSERT OR IGNORE INTO flags (flag, model_id) VALUES (?, ?)", (flag, model_id), False)])
+
+    def remove_flag(self, flag, model_id):
+        self._write([("DELETE FROM flags WHERE flag = ? AND model_id = ?", (flag, model_id), False)])
+
+    def has_flag(self, flag, model_id):
+        return bool(self._read("SELECT 1 FROM flags WHERE flag = ? AND model_id = ?", (flag, model_id)))
+
+    def get_flagged(self, flag):
+        return [row[0] for row in self._read("SELECT model_id FROM flags WHERE flag = ?", (flag,))]
+
+    def set_quota(self, account, user_remaining, user_limit):
+        self._write([(
+            "INSERT OR REPLACE INTO quotas (account, user_remaining, user_limit) VALUES (?, ?, ?)",
+            (account, str(user_remaining), str(user_limit)),
+            False,
+        )])
+
+    def get_quota(self, account):
+        rows = self._read("SELECT user_remaining, user_limit FROM quotas WHERE account = ?", (account,))
+        if not rows:
+            return {"user_remaining": "N/A", "user_limit": "N/A"}
+        return {"user_remaining": rows[0][0], "user_limit": rows[0][1]}
+
+    def _query(self, select, search_text, favorites_only, hidden_only, org):
+        """拼出筛选查询；只看收藏或隐藏时从 flags 表的索引出发，只访问被标记的模型。"""
+        if favorites_only:
+            source = "flags fav JOIN models m ON m.model_id = fav.model_id"
+            clauses = ["fav.flag = 'favorites'"]
+        elif hidden_only:
+            source = "flags hid JOIN models m ON m.model_id = hid.model_id"
+            clauses = ["hid.flag = 'invisible'"]
+        else:
+            source = "models m"
+            clauses = []
+        params = []
+        if org is not None:
+            clauses.append("m.org = ?")
+            params.append(fold_text(org))
+        if search_text:
+            clauses.append("instr(m.folded, ?) > 0")
+            params.append(fold_text(search_text))
+        hidden = "EXISTS (SELECT 1 FROM flags f WHERE f.flag = 'invisible' AND f.model_id = m.model_id)"
+        if favorites_only and hidden_only:
+            clauses.append(hidden)
+        elif not hidden_only:
+            clauses.append(f"NOT {hidden}")
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return f"SELECT {select} FROM {source}{where}", params
+
+    def search(self, search_text, favorites_only=False, hidden_only=False, org=None):
+        """与 filter_models 语义一致的筛选，结果保持合并顺序；org 走组织前缀索引。"""
+        sql, params = self._query("m.model_id", search_text, favorites_only, hidden_only, org)
+        return [row[0] for row in self._read(f"{sql} ORDER BY m.position", params)]
+
+    def count(self, search_text="", favorites_only=False, hidden_only=False, org=None):
+        sql, params = self._query("COUNT(*)", search_text, favorites_only, hidden_only, org)
+        rows = self._read(sql, params)
+        return rows[0][0] if rows else 0
+
+    def count_by_org(self, search_text="", favorites_only=False, hidden_only=False):
+        """按组织统计筛选结果数量，返回 [(组织, 数量)]，数量多的在前。"""
+        sql, params = self._query("m.org, COUNT(*) AS n", search_text, favorites_only, hidden_only, None)
+        rows = self._read(f"{sql} GROUP BY m.org ORDER BY n DESC, m.org", params)
+        return [(org, count) for org, count in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
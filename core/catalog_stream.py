@@ -0,0 +1,143 @@
+import codecs
+import json
+
+WHITESPACE = " \t\n\r"
+_INCOMPLETE = object()
+
+
+class ModelListStreamParser:
+    """增量解析 /v1/models 响应体 ({"object": ..., "data": [{"id": ...}, ...]})。
+
+    feed() 接收任意切分的字节块，返回其中新出现的完整模型的 ID；
+    data 数组逐个元素解码，已解析的部分随即丢弃，不会在内存中保留整个响应体或全部模型字典。
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        self._final = False
+
+    def feed(self, data):
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(data)
+        self._pos = 0
+        return self._parse()
+
+    def close(self):
+        """输入结束：返回剩余的模型 ID，响应不完整或格式错误时抛出 ValueError。"""
+        self._final = True
+        self._buffer = self._buffer[self._pos:] + self._utf8.decode(b"", final=True)
+        self._pos = 0
+        model_ids = self._parse()
+        if self._state != "done":
+            raise ValueError("Incomplete model list response")
+        return model_ids
+
+    def _next_char(self):
+        """跳过空白并返回下一个字符，数据不足时返回 None。"""
+        buffer = self._buffer
+        pos = self._pos
+        while pos < len(buffer) and buffer[pos] in WHITESPACE:
+            pos += 1
+        self._pos = pos
+        return buffer[pos] if pos < len(buffer) else None
+
+    def _decode_value(self):
+        """解码当前位置的一个完整 JSON 值，数据不足时返回 _INCOMPLETE。"""
+        try:
+            value, end = self._decoder.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return _INCOMPLETE
+        # 数字等标量恰好在块尾结束时可能还没读完 (例如 "12" 之后还有 "3")
+        if end == len(self._buffer) and not self._final and not isinstance(value, (dict, list, str)):
+            return _INCOMPLETE
+        self._pos = end
+        return value
+
+    def _parse_items(self, model_ids):
+        """逐个解码 data 数组的元素 (热路径，单独展开以减少状态切换)，数组结束时返回 True。"""
+        buffer = self._buffer
+        decode = self._decoder.raw_decode
+        pos = self._pos
+        end_of_buffer = len(buffer)
+        while pos < end_of_buffer:
+            char = buffer[pos]
+            if char in WHITESPACE or char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                self._pos = pos + 1
+                self._state = "key"
+                return True
+            try:
+                item, pos = decode(buffer, pos)
+            except json.JSONDecodeError:
+                if self._final:
+                    raise
+                break
+            if isinstance(item, dict):
+                model_id = item.get("id")
+                if model_id is not None:
+                    model_ids.append(model_id)
+        self._pos = pos
+        return False
+
+    def _parse(self):
+        model_ids = []
+        while True:
+            char = self._next_char()
+            if char is None:
+                return model_ids
+
+            state = self._state
+            if state == "start":
+                if char != "{":
+                    raise ValueError("Model list response is not a JSON object")
+                self._pos += 1
+                self._state = "key"
+            elif state == "key":
+                if char == "}":
+                    self._pos += 1
+                    self._state = "done"
+                elif char == ",":
+                    self._pos += 1
+                else:
+                    key = self._decode_value()
+                    if key is _INCOMPLETE:
+                        return model_ids
+                    if not isinstance(key, str):
+                        raise ValueError("Invalid key in model list response")
+                    self._key = key
+                    self._state = "colon"
+            elif state == "colon":
+                if char != ":":
+                    raise ValueError("Invalid model list response")
+                self._pos += 1
+                self._state = "array" if self._key == "data" else "value"
+            elif state == "value":
+                # data 以外的字段整体解码后丢弃
+                if self._decode_value() is _INCOMPLETE:
+                    return model_ids
+                self._state = "key"
+            elif state == "array":
+                if char == "[":
+                    self._pos += 1
+                    self._state = "item"
+                    continue
+                # "data": null 按空目录处理，与非流式解析一致
+                value = self._decode_value()
+                if value is _INCOMPLETE:
+                    return model_ids
+                if value is not None:
+                    raise ValueError("Model list data is not an array")
+                self._state = "key"
+            elif state == "item":
+                if not self._parse_items(model_ids):
+                    return model_ids
+            else:
+                raise ValueError("Unexpected data after model list response")
@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+from pathlib import Path
+
+DEFAULT_COMPACT_THRESHOLD = 200
+
+
+def apply_record(config, record):
+    """把一条日志记录应用到配置字典上。记录均为幂等操作，可安全重放。"""
+    op = record.get("op")
+    if op == "add":
+        values = config.setdefault(record["key"], [])
+        if record["value"] not in values:
+            values.append(record["value"])
+    elif op == "remove":
+        values = config.get(record["key"], [])
+        if record["value"] in values:
+            values.remove(record["value"])
+    elif op == "set":
+        target = config
+        for part in record["path"][:-1]:
+            target = target.setdefault(part, {})
+        target[record["path"][-1]] = record["value"]
+    else:
+        raise ValueError(f"unknown journal op: {op}")
+
+
+class ConfigJournal:
+    """配置修改的追加式日志，每行一条 JSON 记录 (add/remove/set)。
+
+    崩溃时最多丢失最后一条未写完的记录，重放时会跳过它。
+    压缩时先用 rotate() 把当前日志换成 .old 文件，新的修改写入新日志；
+    快照写入成功后再删除 .old。两步之间崩溃时重放 .old 与新日志，记录均幂等，结果不变。
+    """
+
+    def __init__(self, path, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        self.path = Path(path)
+        self.rotated_path = self.path.with_name(self.path.name + ".old")
+        self.compact_threshold = compact_threshold
+        self.record_count = 0
+        self._file = None
+
+    def replay(self, repair=True):
+        """按顺序读取待压缩日志与当前日志中的全部有效记录。
+
+        repair 为 False 时只读不写 (日志由其他进程持有时使用)，不截断残留的半条记录。
+        """
+        records = self._read_records(self.rotated_path, repair) + self._read_records(self.path, repair)
+        self.record_count = len(records)
+        return records
+
+    def _read_records(self, path, repair=True):
+        """读取一个日志文件的记录，并截掉崩溃时残留的半条记录。"""
+        records = []
+        if not path.exists():
+            return records
+
+        with open(path, "rb") as f:
+            data = f.read()
+        complete_size = data.rfind(b"\n") + 1
+        if complete_size < len(data) and repair:
+            logging.warning("Truncating incomplete trailing journal record")
+            with open(path, "r+b") as f:
+                f.truncate(complete_size)
+
+        for line_number, line in enumerate(data[:complete_size].decode("utf-8").splitlines(), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                logging.warning(f"Skipping corrupt journal record at line {line_number}")
+        return records
+
+    def append(self, record):
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self.record_count += 1
+
+    def sync(self):
+        """把已追加的记录持久化到磁盘。"""
+        if self._file is not None:
+            os.fsync(self._file.fileno())
+
+    def needs_compaction(self):
+        return self.record_count >= self.compact_threshold
+
+    def rotate(self):
+        """开始压缩：把当前日志移到 .old，之后追加的记录写入新的日志文件。
+
+        上一次压缩中途失败留下的 .old 会保留，当前日志接在它后面。
+        """
+        self.close()
+        if self.path.exists():
+            if self.rotated_path.exists():
+                with open(self.path, "rb") as src, open(self.rotated_path, "ab") as dst:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                os.unlink(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.record_count = 0
+
+    def discard_rotated(self):
+        """快照写入成功后删除 .old 日志。"""
+        try:
+            self.rotated_path.unlink(missing_ok=True)
+        except OSError as e:
+            logging.error(f"Failed to remove rotated config journal: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
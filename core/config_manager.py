@@ -1,36 +1,246 @@
+import atexit
 import logging
+import threading
 from pathlib import Path
 import toml
+from core import metrics
+from core.atomic_file import atomic_write_text
+from core.config_journal import ConfigJournal, DEFAULT_COMPACT_THRESHOLD, apply_record
+from core.write_behind import WriteBehind
+
+# 以列表形式持久化、在内存中以集合建立索引的配置项
+INDEXED_LISTS = ("favorites", "invisible", "custom_models")
 
 class ConfigManager:
-    def __init__(self, config_path=None):
+    def __init__(self, config_path=None, write_delay=None, journal_path=None,
+                 compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        """write_delay 不为 None 时启用延迟写入：save_config 只标记为脏，
+        静默 write_delay 秒后合并写入一次，退出时自动 flush。
+
+        journal_path 不为 None 时启用日志模式：每次修改追加一条记录，
+        save_config 只需同步日志，记录数超过 compact_threshold 时才重写快照。"""
         if config_path is None:
             config_path = Path("config.toml")
         self.config_path = Path(config_path)
         self.config = {}
+        self.version = 0
+        self._indexes = {}
+        # 保护 self.config，延迟写入在后台线程中序列化配置
+        self._lock = threading.RLock()
+        # 串行化快照写入 (压缩可能同时由延迟写入线程与 flush 触发)
+        self._snapshot_lock = threading.Lock()
+        self._writer = None
+        self.journal = None
+        self.store = None
+        self._flush_registered = False
+        if journal_path is not None:
+            self.journal = ConfigJournal(journal_path, compact_threshold)
+        if write_delay is not None:
+            self._writer = WriteBehind(self._write_config, write_delay)
+        if self._writer is not None or self.journal is not None:
+            self._register_flush()
         self.load_config()
 
+    def _register_flush(self):
+        if not self._flush_registered:
+            atexit.register(self.flush_config)
+            self._flush_registered = True
+
     def load_config(self):
         """从 TOML 文件加载配置。"""
-        if self.config_path.exists():
+        with self._lock:
+            if self.config_path.exists():
+                try:
+                    self.config = toml.load(self.config_path)
+                except Exception as e:
+                    logging.error(f"Failed to load config: {e}")
+                    self.config = {}
+            else:
+                logging.warning(f"Config file not found at {self.config_path}")
+                self.config = {}
+            if self.journal is not None:
+                self._replay_journal()
+            self._rebuild_indexes()
+            self._sync_store()
+            self._bump_version()
+
+    def attach_store(self, store):
+        """挂接 SQLite 存储 (CatalogStore)：立即同步收藏、隐藏、自定义模型与额度，之后的修改同步写入。
+
+        config.toml 与日志仍是权威来源，存储只用于索引查询，可随时删除重建。
+        """
+        with self._lock:
+            self.store = store
+            self._sync_store()
+
+    def get_store(self):
+        return self.store
+
+    def _sync_store(self):
+        if self.store is None:
+            return
+        self.store.sync_user_state(
+            {key: self.config.get(key, []) for key in INDEXED_LISTS},
+            self.config.get("quotas", {}),
+        )
+
+    def enable_journal(self, journal_path, compact_threshold=DEFAULT_COMPACT_THRESHOLD):
+        """加载配置后启用日志模式 (由 [journal] enabled 控制)，并重放已有日志。
+
+        日志只允许一个进程写入：仅 GUI 启用，命令行使用 load_journal 只读重放。
+        """
+        with self._lock:
+            self.journal = ConfigJournal(journal_path, compact_threshold)
+            self._replay_journal()
+            self._rebuild_indexes()
+            self._sync_store()
+            self._bump_version()
+        self._register_flush()
+
+    def load_journal(self, journal_path):
+        """只读重放日志：应用 GUI 尚未压缩的修改，但不追加记录、不压缩，也不修复日志文件。"""
+        records = ConfigJournal(journal_path).replay(repair=False)
+        if not records:
+            return
+        with self._lock:
+            self._apply_records(records)
+            self._rebuild_indexes()
+            self._sync_store()
+            self._bump_version()
+
+    def fold_journal(self, journal_path):
+        """日志模式关闭时，把之前遗留的日志并入配置快照后删除，避免其中的修改丢失。"""
+        journal = ConfigJournal(journal_path)
+        records = journal.replay()
+        if not records:
+            return
+        with self._lock:
+            self._apply_records(records)
+            self._rebuild_indexes()
+            self._sync_store()
+            self._bump_version()
+            text = toml.dumps(self.config)
+        try:
+            atomic_write_text(self.config_path, text)
+        except Exception as e:
+            logging.error(f"Failed to fold config journal: {e}")
+            return
+        journal.rotate()
+        journal.discard_rotated()
+
+    def _replay_journal(self):
+        """在快照之上重放日志中尚未压缩的修改。"""
+        self._apply_records(self.journal.replay())
+
+    def _apply_records(self, records):
+        for record in records:
             try:
-                self.config = toml.load(self.config_path)
+                apply_record(self.config, record)
             except Exception as e:
-                logging.error(f"Failed to load config: {e}")
-                self.config = {}
-        else:
-            logging.warning(f"Config file not found at {self.config_path}")
-            self.config = {}
+                logging.warning(f"Skipping invalid journal record {record}: {e}")
+
+    def _record(self, record):
+        if self.journal is None:
+            return
+        try:
+            self.journal.append(record)
+        except Exception as e:
+            logging.error(f"Failed to append config journal: {e}")
+
+    def _rebuild_indexes(self):
+        """根据持久化列表重建内存索引。"""
+        self._indexes = {key: set(self.config.get(key, [])) for key in INDEXED_LISTS}
+
+    def _bump_version(self):
+        self.version += 1
+
+    def get_version(self):
+        """获取配置版本号，每次修改都会递增，可用于缓存派生结果。"""
+        return self.version
+
+    def _add_to_list(self, key, model_id):
+        with self._lock:
+            if model_id in self._indexes[key]:
+                return
+            self.config.setdefault(key, []).append(model_id)
+            self._indexes[key].add(model_id)
+            if self.store is not None:
+                self.store.add_flag(key, model_id)
+            self._record({"op": "add", "key": key, "value": model_id})
+            self._bump_version()
+
+    def _remove_from_list(self, key, model_id):
+        with self._lock:
+            if model_id not in self._indexes[key]:
+                return
+            self.config[key].remove(model_id)
+            self._indexes[key].discard(model_id)
+            if self.store is not None:
+                self.store.remove_flag(key, model_id)
+            self._record({"op": "remove", "key": key, "value": model_id})
+            self._bump_version()
 
     def save_config(self):
-        """将当前配置保存到 TOML 文件。"""
+        """将当前配置保存到 TOML 文件 (启用延迟写入时只标记为待写入)。"""
+        with metrics.span("config.save"):
+            self._save_config()
+
+    def _save_config(self):
+        if self.journal is not None:
+            # 日志模式下修改已逐条追加，这里只需落盘，必要时再压缩为快照
+            try:
+                # 与压缩时的日志轮换互斥，避免同步到已关闭的文件
+                with self._lock:
+                    self.journal.sync()
+            except Exception as e:
+                logging.error(f"Failed to sync config journal: {e}")
+            if self.journal.needs_compaction():
+                self._request_write()
+            return
+        self._request_write()
+
+    def _request_write(self):
+        if self._writer is not None:
+            self._writer.request()
+            return
         try:
-            self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, "w") as f:
-                toml.dump(self.config, f)
+            self._write_config()
         except Exception as e:
             logging.error(f"Failed to save config: {e}")
 
+    def flush_config(self):
+        """立即写入尚未落盘的修改 (日志模式下会压缩日志)。"""
+        if self.journal is not None and self.journal.record_count:
+            self._request_write()
+        if self._writer is not None:
+            self._writer.flush()
+
+    def get_write_stats(self):
+        """获取保存请求数与实际写入数，用于衡量合并写入的效果。"""
+        if self._writer is None:
+            return {"requested": 0, "written": 0, "saved": 0}
+        return self._writer.get_stats()
+
+    def _write_config(self):
+        with metrics.span("config.write"):
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        if self.journal is None:
+            with self._lock:
+                text = toml.dumps(self.config)
+            atomic_write_text(self.config_path, text)
+            return
+
+        # 压缩：持锁序列化配置并轮换日志，之后的修改记入新日志；
+        # 落盘较慢的快照写入在锁外进行，不阻塞界面线程上的修改
+        with self._snapshot_lock:
+            with self._lock:
+                text = toml.dumps(self.config)
+                self.journal.rotate()
+            atomic_write_text(self.config_path, text)
+            self.journal.discard_rotated()
+
     def get_window_geometry(self):
         """从配置中获取窗口几何信息 (x, y, width, height)。"""
         window_config = self.config.get("window", {})
@@ -43,13 +253,70 @@ class ConfigManager:
 
     def set_window_geometry(self, x, y, width, height):
         """更新配置中的窗口几何信息。"""
-        if "window" not in self.config:
-            self.config["window"] = {}
+        with self._lock:
+            if "window" not in self.config:
+                self.config["window"] = {}
 
-        self.config["window"]["x"] = x
-        self.config["window"]["y"] = y
-        self.config["window"]["width"] = width
-        self.config["window"]["height"] = height
+            self.config["window"]["x"] = x
+            self.config["window"]["y"] = y
+            self.config["window"]["width"] = width
+            self.config["window"]["height"] = height
+            self._record({"op": "set", "path": ["window"], "value": dict(self.config["window"])})
+            self._bump_version()
+
+    def get_network_config(self):
+        """获取网络连接配置 (连接池大小、是否保持长连接)。"""
+        network_config = self.config.get("network", {})
+        return {
+            "pool_size": network_config.get("pool_size", 8),
+            "keep_alive": network_config.get("keep_alive", True),
+            "prewarm": network_config.get("prewarm", True),
+        }
+
+    def get_rate_limit_config(self):
+        """获取请求限流配置：是否启用与单次请求最长排队时间 (秒)。"""
+        rate_limit_config = self.config.get("rate_limit", {})
+        return {
+            "enabled": rate_limit_config.get("enabled", True),
+            "max_wait": rate_limit_config.get("max_wait", 10.0),
+        }
+
+    def get_quota_history_config(self):
+        """获取额度历史配置：是否记录每次额度观测，以及保留天数。"""
+        history_config = self.config.get("quota_history", {})
+        return {
+            "enabled": history_config.get("enabled", True),
+            "retention_days": history_config.get("retention_days", 180),
+        }
+
+    def get_storage_config(self):
+        """获取存储后端配置：backend 为 "sqlite" 时额外把目录与用户状态同步到 SQLite，用索引查询筛选与计数。"""
+        storage_config = self.config.get("storage", {})
+        return {"backend": storage_config.get("backend", "toml")}
+
+    def get_journal_config(self):
+        """获取配置日志模式设置：enabled 为 True 时 GUI 以追加日志记录修改，记录数达到 compact_threshold 时压缩为快照。"""
+        journal_config = self.config.get("journal", {})
+        return {
+            "enabled": journal_config.get("enabled", False),
+            "compact_threshold": journal_config.get("compact_threshold", DEFAULT_COMPACT_THRESHOLD),
+        }
+
+    def get_metrics_config(self):
+        """获取指标导出配置：textfile 非空时按 interval 秒定期写入 Prometheus 文本文件。"""
+        metrics_config = self.config.get("metrics", {})
+        return {
+            "textfile": metrics_config.get("textfile", ""),
+            "interval": metrics_config.get("interval", 15),
+        }
+
+    def get_quota_sweep_concurrency(self):
+        """获取批量额度检查的并发上限。"""
+        return self.config.get("quota_sweep", {}).get("concurrency", 4)
+
+    def get_dashboard_concurrency(self):
+        """获取多账号总览刷新的并发上限。"""
+        return self.config.get("dashboard", {}).get("concurrency", 8)
 
     def get_favorites(self):
         """获取收藏的模型列表。"""
@@ -57,19 +324,15 @@ class ConfigManager:
 
     def add_favorite(self, model_id):
         """添加模型到收藏。"""
-        if "favorites" not in self.config:
-            self.config["favorites"] = []
-        if model_id not in self.config["favorites"]:
-            self.config["favorites"].append(model_id)
+        self._add_to_list("favorites", model_id)
 
     def remove_favorite(self, model_id):
         """从收藏中移除模型。"""
-        if "favorites" in self.config and model_id in self.config["favorites"]:
-            self.config["favorites"].remove(model_id)
+        self._remove_from_list("favorites", model_id)
 
     def is_favorite(self, model_id):
         """检查模型是否已收藏。"""
-        return model_id in self.config.get("favorites", [])
+        return model_id in self._indexes["favorites"]
 
     def get_custom_models(self):
         """获取自定义模型列表。"""
@@ -77,19 +340,15 @@ class ConfigManager:
 
     def add_custom_model(self, model_id):
         """添加自定义模型。"""
-        if "custom_models" not in self.config:
-            self.config["custom_models"] = []
-        if model_id not in self.config["custom_models"]:
-            self.config["custom_models"].append(model_id)
+        self._add_to_list("custom_models", model_id)
 
     def remove_custom_model(self, model_id):
         """移除自定义模型。"""
-        if "custom_models" in self.config and model_id in self.config["custom_models"]:
-            self.config["custom_models"].remove(model_id)
+        self._remove_from_list("custom_models", model_id)
 
     def is_custom_model(self, model_id):
         """检查是否为自定义模型。"""
-        return model_id in self.config.get("custom_models", [])
+        return model_id in self._indexes["custom_models"]
 
     def get_active_account(self):
         """获取当前激活的账号名。"""
@@ -97,7 +356,10 @@ class ConfigManager:
 
     def set_active_account(self, account_name):
         """设置当前激活的账号名。"""
-        self.config["active_account"] = account_name
+        with self._lock:
+            self.config["active_account"] = account_name
+            self._record({"op": "set", "path": ["active_account"], "value": account_name})
+            self._bump_version()
 
     def get_invisible(self):
         """获取隐藏的模型列表。"""
@@ -105,23 +367,26 @@ class ConfigManager:
 
     def add_invisible(self, model_id):
         """添加模型到隐藏列表。"""
-        if "invisible" not in self.config:
-            self.config["invisible"] = []
-        if model_id not in self.config["invisible"]:
-            self.config["invisible"].append(model_id)
+        self._add_to_list("invisible", model_id)
 
     def remove_invisible(self, model_id):
         """从隐藏列表中移除模型。"""
-        if "invisible" in self.config and model_id in self.config["invisible"]:
-            self.config["invisible"].remove(model_id)
+        self._remove_from_list("invisible", model_id)
 
     def is_invisible(self, model_id):
         """检查模型是否已隐藏。"""
-        return model_id in self.config.get("invisible", [])
+        return model_id in self._indexes["invisible"]
 
     def get_last_quota(self):
         """获取最后一次保存的额度信息 (基于当前账号)。"""
-        account = self.get_active_account()
+        return self.get_account_quota(self.get_active_account())
+
+    def set_last_quota(self, user_remaining, user_limit):
+        """保存额度信息 (基于当前账号)。"""
+        self.set_account_quota(self.get_active_account(), user_remaining, user_limit)
+
+    def get_account_quota(self, account):
+        """获取指定账号最后一次保存的额度信息。"""
         if not account:
             return {"user_remaining": "N/A", "user_limit": "N/A"}
 
@@ -132,17 +397,30 @@ class ConfigManager:
             "user_limit": account_quota.get("user_limit", "N/A"),
         }
 
-    def set_last_quota(self, user_remaining, user_limit):
-        """保存额度信息 (基于当前账号)。"""
-        account = self.get_active_account()
+    def set_account_quota(self, account, user_remaining, user_limit):
+        """保存指定账号的额度信息。"""
         if not account:
             return
 
-        if "quotas" not in self.config:
-            self.config["quotas"] = {}
+        with self._lock:
+            if "quotas" not in self.config:
+                self.config["quotas"] = {}
 
-        if account not in self.config["quotas"]:
-            self.config["quotas"][account] = {}
+            if account not in self.config["quotas"]:
+                self.config["quotas"][account] = {}
 
-        self.config["quotas"][account]["user_remaining"] = str(user_remaining)
-        self.config["quotas"][account]["user_limit"] = str(user_limit)
+            self.config["quotas"][account]["user_remaining"] = str(user_remaining)
+            self.config["quotas"][account]["user_limit"] = str(user_limit)
+            self._record({
+                "op": "set",
+                "path": ["quotas", account, "user_remaining"],
+                "value": str(user_remaining),
+            })
+            self._record({
+                "op": "set",
+                "path": ["quotas", account, "user_limit"],
+                "value": str(user_limit),
+            })
+            if self.store is not None:
+                self.store.set_quota(account, user_remaining, user_limit)
+            self._bump_version()
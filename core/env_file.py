@@ -0,0 +1,123 @@
+import logging
+import re
+from pathlib import Path
+from core.atomic_file import atomic_write_text
+
+ENV_LINE_PATTERN = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.-]*)\s*=\s*(.*)$")
+
+
+def parse_env_value(raw):
+    """解析 .env 中的值：支持单/双引号与行尾注释。"""
+    raw = raw.strip()
+    if raw[:1] in ("'", '"'):
+        quote = raw[0]
+        end = 1
+        while end < len(raw) and raw[end] != quote:
+            end += 2 if raw[end] == "\\" else 1
+        if end < len(raw):
+            value = raw[1:end]
+            if quote == '"':
+                return value.replace("\\n", "\n").replace('\\"', '"')
+            return value.replace("\\'", "'")
+    comment = raw.find(" #")
+    if comment >= 0:
+        raw = raw[:comment]
+    return raw.strip()
+
+
+def format_env_line(key, value):
+    # 与 python-dotenv 的 set_key 默认格式保持一致
+    escaped = value.replace("'", "\\'")
+    return f"{key}='{escaped}'"
+
+
+class EnvFile:
+    """.env 文件的内存表示。
+
+    只在 load() 时解析一次，按键建立索引；set/unset 仅修改内存，
+    save() 时一次性原子重写，注释与未识别的行原样保留。
+    重复的键以最后一次出现为准，之前的行原样保留，unset 时一并删除。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.lines = []
+        self.index = {}
+        self.values = {}
+        self.shadowed = {}
+        self.dirty = False
+        self.loaded = False
+
+    def load(self):
+        self.lines = []
+        self.index = {}
+        self.values = {}
+        self.shadowed = {}
+        self.dirty = False
+        self.loaded = True
+        if not self.path.exists():
+            return
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except Exception as e:
+            logging.error(f"Failed to read env file: {e}")
+            return
+
+        for raw_line in text.splitlines():
+            match = ENV_LINE_PATTERN.match(raw_line)
+            if not match or raw_line.lstrip().startswith("#"):
+                self.lines.append([None, raw_line])
+                continue
+            key = match.group(1)
+            if key in self.index:
+                # 重复的键以最后一次出现为准，之前的行按原文保留
+                logging.warning(f"Duplicate key {key} in env file, using the last value")
+                position = self.index[key]
+                self.lines[position] = [None, self.lines[position][1]]
+                self.shadowed.setdefault(key, []).append(position)
+            self.index[key] = len(self.lines)
+            self.lines.append([key, raw_line])
+            self.values[key] = parse_env_value(match.group(2))
+
+    def ensure_loaded(self):
+        """尚未读取文件时先读取，避免用空内容覆盖已有的 .env。"""
+        if not self.loaded:
+            self.load()
+
+    def get(self, key, default=None):
+        return self.values.get(key, default)
+
+    def items(self):
+        """按文件中的顺序返回 (键, 值)。"""
+        return [(line[0], self.values[line[0]]) for line in self.lines if line and line[0]]
+
+    def set(self, key, value):
+        if self.values.get(key) == value and key in self.index:
+            return
+        line = format_env_line(key, value)
+        if key in self.index:
+            self.lines[self.index[key]] = [key, line]
+        else:
+            self.index[key] = len(self.lines)
+            self.lines.append([key, line])
+        self.values[key] = value
+        self.dirty = True
+
+    def unset(self, key):
+        position = self.index.pop(key, None)
+        if position is None:
+            return
+        self.lines[position] = None
+        # 同时删除被覆盖的重复行，否则重新读取时旧值会重新生效
+        for shadowed in self.shadowed.pop(key, []):
+            self.lines[shadowed] = None
+        del self.values[key]
+        self.dirty = True
+
+    def save(self):
+        """把内存中的内容一次性原子写回文件。"""
+        if not self.dirty:
+            return
+        text = "".join(f"{line[1]}\n" for line in self.lines if line is not None)
+        atomic_write_text(self.path, text)
+        self.dirty = False
@@ -20,3 +20,18 @@ class RequestFailedError(CoreError):
             "response_text": response_text,
         }
         super().__init__(message="request_failed", context=context)
+
+
+class AccountNotFoundError(CoreError):
+    code = "account_not_found"
+
+
+class RateLimitedError(CoreError):
+    code = "rate_limited"
+
+    def __init__(self, retry_after, context=None):
+        super().__init__(message="rate_limited", context={"retry_after": retry_after, **(context or {})})
+
+
+class RequestCancelledError(CoreError):
+    code = "cancelled"
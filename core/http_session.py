@@ -0,0 +1,69 @@
+import logging
+import threading
+
+DEFAULT_POOL_SIZE = 8
+PREWARM_TIMEOUT = 5
+
+_session = None
+_session_lock = threading.Lock()
+_pool_size = DEFAULT_POOL_SIZE
+_keep_alive = True
+
+
+def configure_session(pool_size=DEFAULT_POOL_SIZE, keep_alive=True):
+    """设置进程级共享会话的连接池大小与长连接开关，已有会话会按新参数重建。"""
+    global _pool_size, _keep_alive
+    with _session_lock:
+        _pool_size = max(int(pool_size), 1)
+        _keep_alive = bool(keep_alive)
+        _close_locked()
+
+
+def get_session():
+    """获取进程级共享的 requests 会话 (带连接池，可跨线程复用连接)。"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _create_session()
+        return _session
+
+
+def close_session():
+    with _session_lock:
+        _close_locked()
+
+
+def prewarm(url, timeout=PREWARM_TIMEOUT):
+    """在后台线程中预先建立到 url 所在主机的连接 (DNS + TCP + TLS)。"""
+    thread = threading.Thread(target=_prewarm, args=(url, timeout), daemon=True)
+    thread.start()
+    return thread
+
+
+def _create_session():
+    # requests 在第一次真正发请求时才导入，避免拖慢启动
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=_pool_size, pool_maxsize=_pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not _keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def _close_locked():
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def _prewarm(url, timeout):
+    try:
+        # 只关心连接本身，响应状态 (如 401) 无关紧要
+        get_session().head(url, timeout=timeout)
+    except Exception as e:
+        logging.warning(f"Connection prewarm failed: {e}")
@@ -0,0 +1,208 @@
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+from contextlib import contextmanager
+from core.atomic_file import atomic_write_text
+
+# 直方图桶上界 (秒)，覆盖从内存操作到慢速网络请求的范围
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+PROMETHEUS_PREFIX = "modelscope_manager"
+DEFAULT_EXPORT_INTERVAL = 15
+
+
+class Histogram:
+    """耗时直方图：按固定桶计数，同时记录次数、总和与最值。"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def quantile(self, q):
+        """按桶估算分位数 (返回所在桶的上界，最后一个桶返回最大值)。"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                return self.max
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """进程内的耗时直方图与计数器集合，可在多个线程中并发记录。"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def span(self, name):
+        """记录代码块的耗时，异常退出时同样计入。"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "timestamp": time.time(),
+                "histograms": {name: h.to_dict() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.counters.clear()
+
+
+def _metric_name(name):
+    return f"{PROMETHEUS_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+
+
+def format_prometheus(snapshot):
+    """把快照转换为 Prometheus 文本格式 (node_exporter textfile collector 可直接读取)。"""
+    lines = []
+    for name, histogram in snapshot["histograms"].items():
+        metric = f"{_metric_name(name)}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        cumulative = 0
+        for bound, count in histogram["buckets"].items():
+            cumulative += count
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f"{metric}_sum {histogram['sum']:.6f}")
+        lines.append(f"{metric}_count {histogram['count']}")
+    for name, value in snapshot["counters"].items():
+        metric = f"{_metric_name(name)}_total"
+        lines.append(f"# TYPE {metric} counter")
+        lines.append(f"{metric} {value}")
+    return "\n".join(lines) + "\n"
+
+
+_registry = MetricsRegistry()
+_exporter = None
+
+
+def get_registry():
+    return _registry
+
+
+def span(name):
+    return _registry.span(name)
+
+
+def observe(name, seconds):
+    _registry.observe(name, seconds)
+
+
+def increment(name, value=1):
+    _registry.increment(name, value)
+
+
+def snapshot():
+    return _registry.snapshot()
+
+
+def reset():
+    _registry.reset()
+
+
+def export_json(path):
+    atomic_write_text(path, json.dumps(snapshot(), indent=2, ensure_ascii=False))
+
+
+def export_prometheus(path):
+    # 原子替换，避免采集端读到写了一半的文件
+    atomic_write_text(path, format_prometheus(snapshot()))
+
+
+class PeriodicExporter:
+    """在后台线程中按固定间隔把指标写入 Prometheus 文本文件。"""
+
+    def __init__(self, path, interval=DEFAULT_EXPORT_INTERVAL):
+        self.path = path
+        self.interval = max(float(interval), 1.0)
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        self._export()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self._export()
+
+    def _export(self):
+        try:
+            export_prometheus(self.path)
+        except Exception as e:
+            logging.warning(f"Failed to export metrics: {e}")
+
+
+def start_periodic_export(path, interval=DEFAULT_EXPORT_INTERVAL):
+    global _exporter
+    stop_periodic_export()
+    _exporter = PeriodicExporter(path, interval).start()
+    return _exporter
+
+
+def stop_periodic_export():
+    global _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
@@ -11,6 +11,12 @@ def merge_models(api_models, custom_models):
     return merged
 
 
+def get_org(model_id):
+    """模型 ID 中 "/" 之前的组织名 (统一小写)，没有组织前缀时为空字符串。"""
+    org, separator, _ = model_id.partition("/")
+    return org.casefold() if separator else ""
+
+
 def filter_models(models, search_text, favorites_only, hidden_only, is_favorite, is_hidden):
     filtered = []
 
@@ -32,3 +38,80 @@ def filter_models(models, search_text, favorites_only, hidden_only, is_favorite,
         filtered.append(model_id)
 
     return filtered
+
+
+def build_visibility_bitmap(catalogs):
+    """根据各账号的模型目录构建 {model_id: 位图}，第 i 位表示第 i 个账号可见。
+
+    catalogs 为按账号顺序排列的模型 ID 列表。
+    """
+    bitmap = {}
+    for bit, models in enumerate(catalogs):
+        mask = 1 << bit
+        for model_id in models:
+            bitmap[model_id] = bitmap.get(model_id, 0) | mask
+    return bitmap
+
+
+def accounts_from_bitmap(mask, account_names):
+    return [name for bit, name in enumerate(account_names) if mask & (1 << bit)]
+
+
+def diff_model_ids(old_ids, new_ids):
+    """计算把 old_ids 变为 new_ids 所需的最少行操作。
+
+    返回按顺序执行的操作列表:
+    ("remove", start, count)、("insert", start, ids)、("move", src, dst)。
+    过滤结果始终保持合并顺序，因此通常只产生删除和插入。
+    old_ids 中重复出现的 ID 只保留第一行，其余行会被删除。
+    """
+    ops = []
+    new_set = set(new_ids)
+
+    # 每个 ID 只保留第一次出现且仍在新列表中的行
+    keep = []
+    kept = set()
+    for model_id in old_ids:
+        if model_id in new_set and model_id not in kept:
+            kept.add(model_id)
+            keep.append(True)
+        else:
+            keep.append(False)
+
+    row = len(old_ids) - 1
+    while row >= 0:
+        if keep[row]:
+            row -= 1
+            continue
+        end = row
+        while row >= 0 and not keep[row]:
+            row -= 1
+        ops.append(("remove", row + 1, end - row))
+
+    current = [model_id for model_id, kept_row in zip(old_ids, keep) if kept_row]
+    present = set(current)
+
+    row = 0
+    while row < len(new_ids):
+        model_id = new_ids[row]
+        if row < len(current) and current[row] == model_id:
+            row += 1
+            continue
+
+        if model_id not in present:
+            end = row
+            while end < len(new_ids) and new_ids[end] not in present:
+                end += 1
+            inserted = list(new_ids[row:end])
+            ops.append(("insert", row, inserted))
+            current[row:row] = inserted
+            present.update(inserted)
+            row = end
+            continue
+
+        src = current.index(model_id, row)
+        ops.append(("move", src, row))
+        current.insert(row, current.pop(src))
+        row += 1
+
+    return ops
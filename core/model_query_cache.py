@@ -0,0 +1,60 @@
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 32
+
+
+class ModelQueryCache:
+    """最近搜索结果的 LRU 缓存，用于边输入边搜索。
+
+    以 (查询, 过滤选项) 为键，整体绑定到目录版本与配置版本，任一版本变化即清空。
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.version = None
+        self.entries = OrderedDict()
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+
+    def get(self, version, query, flags):
+        """命中时返回缓存结果，否则返回 None。"""
+        self._check_version(version)
+        key = (query, flags)
+        result = self.entries.get(key)
+        if result is not None:
+            self.entries.move_to_end(key)
+        return result
+
+    def find_parent(self, version, query, flags):
+        """查找被 query 包含的最长已缓存查询的结果。
+
+        query 包含该查询时，其结果必然是父结果的子集 (例如 "qwen" -> "qwen3")。
+        """
+        self._check_version(version)
+        parent_key = None
+        for key in self.entries:
+            cached_query, cached_flags = key
+            if cached_flags != flags or cached_query not in query:
+                continue
+            if parent_key is None or len(cached_query) > len(parent_key[0]):
+                parent_key = key
+
+        if parent_key is None:
+            return None
+        self.entries.move_to_end(parent_key)
+        return self.entries[parent_key]
+
+    def put(self, version, query, flags, result):
+        self._check_version(version)
+        key = (query, flags)
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+        self.version = None
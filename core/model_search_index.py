@@ -0,0 +1,68 @@
+from core.model_list_logic import merge_models
+
+TRIGRAM_SIZE = 3
+
+
+def fold_text(text):
+    """统一大小写，用于不区分大小写的匹配。"""
+    return text.casefold()
+
+
+def iter_trigrams(text):
+    for start in range(len(text) - TRIGRAM_SIZE + 1):
+        yield text[start:start + TRIGRAM_SIZE]
+
+
+class ModelSearchIndex:
+    """模型目录的子串搜索索引，每次目录刷新时构建一次。
+
+    结果顺序与 merge_models 的合并顺序一致。
+    """
+
+    def __init__(self, api_models, custom_models):
+        self.models = merge_models(api_models, custom_models)
+        self.keys = [fold_text(model_id) for model_id in self.models]
+        self.trigrams = {}
+
+        trigrams = self.trigrams
+        for position, key in enumerate(self.keys):
+            for start in range(len(key) - TRIGRAM_SIZE + 1):
+                postings = trigrams.setdefault(key[start:start + TRIGRAM_SIZE], [])
+                # 同一 ID 内重复出现的三元组只记录一次
+                if not postings or postings[-1] != position:
+                    postings.append(position)
+
+    def __len__(self):
+        return len(self.models)
+
+    def search(self, search_text):
+        """返回 ID 中包含 search_text (不区分大小写) 的模型，保持合并顺序。"""
+        if not search_text:
+            return list(self.models)
+
+        query = fold_text(search_text)
+        if len(query) < TRIGRAM_SIZE:
+            return [
+                model_id
+                for model_id, key in zip(self.models, self.keys)
+                if query in key
+            ]
+
+        positions = self._candidate_positions(query)
+        return [
+            self.models[position]
+            for position in positions
+            if query in self.keys[position]
+        ]
+
+    def _candidate_positions(self, query):
+        # 匹配结果必然出现在查询中每个三元组的倒排表里，取最短的一张作为候选，
+        # 再由调用方做子串校验；倒排表按位置递增，天然保持合并顺序
+        shortest = None
+        for trigram in set(iter_trigrams(query)):
+            postings = self.trigrams.get(trigram)
+            if not postings:
+                return []
+            if shortest is None or len(postings) < len(shortest):
+                shortest = postings
+        return shortest
@@ -1,24 +1,116 @@
-from core.model_list_logic import merge_models, filter_models
+from collections import Counter
+from core import metrics
+from core.model_list_logic import filter_models, get_org, merge_models
+from core.model_query_cache import ModelQueryCache
+from core.model_search_index import ModelSearchIndex, fold_text
 
 class ModelService:
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, quota_history=None):
         self.config_manager = config_manager
+        self.quota_history = quota_history
+        self.search_index = None
+        self._indexed_api_models = None
+        self._indexed_custom_models = None
+        self._stored_api_models = None
+        self._stored_custom_models = None
+        self.catalog_version = 0
+        self.query_cache = ModelQueryCache()
+
+    def get_search_index(self, api_models):
+        """获取目录搜索索引，仅在 API 模型列表或自定义模型变化时重建。"""
+        custom_models = tuple(self.config_manager.get_custom_models())
+        if (
+            self.search_index is None
+            or api_models is not self._indexed_api_models
+            or custom_models != self._indexed_custom_models
+        ):
+            self.search_index = ModelSearchIndex(api_models, custom_models)
+            self._indexed_api_models = api_models
+            self._indexed_custom_models = custom_models
+            self.catalog_version += 1
+        return self.search_index
+
+    def sync_store(self, store, api_models):
+        """把合并后的目录写入 SQLite 存储，仅在 API 模型列表或自定义模型变化时重写。"""
+        custom_models = tuple(self.config_manager.get_custom_models())
+        if api_models is not self._stored_api_models or custom_models != self._stored_custom_models:
+            store.replace_catalog(merge_models(api_models, custom_models))
+            self._stored_api_models = api_models
+            self._stored_custom_models = custom_models
+            self.catalog_version += 1
+
+    def reset_store_sync(self):
+        """忘记上次写入存储的目录，下一次 sync_store 会重新交给存储比较摘要。"""
+        self._stored_api_models = None
+        self._stored_custom_models = None
+
+    def filter_model_ids(self, api_models, search_text, favorites_only, hidden_only):
+        """按搜索词和过滤选项筛选模型 ID，优先复用最近查询的缓存结果。
+
+        ConfigManager 挂接了 SQLite 存储时，未命中缓存的查询由存储的索引查询完成，不再构建内存索引。
+        """
+        store = self.config_manager.get_store()
+        if store is not None:
+            self.sync_store(store, api_models)
+        else:
+            search_index = self.get_search_index(api_models)
+        version = (self.catalog_version, self.config_manager.get_version())
+        query = fold_text(search_text or "")
+        flags = (bool(favorites_only), bool(hidden_only))
+
+        # 回退 (删除字符) 时直接命中缓存
+        cached = self.query_cache.get(version, query, flags)
+        if cached is not None:
+            return cached
+
+        # 在已缓存查询的基础上继续输入时，只需在父结果中再筛选一次
+        parent = self.query_cache.find_parent(version, query, flags)
+        if parent is not None:
+            filtered_models = [model_id for model_id in parent if query in fold_text(model_id)]
+        elif store is not None:
+            filtered_models = store.search(query, favorites_only, hidden_only)
+        else:
+            filtered_models = filter_models(
+                search_index.search(query),
+                "",
+                favorites_only,
+                hidden_only,
+                self.config_manager.is_favorite,
+                self.config_manager.is_invisible,
+            )
+
+        self.query_cache.put(version, query, flags, filtered_models)
+        return filtered_models
 
     def build_model_items(self, api_models, search_text, favorites_only, hidden_only):
-        custom_models = self.config_manager.get_custom_models()
-        merged_models = merge_models(api_models, custom_models)
+        with metrics.span("model_service.build_model_items"):
+            filtered_models = self.filter_model_ids(
+                api_models,
+                search_text,
+                favorites_only,
+                hidden_only,
+            )
 
+            return self._build_items(filtered_models)
+
+    def build_batch_items(self, model_ids, search_text, favorites_only, hidden_only):
+        """为流式到达的一批模型构建列表项：直接筛选这一批，不建索引也不进查询缓存。"""
+        query = fold_text(search_text or "")
+        if query:
+            model_ids = [model_id for model_id in model_ids if query in fold_text(model_id)]
         filtered_models = filter_models(
-            merged_models,
-            search_text,
+            model_ids,
+            "",
             favorites_only,
             hidden_only,
             self.config_manager.is_favorite,
             self.config_manager.is_invisible,
         )
+        return self._build_items(filtered_models)
 
+    def _build_items(self, model_ids):
         items = []
-        for model_id in filtered_models:
+        for model_id in model_ids:
             items.append(
                 {
                     "model_id": model_id,
@@ -29,9 +121,36 @@ class ModelService:
             )
         return items
 
+    def count_models(self, api_models, search_text="", favorites_only=False, hidden_only=False):
+        """统计筛选结果数量；使用 SQLite 存储时直接 COUNT，不生成结果列表。"""
+        store = self.config_manager.get_store()
+        if store is None:
+            return len(self.filter_model_ids(api_models, search_text, favorites_only, hidden_only))
+        self.sync_store(store, api_models)
+        return store.count(search_text, favorites_only, hidden_only)
+
+    def count_models_by_org(self, api_models, search_text="", favorites_only=False, hidden_only=False):
+        """按组织统计筛选结果数量，返回 [(组织, 数量)]，数量多的在前。"""
+        store = self.config_manager.get_store()
+        if store is not None:
+            self.sync_store(store, api_models)
+            return store.count_by_org(search_text, favorites_only, hidden_only)
+        counts = Counter(
+            get_org(model_id)
+            for model_id in self.filter_model_ids(api_models, search_text, favorites_only, hidden_only)
+        )
+        return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+
     def get_cached_quota(self):
         return self.config_manager.get_last_quota()
 
+    def _record_quota_history(self, observations):
+        """把额度观测追加到当前账号的额度历史 (未启用时忽略)。"""
+        if self.quota_history is None:
+            return
+        account = self.config_manager.get_active_account()
+        self.quota_history.record_many([{**observation, "account": account} for observation in observations])
+
     def update_quota_from_list(self, quota_info):
         user_limit = quota_info.get("user_limit", "N/A")
         user_remaining = quota_info.get("user_remaining", "N/A")
@@ -40,6 +159,7 @@ class ModelService:
         if user_remaining != "N/A" and user_limit != "N/A":
             self.config_manager.set_last_quota(user_remaining, user_limit)
             self.config_manager.save_config()
+            self._record_quota_history([quota_info])
             updated = True
 
         return {
@@ -59,6 +179,7 @@ class ModelService:
         if user_remaining != "N/A" and user_limit != "N/A":
             self.config_manager.set_last_quota(user_remaining, user_limit)
             self.config_manager.save_config()
+            self._record_quota_history([quota_info])
             updated = True
 
         return {
@@ -70,6 +191,37 @@ class ModelService:
             "updated": updated,
         }
 
+    def update_quota_from_sweep(self, results):
+        """汇总批量额度检查结果，并以最后一个有效响应更新用户额度。"""
+        succeeded = [result for result in results if result.get("ok")]
+        user_limit = "N/A"
+        user_remaining = "N/A"
+        for result in succeeded:
+            if result.get("user_remaining", "N/A") != "N/A" and result.get("user_limit", "N/A") != "N/A":
+                user_limit = result["user_limit"]
+                user_remaining = result["user_remaining"]
+
+        updated = False
+        if user_remaining != "N/A" and user_limit != "N/A":
+            self.config_manager.set_last_quota(user_remaining, user_limit)
+            self.config_manager.save_config()
+            self._record_quota_history(succeeded)
+            updated = True
+
+        return {
+            "user_limit": user_limit,
+            "user_remaining": user_remaining,
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "updated": updated,
+        }
+
+    def get_favorites(self):
+        return self.config_manager.get_favorites()
+
+    def get_quota_sweep_concurrency(self):
+        return self.config_manager.get_quota_sweep_concurrency()
+
     def toggle_favorite(self, model_id):
         if self.config_manager.is_favorite(model_id):
             self.config_manager.remove_favorite(model_id)
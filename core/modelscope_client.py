@@ -1,37 +1,134 @@
-import requests
-from core.errors import ApiKeyMissingError, RequestFailedError
+import os
+from core import metrics
+from core.catalog_stream import ModelListStreamParser
+from core.errors import ApiKeyMissingError, RateLimitedError, RequestFailedError
+from core.http_session import get_session
+from core.rate_limiter import get_rate_limiter
 
 REQUEST_TIMEOUT = 15
+DEFAULT_BASE_URL = "https://api-inference.modelscope.cn/v1"
+# 指向本地替身服务等其他地址时使用，例如 http://127.0.0.1:8765/v1
+BASE_URL_ENV = "MODELSCOPE_BASE_URL"
+# 流式拉取目录时每次读取的字节数与每批回调的模型数
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_BATCH_SIZE = 1000
+
+
+def get_base_url(base_url=None):
+    """确定 API 根地址：显式传入 > 环境变量 MODELSCOPE_BASE_URL > 官方地址。"""
+    return (base_url or os.getenv(BASE_URL_ENV) or DEFAULT_BASE_URL).rstrip("/")
+
+
+def parse_quota_headers(headers):
+    """从响应头中提取用户级与模型级的限流额度。"""
+    return {
+        "user_limit": headers.get("modelscope-ratelimit-requests-limit", "N/A"),
+        "user_remaining": headers.get("modelscope-ratelimit-requests-remaining", "N/A"),
+        "model_limit": headers.get("modelscope-ratelimit-model-requests-limit", "N/A"),
+        "model_remaining": headers.get("modelscope-ratelimit-model-requests-remaining", "N/A"),
+    }
+
+
+def build_quota_payload(model_id):
+    """额度探测请求体：只生成 1 个 token，尽量少消耗资源。"""
+    return {
+        "model": model_id,
+        "messages": [{"role": "user", "content": "Hello"}],
+        "max_tokens": 1,
+    }
+
 
 class ModelScopeClient:
-    def __init__(self, request_timeout=REQUEST_TIMEOUT):
+    def __init__(self, request_timeout=REQUEST_TIMEOUT, session=None, base_url=None, rate_limiter=None):
         self.request_timeout = request_timeout
-        self.models_url = "https://api-inference.modelscope.cn/v1/models"
-        self.quota_url = "https://api-inference.modelscope.cn/v1/chat/completions"
+        self.session = session
+        # 默认使用进程级共享的限流器，不同 worker 学到的额度互通
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.base_url = get_base_url(base_url)
+        self.models_url = f"{self.base_url}/models"
+        self.quota_url = f"{self.base_url}/chat/completions"
+
+    def list_models(self, api_key, etag=None, last_modified=None, on_batch=None,
+                    batch_size=STREAM_BATCH_SIZE):
+        """拉取模型目录。
 
-    def list_models(self, api_key):
+        传入 on_batch 时以流式方式边下载边解析，每解析出 batch_size 个模型就以 ID 列表回调一次，
+        返回值与非流式时相同 (包含完整的 models)。
+        """
         if not api_key:
             raise ApiKeyMissingError("未找到 API Key")
 
         headers = {"Authorization": f"Bearer {api_key}"}
-        response = requests.get(self.models_url, headers=headers, timeout=self.request_timeout)
+        # 携带上次的校验信息发起条件请求，目录未变化时服务端返回 304
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        stream = on_batch is not None
+        metrics.increment("http.requests")
+        # 流式请求只计到收到响应头，下载与解析计入 json.parse_models
+        try:
+            with metrics.span("http.list_models"):
+                response = self._get_session().get(
+                    self.models_url,
+                    headers=headers,
+                    timeout=self.request_timeout,
+                    stream=stream,
+                )
+        except Exception:
+            # 连接失败、超时等传输错误同样计入错误数
+            metrics.increment("http.errors")
+            raise
 
-        if response.status_code != 200:
-            raise RequestFailedError(response.status_code, response.text)
+        # 拉取目录不消耗调用额度，只用响应头更新账号级额度
+        self.rate_limiter.observe(api_key, None, response.status_code, response.headers, reserved=False)
 
-        resp_json = response.json()
-        models = resp_json.get("data", [])
-        model_ids = [model["id"] for model in models if "id" in model]
+        if response.status_code == 304:
+            metrics.increment("http.not_modified")
+            model_ids = None
+        elif response.status_code != 200:
+            metrics.increment("http.errors")
+            raise RequestFailedError(response.status_code, response.text)
+        elif stream:
+            with metrics.span("json.parse_models"):
+                model_ids = self._stream_model_ids(response, on_batch, batch_size)
+        else:
+            with metrics.span("json.parse_models"):
+                resp_json = response.json()
+                models = resp_json.get("data") or []
+                model_ids = [model["id"] for model in models if "id" in model]
 
         return {
-            "user_limit": response.headers.get("modelscope-ratelimit-requests-limit", "N/A"),
-            "user_remaining": response.headers.get("modelscope-ratelimit-requests-remaining", "N/A"),
-            "model_limit": response.headers.get("modelscope-ratelimit-model-requests-limit", "N/A"),
-            "model_remaining": response.headers.get("modelscope-ratelimit-model-requests-remaining", "N/A"),
+            **parse_quota_headers(response.headers),
             "models": model_ids,
+            "not_modified": model_ids is None,
+            "etag": response.headers.get("ETag", etag),
+            "last_modified": response.headers.get("Last-Modified", last_modified),
         }
 
-    def check_quota(self, model_id, api_key):
+    def _stream_model_ids(self, response, on_batch, batch_size):
+        parser = ModelListStreamParser()
+        model_ids = []
+        pending = []
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                pending.extend(parser.feed(chunk))
+                if len(pending) >= batch_size:
+                    model_ids.extend(pending)
+                    on_batch(pending)
+                    pending = []
+            pending.extend(parser.close())
+        except Exception:
+            # 传输中断或解析失败时不再读取剩余数据，直接关闭连接
+            metrics.increment("http.errors")
+            response.close()
+            raise
+        if pending:
+            model_ids.extend(pending)
+            on_batch(pending)
+        return model_ids
+
+    def check_quota(self, model_id, api_key, is_cancelled=None):
         if not api_key:
             raise ApiKeyMissingError("未找到 API Key")
 
@@ -39,23 +136,39 @@ class ModelScopeClient:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json",
         }
-        payload = {
-            "model": model_id,
-            "messages": [{"role": "user", "content": "Hello"}],
-            "max_tokens": 1,
-        }
+        payload = build_quota_payload(model_id)
+
+        # 额度不足或处于 Retry-After 期间时先等待，等待过久则直接放弃，不浪费一次调用；
+        # 等待中被取消时抛出 RequestCancelledError，请求不会发出
+        delay = self.rate_limiter.wait(api_key, model_id, is_cancelled)
+        if delay:
+            metrics.increment("http.rate_limited")
+            raise RateLimitedError(delay, {"model_id": model_id})
 
-        response = requests.post(
-            self.quota_url,
-            headers=headers,
-            json=payload,
-            timeout=self.request_timeout,
-        )
+        metrics.increment("http.requests")
+        try:
+            with metrics.span("http.check_quota"):
+                response = self._get_session().post(
+                    self.quota_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=self.request_timeout,
+                )
+        except Exception:
+            metrics.increment("http.errors")
+            self.rate_limiter.observe(api_key, model_id, None, {})
+            raise
+        self.rate_limiter.observe(api_key, model_id, response.status_code, response.headers)
+        if response.status_code != 200:
+            metrics.increment("http.errors")
 
         return {
-            "user_limit": response.headers.get("modelscope-ratelimit-requests-limit", "N/A"),
-            "user_remaining": response.headers.get("modelscope-ratelimit-requests-remaining", "N/A"),
-            "model_limit": response.headers.get("modelscope-ratelimit-model-requests-limit", "N/A"),
-            "model_remaining": response.headers.get("modelscope-ratelimit-model-requests-remaining", "N/A"),
+            **parse_quota_headers(response.headers),
+            "model_id": model_id,
             "status_code": response.status_code,
+            "next_allowed_in": self.rate_limiter.time_until_next(api_key, model_id),
         }
+
+    def _get_session(self):
+        # 未显式传入会话时使用进程级共享会话，所有 worker 复用同一连接池
+        return self.session or get_session()
@@ -1,15 +1,168 @@
+import asyncio
+from core import async_runtime
 from core.api_key_provider import resolve_api_key
+from core.errors import ApiKeyMissingError, CoreError, RequestCancelledError
 from core.modelscope_client import ModelScopeClient
 
+DEFAULT_SWEEP_CONCURRENCY = 4
+
 class ModelScopeService:
-    def __init__(self, env_path=None, client=None):
+    def __init__(self, env_path=None, client=None, catalog_cache=None):
         self.env_path = env_path
         self.client = client or ModelScopeClient()
+        self.catalog_cache = catalog_cache
+
+    def list_models(self, api_key=None, on_batch=None):
+        """拉取模型目录；传入 on_batch 时流式解析，目录逐批回调 (304 时没有回调)。"""
+        key = api_key or resolve_api_key(self.env_path)
+        if self.catalog_cache is None:
+            return self.client.list_models(key, on_batch=on_batch)
+
+        # 用缓存的 ETag/Last-Modified 重新校验，304 时直接复用缓存目录
+        entry = self.catalog_cache.load(key)
+        if entry:
+            result = self.client.list_models(key, entry.get("etag"), entry.get("last_modified"), on_batch=on_batch)
+        else:
+            result = self.client.list_models(key, on_batch=on_batch)
+
+        return self._apply_catalog_cache(key, entry, result)
+
+    def _apply_catalog_cache(self, api_key, entry, result):
+        if result["not_modified"]:
+            result["models"] = entry["models"] if entry else []
+            result["from_cache"] = True
+        else:
+            result["from_cache"] = False
+            self.catalog_cache.save(api_key, result["models"], result["etag"], result["last_modified"])
+        return result
 
-    def list_models(self, api_key=None):
+    def get_cached_models(self, api_key=None):
+        """返回缓存中的模型目录，没有缓存时返回 None。"""
+        if self.catalog_cache is None:
+            return None
         key = api_key or resolve_api_key(self.env_path)
-        return self.client.list_models(key)
+        entry = self.catalog_cache.load(key)
+        return entry["models"] if entry else None
 
-    def check_quota(self, model_id, api_key=None):
+    def check_quota(self, model_id, api_key=None, is_cancelled=None):
         key = api_key or resolve_api_key(self.env_path)
-        return self.client.check_quota(model_id, key)
+        return self.client.check_quota(model_id, key, is_cancelled)
+
+    def sweep_quota(self, model_ids, api_key=None, max_concurrency=DEFAULT_SWEEP_CONCURRENCY,
+                    on_result=None, is_cancelled=None):
+        """并发检查多个模型的额度，每完成一个即回调 on_result，返回全部结果。
+
+        每条结果包含 model_id 与 ok；成功时附带额度字段，失败时附带 code 与 context。
+        is_cancelled 返回 True 后不再发起新的请求。
+        """
+        key = api_key or resolve_api_key(self.env_path)
+        if not key:
+            raise ApiKeyMissingError("未找到 API Key")
+        return async_runtime.run(
+            self._sweep_quota(list(model_ids), key, max_concurrency, on_result, is_cancelled)
+        )
+
+    def _get_async_client(self, max_concurrency):
+        """获取共享事件循环上与本服务参数一致的异步客户端，连接池跨多次批量请求复用。"""
+        # aiohttp 导入较慢，只在真正发起批量请求时加载
+        from core.async_modelscope_client import AsyncModelScopeClient
+
+        args = (self.client.request_timeout, max(int(max_concurrency), 1), self.client.base_url,
+                self.client.rate_limiter)
+        return async_runtime.get_client(args, lambda: AsyncModelScopeClient(*args))
+
+    async def _sweep_quota(self, model_ids, api_key, max_concurrency, on_result, is_cancelled):
+        semaphore = asyncio.Semaphore(max(int(max_concurrency), 1))
+
+        client = self._get_async_client(max_concurrency)
+
+        async def probe(model_id):
+            async with semaphore:
+                if is_cancelled and is_cancelled():
+                    return None
+                try:
+                    result = await client.check_quota(model_id, api_key, is_cancelled)
+                    return {"model_id": model_id, "ok": True, **result}
+                except RequestCancelledError:
+                    return None
+                except CoreError as e:
+                    return {"model_id": model_id, "ok": False, "code": e.code, "context": e.context}
+                except Exception as e:
+                    return {
+                        "model_id": model_id,
+                        "ok": False,
+                        "code": "unknown",
+                        "context": {"message": str(e)},
+                    }
+
+        results = []
+        for future in asyncio.as_completed([probe(model_id) for model_id in model_ids]):
+            result = await future
+            if result is None:
+                continue
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+
+    def list_models_for_accounts(self, accounts, max_concurrency=DEFAULT_SWEEP_CONCURRENCY,
+                                 on_result=None, is_cancelled=None):
+        """并发拉取多个账号的模型目录，每完成一个账号即回调 on_result。
+
+        accounts 为 {账号名: API Key}。每条结果包含 account 与 ok；成功时附带
+        models 与额度字段，失败时附带 code 与 context。启用目录缓存时使用条件请求，
+        并把结果写回缓存，之后切换账号可直接使用。
+        """
+        return async_runtime.run(
+            self._list_models_for_accounts(dict(accounts), max_concurrency, on_result, is_cancelled)
+        )
+
+    async def _list_models_for_accounts(self, accounts, max_concurrency, on_result, is_cancelled):
+        semaphore = asyncio.Semaphore(max(int(max_concurrency), 1))
+
+        client = self._get_async_client(max_concurrency)
+
+        async def fetch(account, api_key):
+            async with semaphore:
+                # 在拿到并发名额、即将发出请求时检查，排队中的账号取消后不再请求
+                if is_cancelled and is_cancelled():
+                    return None
+                return await fetch_account(account, api_key)
+
+        async def fetch_account(account, api_key):
+            try:
+                if not api_key:
+                    raise ApiKeyMissingError("未找到 API Key")
+                # 缓存文件的读写放到线程中，不阻塞事件循环里其他账号的请求
+                entry = None
+                if self.catalog_cache is not None:
+                    entry = await asyncio.to_thread(self.catalog_cache.load, api_key)
+                if entry:
+                    result = await client.list_models(
+                        api_key, entry.get("etag"), entry.get("last_modified")
+                    )
+                else:
+                    result = await client.list_models(api_key)
+                if self.catalog_cache is not None:
+                    result = await asyncio.to_thread(self._apply_catalog_cache, api_key, entry, result)
+                return {"account": account, "ok": True, **result}
+            except CoreError as e:
+                return {"account": account, "ok": False, "code": e.code, "context": e.context}
+            except Exception as e:
+                return {
+                    "account": account,
+                    "ok": False,
+                    "code": "unknown",
+                    "context": {"message": str(e)},
+                }
+
+        results = []
+        tasks = [fetch(account, api_key) for account, api_key in accounts.items()]
+        for future in asyncio.as_completed(tasks):
+            result = await future
+            if result is None:
+                continue
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
@@ -0,0 +1,274 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# 原始样本保留时长，更早的样本按小时合并，再早的按天合并
+RAW_RETENTION = 2 * 86400
+HOURLY_RETENTION = 30 * 86400
+DEFAULT_RETENTION_DAYS = 180
+COMPACT_INTERVAL = 3600
+# 估算消耗速度时只看最近一段时间，避免早先的低谷或高峰拖偏结果
+FORECAST_LOOKBACK = 6 * 3600
+# 样本覆盖的时间短于该值时不做预测，几秒内的两次观测推算不出可靠的速度
+MIN_FORECAST_SPAN = 600
+SPARKLINE_BLOCKS = "▁▂▃▄▅▆▇█"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_samples (
+    account TEXT NOT NULL,
+    model_id TEXT NOT NULL DEFAULT '',
+    ts REAL NOT NULL,
+    remaining INTEGER NOT NULL,
+    quota_limit INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_quota_samples_series ON quota_samples (account, model_id, ts);
+"""
+
+
+def parse_quota_value(value):
+    """把响应头中的额度字符串转换为整数，N/A 或无法解析时返回 None。"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def render_sparkline(values):
+    """把数值序列渲染为 Unicode 迷你折线，None 显示为空格。"""
+    present = [value for value in values if value is not None]
+    if not present:
+        return ""
+    low = min(present)
+    span = max(present) - low
+    chars = []
+    for value in values:
+        if value is None:
+            chars.append(" ")
+        elif span == 0:
+            chars.append(SPARKLINE_BLOCKS[-1])
+        else:
+            chars.append(SPARKLINE_BLOCKS[round((value - low) / span * (len(SPARKLINE_BLOCKS) - 1))])
+    return "".join(chars)
+
+
+def estimate_burn_rate(samples):
+    """对 (时间, 剩余额度) 样本做最小二乘拟合，返回每秒消耗的额度 (不消耗时为 0)。"""
+    if len(samples) < 2:
+        return 0.0
+    count = len(samples)
+    mean_ts = sum(ts for ts, _ in samples) / count
+    mean_remaining = sum(remaining for _, remaining in samples) / count
+    variance = sum((ts - mean_ts) ** 2 for ts, _ in samples)
+    if variance == 0:
+        return 0.0
+    covariance = sum((ts - mean_ts) * (remaining - mean_remaining) for ts, remaining in samples)
+    return max(-covariance / variance, 0.0)
+
+
+def current_segment(series):
+    """返回最近一次额度恢复 (剩余额度上升) 之后的样本。"""
+    start = 0
+    for index in range(1, len(series)):
+        if series[index][1] > series[index - 1][1]:
+            start = index
+    return series[start:]
+
+
+class QuotaHistory:
+    """按账号与模型记录每一次额度观测的 SQLite 时间序列。
+
+    model_id 为空字符串的序列是账号级额度。旧样本会被定期降采样：
+    超过 RAW_RETENTION 的按小时、超过 HOURLY_RETENTION 的按天只保留最后一个样本。
+    数据库在第一次使用时才打开，不影响启动速度。
+    """
+
+    def __init__(self, db_path, retention_days=DEFAULT_RETENTION_DAYS, clock=time.time):
+        self.db_path = Path(db_path)
+        self.retention = retention_days * 86400
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = None
+        self._compacted_at = 0.0
+
+    def _connect(self):
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def record(self, account, user_remaining, user_limit, model_id=None,
+               model_remaining=None, model_limit=None):
+        """记录一次额度观测 (账号级，以及可选的模型级)。"""
+        self.record_many([
+            {
+                "account": account,
+                "user_remaining": user_remaining,
+                "user_limit": user_limit,
+                "model_id": model_id,
+                "model_remaining": model_remaining,
+                "model_limit": model_limit,
+            }
+        ])
+
+    def record_many(self, observations):
+        """在一个事务中写入多条观测，无效的额度值会被跳过。"""
+        now = self.clock()
+        # 同一批观测 (如一次批量检查) 的账号级额度只保留最后一个有效值
+        series = {}
+        for observation in observations:
+            account = observation.get("account")
+            if not account:
+                continue
+            pairs = [("", observation.get("user_remaining"), observation.get("user_limit"))]
+            if observation.get("model_id"):
+                pairs.append(
+                    (observation["model_id"], observation.get("model_remaining"), observation.get("model_limit"))
+                )
+            for model_id, remaining, limit in pairs:
+                remaining = parse_quota_value(remaining)
+                limit = parse_quota_value(limit)
+                if remaining is not None and limit is not None:
+                    series[(account, model_id)] = (account, model_id, now, remaining, limit)
+        rows = list(series.values())
+        if not rows:
+            return 0
+
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO quota_samples (account, model_id, ts, remaining, quota_limit) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                if now - self._compacted_at >= COMPACT_INTERVAL:
+                    self._compact(conn, now)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to record quota history: {e}")
+            return 0
+        return len(rows)
+
+    def compact(self):
+        """立即执行一次降采样与过期清理。"""
+        with self._lock:
+            self._compact(self._connect(), self.clock())
+
+    def _compact(self, conn, now):
+        with conn:
+            conn.execute("DELETE FROM quota_samples WHERE ts < ?", (now - self.retention,))
+            for older_than, bucket in ((now - HOURLY_RETENTION, 86400), (now - RAW_RETENTION, 3600)):
+                # 每个时间桶只保留最后写入的样本
+                conn.execute(
+                    "DELETE FROM quota_samples WHERE ts < ? AND rowid NOT IN ("
+                    " SELECT MAX(rowid) FROM quota_samples WHERE ts < ?"
+                    " GROUP BY account, model_id, CAST(ts / ? AS INTEGER))",
+                    (older_than, older_than, bucket),
+                )
+        self._compacted_at = now
+
+    def get_series(self, account, model_id=None, since=None):
+        """返回 [(时间戳, 剩余额度, 上限)]，按时间升序。"""
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT ts, remaining, quota_limit FROM quota_samples "
+                    "WHERE account = ? AND model_id = ? AND ts >= ? ORDER BY ts",
+                    (account, model_id or "", since if since is not None else 0),
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to read quota history: {e}")
+            return []
+        return rows
+
+    def get_latest_before(self, account, model_id=None, before=None):
+        """返回早于 before 的最后一个样本 (时间戳, 剩余额度, 上限)，没有时返回 None。"""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT ts, remaining, quota_limit FROM quota_samples "
+                    "WHERE account = ? AND model_id = ? AND ts < ? ORDER BY ts DESC LIMIT 1",
+                    (account, model_id or "", before if before is not None else self.clock()),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to read quota history: {e}")
+            return None
+        return row
+
+    def get_accounts(self):
+        """返回有历史记录的账号名。"""
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    "SELECT DISTINCT account FROM quota_samples ORDER BY account"
+                ).fetchall()
+        except sqlite3.Error as e:
+            logging.error(f"Failed to read quota history: {e}")
+            return []
+        return [row[0] for row in rows]
+
+    def get_sparkline_values(self, account, model_id=None, span=86400, buckets=24):
+        """把最近 span 秒的剩余额度重采样为 buckets 个点 (每个桶取最后一个样本，空桶沿用前值)。"""
+        now = self.clock()
+        start = now - span
+        # 只读取窗口内的样本，再加上窗口之前的最后一个样本作为开头空桶的沿用值
+        series = self.get_series(account, model_id, start)
+        values = [None] * buckets
+        previous = self.get_latest_before(account, model_id, start)
+        last = previous[1] if previous else None
+        index = 0
+        for bucket in range(buckets):
+            bucket_end = start + span * (bucket + 1) / buckets
+            while index < len(series) and series[index][0] <= bucket_end:
+                last = series[index][1]
+                index += 1
+            values[bucket] = last
+        return values
+
+    def get_sparkline(self, account, model_id=None, span=86400, buckets=24):
+        return render_sparkline(self.get_sparkline_values(account, model_id, span, buckets))
+
+    def forecast(self, account, model_id=None):
+        """按最近的消耗速度预测额度耗尽时间。
+
+        只使用最近一次额度恢复之后、FORECAST_LOOKBACK 以内的样本。
+        返回 remaining/limit/burn_rate (每小时)/seconds_left/exhausted_at；没有数据时返回 None，
+        样本跨度不足 MIN_FORECAST_SPAN 时 burn_rate 为 None，没有消耗时 seconds_left 与 exhausted_at 为 None。
+        """
+        now = self.clock()
+        series = self.get_series(account, model_id, now - FORECAST_LOOKBACK)
+        if not series:
+            latest = self.get_latest_before(account, model_id, now - FORECAST_LOOKBACK)
+            if latest is None:
+                return None
+            series = [latest]
+
+        ts, remaining, limit = series[-1]
+        segment = [(sample_ts, sample_remaining) for sample_ts, sample_remaining, _ in current_segment(series)]
+        burn_rate = None
+        seconds_left = None
+        exhausted_at = None
+        if segment[-1][0] - segment[0][0] >= MIN_FORECAST_SPAN:
+            burn_rate = estimate_burn_rate(segment)
+            if burn_rate > 0:
+                exhausted_at = ts + remaining / burn_rate
+                seconds_left = max(exhausted_at - now, 0.0)
+        return {
+            "remaining": remaining,
+            "limit": limit,
+            "observed_at": ts,
+            "burn_rate": None if burn_rate is None else burn_rate * 3600,
+            "seconds_left": seconds_left,
+            "exhausted_at": exhausted_at,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
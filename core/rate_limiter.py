@@ -0,0 +1,218 @@
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from core.errors import RequestCancelledError
+
+# 在等待上限内的延迟直接等待，超过时由调用方决定失败还是稍后重试
+DEFAULT_MAX_WAIT = 10.0
+# 429 未携带 Retry-After 时的退避时间 (秒)，连续 429 时翻倍
+DEFAULT_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+# 等待时按该步长轮询，以便及时响应取消
+WAIT_STEP = 0.5
+
+
+def parse_int_header(headers, name):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(value, now=None):
+    """解析 Retry-After (秒数或 HTTP 日期)，返回需要等待的秒数。"""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at - (now if now is not None else time.time()), 0.0)
+
+
+class TokenBucket:
+    """按响应头学习容量与剩余次数的令牌桶。
+
+    capacity 为 None 表示尚未学到限额，此时不做任何限制；
+    发出请求前先预留一个令牌，收到响应后以服务端返回的剩余次数为准，
+    并扣除仍在进行中的请求。
+    ModelScope 的每日额度一次性重置，响应头不包含重置时间，因此令牌不会随时间恢复：
+    额度耗尽后同一时间只放行一个探测请求，由它的响应 (剩余次数或 429 的 Retry-After) 决定何时恢复。
+    """
+
+    def __init__(self):
+        self.capacity = None
+        self.tokens = None
+        self.inflight = 0
+        self.blocked_until = 0.0
+        self.backoff = DEFAULT_BACKOFF
+
+    def time_until_available(self, now):
+        """距离可以再发一个请求还需等待的秒数。"""
+        wait = max(self.blocked_until - now, 0.0)
+        if wait > 0 or self.capacity is None:
+            return wait
+        if self.tokens < 1 and self.inflight > 0:
+            # 等待进行中的探测请求返回新的额度
+            return WAIT_STEP
+        return 0.0
+
+    def reserve(self):
+        self.inflight += 1
+        if self.capacity is not None:
+            self.tokens -= 1
+
+    def release(self):
+        if self.inflight > 0:
+            self.inflight -= 1
+
+    def learn(self, limit, remaining):
+        if limit is None or remaining is None or limit <= 0:
+            return
+        self.capacity = limit
+        self.tokens = max(min(remaining, limit) - self.inflight, 0)
+
+    def block(self, seconds, now):
+        self.blocked_until = max(self.blocked_until, now + seconds)
+
+    def reset_backoff(self):
+        self.backoff = DEFAULT_BACKOFF
+
+    def next_backoff(self):
+        backoff = self.backoff
+        self.backoff = min(self.backoff * 2, MAX_BACKOFF)
+        return backoff
+
+
+class RateLimiter:
+    """按账号与模型分别维护令牌桶，根据 modelscope-ratelimit-* 响应头调节请求节奏。
+
+    - acquire() 在额度允许时预留令牌并返回 0，否则返回需等待的秒数；
+    - observe() 用响应头更新额度，429 时按 Retry-After (或指数退避) 暂停该账号/模型；
+    - time_until_next() 返回预计还需多久才能发起下一次调用。
+    """
+
+    def __init__(self, enabled=True, max_wait=DEFAULT_MAX_WAIT, clock=time.monotonic):
+        self.enabled = enabled
+        self.max_wait = max_wait
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def _bucket(self, key):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket()
+        return bucket
+
+    def _buckets_for(self, api_key, model_id):
+        buckets = [self._bucket(("user", api_key))]
+        if model_id is not None:
+            buckets.append(self._bucket(("model", api_key, model_id)))
+        return buckets
+
+    def time_until_next(self, api_key, model_id=None):
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            return max(bucket.time_until_available(now) for bucket in self._buckets_for(api_key, model_id))
+
+    def acquire(self, api_key, model_id=None):
+        if not self.enabled:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            buckets = self._buckets_for(api_key, model_id)
+            wait = max(bucket.time_until_available(now) for bucket in buckets)
+            if wait > 0:
+                return wait
+            for bucket in buckets:
+                bucket.reserve()
+            return 0.0
+
+    def observe(self, api_key, model_id, status_code, headers, reserved=True):
+        """根据响应更新额度。reserved 为 False 表示该请求未经过 acquire (如拉取目录)。"""
+        if not self.enabled:
+            return
+        with self._lock:
+            now = self.clock()
+            user_bucket, *model_buckets = self._buckets_for(api_key, model_id)
+            if reserved:
+                user_bucket.release()
+                for bucket in model_buckets:
+                    bucket.release()
+
+            user_bucket.learn(
+                parse_int_header(headers, "modelscope-ratelimit-requests-limit"),
+                parse_int_header(headers, "modelscope-ratelimit-requests-remaining"),
+            )
+            for bucket in model_buckets:
+                bucket.learn(
+                    parse_int_header(headers, "modelscope-ratelimit-model-requests-limit"),
+                    parse_int_header(headers, "modelscope-ratelimit-model-requests-remaining"),
+                )
+
+            target = model_buckets[0] if model_buckets else user_bucket
+            if status_code == 429:
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                if retry_after is None:
+                    retry_after = target.next_backoff()
+                target.block(retry_after, now)
+            elif status_code is not None and status_code < 400:
+                target.reset_backoff()
+
+    def wait(self, api_key, model_id=None, is_cancelled=None):
+        """阻塞直到可以发起请求并预留令牌。
+
+        预计等待超过 max_wait 时不等待，直接返回需要的秒数；成功时返回 0；
+        等待期间被取消时抛出 RequestCancelledError，不会预留令牌。
+        """
+        max_wait = self.max_wait
+        while True:
+            delay = self.acquire(api_key, model_id)
+            if delay <= 0:
+                return 0.0
+            if max_wait is not None and delay > max_wait:
+                return delay
+            if is_cancelled and is_cancelled():
+                raise RequestCancelledError("cancelled", {"model_id": model_id})
+            time.sleep(min(delay, WAIT_STEP))
+
+    async def wait_async(self, api_key, model_id=None, is_cancelled=None):
+        """wait() 的 asyncio 版本，等待期间不阻塞事件循环。"""
+        max_wait = self.max_wait
+        while True:
+            delay = self.acquire(api_key, model_id)
+            if delay <= 0:
+                return 0.0
+            if max_wait is not None and delay > max_wait:
+                return delay
+            if is_cancelled and is_cancelled():
+                raise RequestCancelledError("cancelled", {"model_id": model_id})
+            await asyncio.sleep(min(delay, WAIT_STEP))
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+_limiter = RateLimiter()
+
+
+def configure_rate_limiter(enabled=True, max_wait=DEFAULT_MAX_WAIT):
+    """设置进程级共享限流器的开关与最长等待时间，已学到的额度会被清空。"""
+    with _limiter._lock:
+        _limiter.enabled = bool(enabled)
+        _limiter.max_wait = max_wait
+        _limiter._buckets.clear()
+
+
+def get_rate_limiter():
+    """获取进程级共享的限流器，所有客户端共用学到的额度。"""
+    return _limiter
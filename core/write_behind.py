@@ -0,0 +1,60 @@
+import logging
+import threading
+
+DEFAULT_WRITE_DELAY = 0.5
+
+
+class WriteBehind:
+    """延迟写入：把一段静默期内的多次保存请求合并为一次写入。
+
+    request() 只标记为脏并重新计时，静默 delay 秒后在后台线程执行 write_func；
+    flush() 立即同步写入尚未落盘的修改。
+    """
+
+    def __init__(self, write_func, delay=DEFAULT_WRITE_DELAY):
+        self.write_func = write_func
+        self.delay = delay
+        self.requested = 0
+        self.written = 0
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def request(self):
+        with self._lock:
+            self.requested += 1
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        with self._write_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+            try:
+                self.write_func()
+                self.written += 1
+            except Exception as e:
+                logging.error(f"Write-behind flush failed: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def is_dirty(self):
+        return self._dirty
+
+    def get_stats(self):
+        """返回保存请求数、实际写入数以及被合并掉的写入数。"""
+        return {
+            "requested": self.requested,
+            "written": self.written,
+            "saved": self.requested - self.written,
+        }
@@ -0,0 +1,43 @@
+from core.account_dashboard import AccountDashboard
+from gui.controllers.app.workers import PRIORITY_BACKGROUND, accounts_refresh_task, get_scheduler
+
+class DashboardApp:
+    def __init__(self, config_manager, quota_history=None):
+        self.config_manager = config_manager
+        self.dashboard = AccountDashboard(config_manager, quota_history)
+        self.scheduler = get_scheduler()
+
+    def refresh_accounts(self, accounts, on_result, on_finished, on_error):
+        self.cancel_refresh()
+        self.dashboard.start(accounts.keys())
+        # 批量刷新属于后台任务，优先级低于当前账号的加载与额度检查
+        self.scheduler.submit(
+            ("accounts_refresh", tuple(accounts.items())),
+            accounts_refresh_task(accounts, self.config_manager.get_dashboard_concurrency()),
+            on_finished=on_finished,
+            on_error=on_error,
+            on_progress=on_result,
+            priority=PRIORITY_BACKGROUND,
+            group="accounts_refresh",
+        )
+
+    def cancel_refresh(self):
+        self.scheduler.cancel_group("accounts_refresh")
+
+    def apply_result(self, result):
+        return self.dashboard.apply_result(result)
+
+    def finish_refresh(self):
+        return self.dashboard.finish()
+
+    def get_model_accounts(self, model_id):
+        return self.dashboard.get_model_accounts(model_id)
+
+    def get_quota_trend(self, account):
+        return self.dashboard.get_quota_trend(account)
+
+    def get_account_quota(self, account):
+        return self.config_manager.get_account_quota(account)
+
+    def get_active_account(self):
+        return self.config_manager.get_active_account()
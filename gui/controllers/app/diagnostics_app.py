@@ -0,0 +1,15 @@
+from core import metrics
+
+
+class DiagnosticsApp:
+    def get_snapshot(self):
+        return metrics.snapshot()
+
+    def reset(self):
+        metrics.reset()
+
+    def export_json(self, path):
+        metrics.export_json(path)
+
+    def export_prometheus(self, path):
+        metrics.export_prometheus(path)
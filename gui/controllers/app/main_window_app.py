@@ -1,10 +1,104 @@
+import logging
+from core.catalog_store import CatalogStore
 from core.config_manager import ConfigManager
-from core import app_paths
+from core.modelscope_client import ModelScopeClient
+from core.quota_history import QuotaHistory
+from core import app_paths, async_runtime, http_session, metrics
+from core.rate_limiter import configure_rate_limiter
+from gui.controllers.app.account_manage_app import AccountManageApp
+from gui.controllers.app.workers import shutdown_scheduler
+
+CONFIG_WRITE_DELAY = 0.5
 
 class MainWindowApp:
     def __init__(self):
-        self.config_manager = ConfigManager(app_paths.get_config_file())
+        self.config_manager = ConfigManager(
+            app_paths.get_config_file(),
+            write_delay=CONFIG_WRITE_DELAY,
+        )
+        # 配置日志只由 GUI 写入；关闭日志模式时把遗留日志并入快照
+        journal_config = self.config_manager.get_journal_config()
+        if journal_config["enabled"]:
+            self.config_manager.enable_journal(
+                app_paths.get_config_journal_file(), journal_config["compact_threshold"]
+            )
+        else:
+            self.config_manager.fold_journal(app_paths.get_config_journal_file())
+        if self.config_manager.get_storage_config()["backend"] == "sqlite":
+            self.config_manager.attach_store(CatalogStore(app_paths.get_catalog_store_file()))
         self.current_api_key = None
+        self.default_account_name = "默认"
+        # 账号数据由主窗口持有，账号管理标签页延迟构建时直接复用
+        self.account_app = AccountManageApp(
+            self.config_manager,
+            app_paths.get_env_file(),
+            self.default_account_name,
+        )
+        self.accounts = {}
+        self.quota_history = self._create_quota_history()
+
+    def _create_quota_history(self):
+        # 数据库在第一次记录或查询时才打开
+        history_config = self.config_manager.get_quota_history_config()
+        if not history_config["enabled"]:
+            return None
+        return QuotaHistory(app_paths.get_quota_history_file(), history_config["retention_days"])
+
+    def get_quota_history(self):
+        return self.quota_history
+
+    def close_quota_history(self):
+        if self.quota_history is not None:
+            self.quota_history.close()
+
+    def close_store(self):
+        store = self.config_manager.get_store()
+        if store is not None:
+            store.close()
+
+    def load_accounts(self):
+        """读取 .env 中的账号，并以激活账号的 API Key 作为当前 Key。"""
+        self.accounts = self.account_app.load_accounts()
+        self.current_api_key = self.account_app.get_active_api_key(self.accounts)
+        return self.accounts
+
+    def get_account_app(self):
+        return self.account_app
+
+    def get_accounts(self):
+        return self.accounts
+
+    def setup_network(self):
+        """按配置初始化共享连接池与限流器，并按需在后台预热 API 连接。"""
+        network_config = self.config_manager.get_network_config()
+        http_session.configure_session(
+            network_config["pool_size"],
+            network_config["keep_alive"],
+        )
+        rate_limit_config = self.config_manager.get_rate_limit_config()
+        configure_rate_limiter(
+            rate_limit_config["enabled"],
+            rate_limit_config["max_wait"],
+        )
+        if network_config["prewarm"]:
+            http_session.prewarm(ModelScopeClient().models_url)
+
+    def close_network(self):
+        http_session.close_session()
+        async_runtime.close()
+
+    def setup_metrics(self):
+        """配置了 [metrics] textfile 时，定期把指标写入 Prometheus 文本文件。"""
+        metrics_config = self.config_manager.get_metrics_config()
+        if metrics_config["textfile"]:
+            metrics.start_periodic_export(metrics_config["textfile"], metrics_config["interval"])
+
+    def close_metrics(self):
+        metrics.stop_periodic_export()
+
+    def shutdown_jobs(self):
+        """取消后台任务并等待线程池退出。"""
+        shutdown_scheduler()
 
     def get_config_manager(self):
         return self.config_manager
@@ -23,3 +117,12 @@ class MainWindowApp:
 
     def save_config(self):
         self.config_manager.save_config()
+
+    def flush_config(self):
+        """退出前同步写入配置，并记录合并写入的统计。"""
+        self.config_manager.flush_config()
+        stats = self.config_manager.get_write_stats()
+        logging.info(
+            f"Config writes: {stats['requested']} requested, "
+            f"{stats['written']} written, {stats['saved']} coalesced"
+        )
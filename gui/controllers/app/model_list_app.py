@@ -1,11 +1,23 @@
+from core import app_paths
 from core.model_service import ModelService
-from gui.controllers.app.workers import ModelListWorker, QuotaWorker
+from core.modelscope_service import ModelScopeService
+from gui.controllers.app.workers import (
+    PRIORITY_USER,
+    check_quota_task,
+    get_catalog_cache,
+    get_scheduler,
+    list_models_task,
+    quota_sweep_task,
+)
 
 class ModelListApp:
-    def __init__(self, config_manager):
-        self.model_service = ModelService(config_manager)
-        self.list_worker = None
-        self.quota_worker = None
+    def __init__(self, config_manager, quota_history=None):
+        self.model_service = ModelService(config_manager, quota_history)
+        self.modelscope_service = ModelScopeService(
+            app_paths.get_env_file(),
+            catalog_cache=get_catalog_cache(),
+        )
+        self.scheduler = get_scheduler()
 
     def get_cached_quota(self):
         return self.model_service.get_cached_quota()
@@ -24,23 +36,67 @@ class ModelListApp:
             hidden_only,
         )
 
-    def load_models(self, api_key, on_loaded, on_error):
-        self.list_worker = ModelListWorker(api_key)
-        self.list_worker.finished.connect(on_loaded)
-        self.list_worker.error.connect(on_error)
-        self.list_worker.start()
+    def build_batch_items(self, model_ids, search_text, favorites_only, hidden_only):
+        return self.model_service.build_batch_items(model_ids, search_text, favorites_only, hidden_only)
+
+    def get_cached_models(self, api_key):
+        return self.modelscope_service.get_cached_models(api_key)
+
+    def load_models(self, api_key, on_loaded, on_error, on_batch=None):
+        # 相同账号的重复加载会合并；切换账号时旧的加载任务被取消
+        self.scheduler.submit(
+            ("list_models", api_key),
+            list_models_task(api_key),
+            on_finished=on_loaded,
+            on_error=on_error,
+            on_progress=on_batch,
+            priority=PRIORITY_USER,
+            group="model_list",
+        )
+
+    def is_loading_models(self, api_key):
+        return self.scheduler.is_active(("list_models", api_key))
 
     def check_quota(self, model_id, api_key, on_checked, on_error):
-        self.quota_worker = QuotaWorker(model_id, api_key)
-        self.quota_worker.finished.connect(on_checked)
-        self.quota_worker.error.connect(on_error)
-        self.quota_worker.start()
+        self.scheduler.submit(
+            ("check_quota", model_id, api_key),
+            check_quota_task(model_id, api_key),
+            on_finished=on_checked,
+            on_error=on_error,
+            priority=PRIORITY_USER,
+            group="quota_check",
+        )
+
+    def sweep_quota(self, model_ids, api_key, on_result, on_finished, on_error):
+        model_ids = list(model_ids)
+        self.scheduler.submit(
+            ("quota_sweep", api_key, tuple(model_ids)),
+            quota_sweep_task(
+                model_ids,
+                api_key,
+                self.model_service.get_quota_sweep_concurrency(),
+            ),
+            on_finished=on_finished,
+            on_error=on_error,
+            on_progress=on_result,
+            priority=PRIORITY_USER,
+            group="quota_sweep",
+        )
+
+    def cancel_quota_sweep(self):
+        self.scheduler.cancel_group("quota_sweep")
+
+    def is_sweep_running(self):
+        return self.scheduler.is_group_active("quota_sweep")
+
+    def update_quota_from_sweep(self, results):
+        return self.model_service.update_quota_from_sweep(results)
 
-    def is_list_worker(self, sender):
-        return sender is self.list_worker
+    def get_favorites(self):
+        return self.model_service.get_favorites()
 
-    def is_quota_worker(self, sender):
-        return sender is self.quota_worker
+    def get_quota_sweep_concurrency(self):
+        return self.model_service.get_quota_sweep_concurrency()
 
     def toggle_favorite(self, model_id):
         return self.model_service.toggle_favorite(model_id)
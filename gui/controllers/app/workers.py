@@ -1,46 +1,250 @@
-from PySide6.QtCore import QThread, Signal
+import threading
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from core.catalog_cache import CatalogCache
+from core.modelscope_client import REQUEST_TIMEOUT
 from core.modelscope_service import ModelScopeService
 from core.errors import CoreError
 from core import app_paths
 
-class ModelListWorker(QThread):
-    finished = Signal(dict)
-    error = Signal(dict)
+PRIORITY_BACKGROUND = 0
+PRIORITY_USER = 10
 
-    def __init__(self, api_key=None):
-        super().__init__()
-        self.api_key = api_key
-        self.env_path = app_paths.get_env_file()
-        self.service = ModelScopeService(self.env_path)
+DEFAULT_MAX_THREADS = 4
+# 已发出的请求最长持续一个请求超时，退出时至少等这么久，线程池才不会在请求进行中被销毁
+SHUTDOWN_TIMEOUT_MS = (REQUEST_TIMEOUT + 1) * 1000
 
-    def run(self):
-        try:
-            quota_info = self.service.list_models(self.api_key)
-            self.finished.emit(quota_info)
 
-        except CoreError as e:
-            self.error.emit({"code": e.code, "context": e.context})
-        except Exception as e:
-            self.error.emit({"code": "unknown", "context": {"message": str(e)}})
+class Job:
+    """调度器中的一个任务。
+
+    func(job) 在线程池中执行，可通过 job.is_cancelled() 协作式取消，
+    并通过 job.report_progress(value) 逐条上报中间结果。
+    """
 
+    def __init__(self, scheduler, key, func, priority, group):
+        self.scheduler = scheduler
+        self.key = key
+        self.func = func
+        self.priority = priority
+        self.group = group
+        self.on_finished = []
+        self.on_error = []
+        self.on_progress = []
+        self.runnable = None
+        self.done = False
+        self._cancelled = threading.Event()
 
-class QuotaWorker(QThread):
-    finished = Signal(dict)
-    error = Signal(dict)
+    def add_callbacks(self, on_finished=None, on_error=None, on_progress=None):
+        # 合并的重复提交可能带来同一个回调，只登记一次，避免进度被重复处理
+        for callbacks, callback in (
+            (self.on_finished, on_finished),
+            (self.on_error, on_error),
+            (self.on_progress, on_progress),
+        ):
+            if callback and callback not in callbacks:
+                callbacks.append(callback)
 
-    def __init__(self, model_id, api_key=None):
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+    def is_active(self):
+        return not self.done and not self.is_cancelled()
+
+    def report_progress(self, value):
+        if not self.is_cancelled():
+            self.scheduler.job_progress.emit(self, value)
+
+
+class JobRunnable(QRunnable):
+    def __init__(self, job):
         super().__init__()
-        self.model_id = model_id
-        self.api_key = api_key
-        self.env_path = app_paths.get_env_file()
-        self.service = ModelScopeService(self.env_path)
+        self.job = job
+        # 由 Job 持有引用，避免 Qt 与 Python 两侧重复释放
+        self.setAutoDelete(False)
 
     def run(self):
+        job = self.job
+        if job.is_cancelled():
+            job.scheduler.job_failed.emit(job, {"code": "cancelled", "context": {}})
+            return
         try:
-            quota_info = self.service.check_quota(self.model_id, self.api_key)
-            self.finished.emit(quota_info)
-
+            result = job.func(job)
+            job.scheduler.job_finished.emit(job, result)
         except CoreError as e:
-            self.error.emit({"code": e.code, "context": e.context})
+            job.scheduler.job_failed.emit(job, {"code": e.code, "context": e.context})
         except Exception as e:
-            self.error.emit({"code": "unknown", "context": {"message": str(e)}})
+            job.scheduler.job_failed.emit(job, {"code": "unknown", "context": {"message": str(e)}})
+
+
+class JobScheduler(QObject):
+    """基于有界线程池的任务调度器。
+
+    - 相同 key 的任务合并为一个，后来者只追加尚未登记的回调；
+    - 同一 group 中新任务会取消旧任务，旧任务的结果被丢弃；
+    - priority 较高的任务 (用户操作) 先于后台刷新出队；
+    - 所有回调都在主线程中执行。
+    """
+    job_finished = Signal(object, object)
+    job_failed = Signal(object, object)
+    job_progress = Signal(object, object)
+
+    def __init__(self, max_threads=DEFAULT_MAX_THREADS, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.jobs = {}
+        self.groups = {}
+        self.job_finished.connect(self._on_job_finished)
+        self.job_failed.connect(self._on_job_failed)
+        self.job_progress.connect(self._on_job_progress)
+
+    def submit(self, key, func, on_finished=None, on_error=None, on_progress=None,
+               priority=PRIORITY_USER, group=None):
+        job = self.jobs.get(key)
+        if job is not None and job.is_active():
+            job.add_callbacks(on_finished, on_error, on_progress)
+            if group is not None:
+                self._supersede(group, job)
+            return job
+
+        job = Job(self, key, func, priority, group)
+        job.add_callbacks(on_finished, on_error, on_progress)
+        if group is not None:
+            self._supersede(group, job)
+        self.jobs[key] = job
+        job.runnable = JobRunnable(job)
+        self.pool.start(job.runnable, priority)
+        return job
+
+    def cancel(self, job):
+        if job is None or job.done:
+            return
+        job.cancel()
+        # 尚未开始执行的任务直接移出队列
+        if self.pool.tryTake(job.runnable):
+            self._forget(job)
+
+    def cancel_group(self, group):
+        self.cancel(self.groups.get(group))
+
+    def is_active(self, key):
+        job = self.jobs.get(key)
+        return job is not None and job.is_active()
+
+    def is_group_active(self, group):
+        job = self.groups.get(group)
+        return job is not None and job.is_active()
+
+    def shutdown(self, timeout_ms=SHUTDOWN_TIMEOUT_MS):
+        """取消所有任务并等待正在执行的任务结束。"""
+        for job in list(self.jobs.values()):
+            job.cancel()
+        self.pool.clear()
+        self.jobs.clear()
+        self.groups.clear()
+        return self.pool.waitForDone(timeout_ms)
+
+    def _supersede(self, group, job):
+        previous = self.groups.get(group)
+        if previous is not None and previous is not job:
+            self.cancel(previous)
+        self.groups[group] = job
+
+    def _forget(self, job):
+        job.done = True
+        if self.jobs.get(job.key) is job:
+            del self.jobs[job.key]
+        if job.group is not None and self.groups.get(job.group) is job:
+            del self.groups[job.group]
+
+    def _on_job_finished(self, job, result):
+        self._forget(job)
+        if job.is_cancelled():
+            return
+        for callback in job.on_finished:
+            callback(result)
+
+    def _on_job_failed(self, job, error_info):
+        self._forget(job)
+        if job.is_cancelled():
+            return
+        for callback in job.on_error:
+            callback(error_info)
+
+    def _on_job_progress(self, job, value):
+        if job.is_cancelled():
+            return
+        for callback in job.on_progress:
+            callback(value)
+
+
+_scheduler = None
+
+
+def get_scheduler():
+    """获取全局任务调度器 (需在 QApplication 创建之后调用)。"""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = JobScheduler()
+    return _scheduler
+
+
+def shutdown_scheduler():
+    if _scheduler is not None:
+        _scheduler.shutdown()
+
+
+_catalog_cache = None
+_catalog_cache_lock = threading.Lock()
+
+
+def get_catalog_cache():
+    """获取界面共用的目录缓存，各个任务与列表页共享常驻的缓存条目。"""
+    global _catalog_cache
+    with _catalog_cache_lock:
+        if _catalog_cache is None:
+            _catalog_cache = CatalogCache(app_paths.get_catalog_cache_dir())
+        return _catalog_cache
+
+
+def create_service():
+    return ModelScopeService(app_paths.get_env_file(), catalog_cache=get_catalog_cache())
+
+
+def list_models_task(api_key=None):
+    def run(job):
+        # 目录边下载边解析，每批模型 ID 通过进度信号交给界面
+        return create_service().list_models(api_key, on_batch=job.report_progress)
+    return run
+
+
+def check_quota_task(model_id, api_key=None):
+    def run(job):
+        return create_service().check_quota(model_id, api_key, job.is_cancelled)
+    return run
+
+
+def quota_sweep_task(model_ids, api_key=None, max_concurrency=4):
+    def run(job):
+        return create_service().sweep_quota(
+            model_ids,
+            api_key,
+            max_concurrency,
+            on_result=job.report_progress,
+            is_cancelled=job.is_cancelled,
+        )
+    return run
+
+
+def accounts_refresh_task(accounts, max_concurrency=4):
+    def run(job):
+        return create_service().list_models_for_accounts(
+            accounts,
+            max_concurrency,
+            on_result=job.report_progress,
+            is_cancelled=job.is_cancelled,
+        )
+    return run
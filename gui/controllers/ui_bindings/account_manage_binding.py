@@ -7,19 +7,24 @@ from gui.controllers.app.account_manage_app import AccountManageApp
 class AccountManageTab(AccountManageUI):
     """账号管理标签页 UI 绑定层。"""
 
-    def __init__(self, config_manager, on_account_changed=None, parent=None):
+    def __init__(self, config_manager, on_account_changed=None, app=None, accounts=None, parent=None):
         super().__init__(parent)
         self.on_account_changed = on_account_changed
         self.default_account_name = "默认"
         self.accounts = {}
-        self.app = AccountManageApp(
+        # 主窗口在启动时已加载过账号，可直接传入共享的 app 与账号，避免重复读取 .env
+        self.app = app or AccountManageApp(
             config_manager,
             app_paths.get_env_file(),
             self.default_account_name,
         )
 
         self.add_btn.clicked.connect(self.on_add_account)
-        self.load_accounts()
+        if accounts is None:
+            self.load_accounts()
+        else:
+            self.accounts = accounts
+            self.update_account_list()
 
     def load_accounts(self):
         """从 .env 加载所有账号。"""
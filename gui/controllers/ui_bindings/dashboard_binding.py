@@ -0,0 +1,133 @@
+from PySide6.QtWidgets import QTableWidgetItem
+from PySide6.QtCore import Qt
+from gui.ui.ui_dashboard import DashboardUI
+from gui.ui.messages import get_core_error_message
+from gui.controllers.app.dashboard_app import DashboardApp
+
+class DashboardTab(DashboardUI):
+    """多账号总览标签页 UI 绑定层。"""
+
+    def __init__(self, config_manager, get_accounts_func=None, on_activate_account=None,
+                 quota_history=None, parent=None):
+        super().__init__(parent)
+        self.app = DashboardApp(config_manager, quota_history)
+        self.get_accounts = get_accounts_func  # 获取全部账号 {名称: API Key} 的回调
+        self.on_activate_account = on_activate_account
+        self.account_rows = {}
+
+        self.refresh_btn.clicked.connect(self.refresh_all)
+        self.account_table.cellDoubleClicked.connect(self.on_row_double_clicked)
+        self.model_lookup_input.textChanged.connect(self.on_lookup_changed)
+
+        self.show_cached_quotas()
+
+    def show_cached_quotas(self):
+        """用已保存的额度填充表格。"""
+        accounts = self.get_accounts() if self.get_accounts else {}
+        self.account_table.setRowCount(0)
+        self.account_rows = {}
+        for account in accounts:
+            quota = self.app.get_account_quota(account)
+            self._set_row(account, None, quota["user_remaining"], quota["user_limit"], "未刷新")
+
+    def refresh_all(self):
+        """并发刷新所有账号的模型目录与额度。"""
+        accounts = self.get_accounts() if self.get_accounts else {}
+        if not accounts:
+            self.status_label.setText("暂无账号")
+            return
+
+        self.show_cached_quotas()
+        self.refresh_btn.setEnabled(False)
+        self.status_label.setText(f"正在刷新 {len(accounts)} 个账号...")
+        self.app.refresh_accounts(accounts, self.on_account_result, self.on_refresh_finished, self.on_refresh_error)
+
+    def on_account_result(self, result):
+        row = self.app.apply_result(result)
+        if row["ok"]:
+            status = "已是最新 (缓存)" if row.get("from_cache") else "已刷新"
+        else:
+            status = get_core_error_message(row)
+        self._set_row(row["account"], row["model_count"], row["user_remaining"], row["user_limit"], status)
+
+    def on_refresh_finished(self, results):
+        summary = self.app.finish_refresh()
+        self.refresh_btn.setEnabled(True)
+        self.status_label.setText(
+            f"成功 {summary['succeeded']} 个，失败 {summary['failed']} 个；"
+            f"共 {summary['total_models']} 个模型，其中 {summary['shared_models']} 个所有账号可见"
+        )
+        self.on_lookup_changed(self.model_lookup_input.text())
+
+    def on_refresh_error(self, error_info):
+        self.refresh_btn.setEnabled(True)
+        self.status_label.setText(get_core_error_message(error_info))
+
+    def on_lookup_changed(self, text):
+        model_id = text.strip()
+        if not model_id:
+            self.lookup_label.setText("")
+            return
+        accounts = self.app.get_model_accounts(model_id)
+        if accounts:
+            self.lookup_label.setText(f"可见账号: {', '.join(accounts)}")
+        else:
+            self.lookup_label.setText("没有账号可见该模型 (或尚未刷新)")
+
+    def on_row_double_clicked(self, row, column):
+        item = self.account_table.item(row, 0)
+        if item and self.on_activate_account:
+            self.on_activate_account(item.text())
+
+    def refresh_active_marker(self):
+        active_account = self.app.get_active_account()
+        for account, row in self.account_rows.items():
+            item = self.account_table.item(row, 0)
+            font = item.font()
+            font.setBold(account == active_account)
+            item.setFont(font)
+
+    def _set_row(self, account, model_count, user_remaining, user_limit, status):
+        row = self.account_rows.get(account)
+        if row is None:
+            row = self.account_table.rowCount()
+            self.account_table.insertRow(row)
+            self.account_rows[account] = row
+
+        quota_text = "N/A / N/A"
+        if user_remaining != "N/A" and user_limit != "N/A":
+            quota_text = f"{user_remaining} / {user_limit}"
+        trend = self.app.get_quota_trend(account) or {}
+        forecast = trend.get("forecast")
+        values = [
+            account,
+            "-" if model_count is None else str(model_count),
+            quota_text,
+            trend.get("sparkline", ""),
+            self._format_forecast(forecast),
+            status,
+        ]
+        for column, value in enumerate(values):
+            item = QTableWidgetItem(value)
+            if column in (1, 2):
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            if column == 4 and forecast and forecast["burn_rate"] is not None:
+                item.setToolTip(f"最近消耗速度: {forecast['burn_rate']:.1f} 次/小时")
+            self.account_table.setItem(row, column, item)
+        self.refresh_active_marker()
+
+    def _format_forecast(self, forecast):
+        if not forecast:
+            return "-"
+        if forecast["burn_rate"] is None:
+            return "数据不足"
+        seconds_left = forecast["seconds_left"]
+        if seconds_left is None:
+            return "无消耗"
+        if seconds_left <= 0:
+            return "已耗尽"
+        if seconds_left < 3600:
+            return f"约 {max(seconds_left / 60, 1):.0f} 分钟"
+        if seconds_left < 86400:
+            return f"约 {seconds_left / 3600:.1f} 小时"
+        return f"约 {seconds_left / 86400:.1f} 天"
@@ -0,0 +1,91 @@
+from PySide6.QtWidgets import QTableWidgetItem, QFileDialog
+from PySide6.QtCore import Qt, QTimer
+from gui.ui.ui_diagnostics import DiagnosticsUI
+from gui.controllers.app.diagnostics_app import DiagnosticsApp
+
+REFRESH_INTERVAL_MS = 2000
+
+
+class DiagnosticsTab(DiagnosticsUI):
+    """诊断标签页 UI 绑定层，可见时定期刷新。"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.app = DiagnosticsApp()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.refresh_btn.clicked.connect(self.refresh)
+        self.reset_btn.clicked.connect(self.on_reset)
+        self.export_json_btn.clicked.connect(self.on_export_json)
+        self.export_prometheus_btn.clicked.connect(self.on_export_prometheus)
+
+        self.refresh()
+
+    def showEvent(self, event):
+        self.refresh()
+        self.refresh_timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        snapshot = self.app.get_snapshot()
+        histograms = snapshot["histograms"]
+
+        self.metrics_table.setRowCount(len(histograms))
+        for row, (name, histogram) in enumerate(histograms.items()):
+            values = [
+                histogram["count"],
+                histogram["mean"],
+                histogram["p50"],
+                histogram["p95"],
+                histogram["max"],
+                histogram["sum"],
+            ]
+            self.metrics_table.setItem(row, 0, QTableWidgetItem(name))
+            for column, value in enumerate(values, start=1):
+                text = str(value) if column == 1 else self._format_ms(value)
+                item = QTableWidgetItem(text)
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.metrics_table.setItem(row, column, item)
+
+        counters = snapshot["counters"]
+        self.counters_label.setText(
+            "计数: " + "，".join(f"{name} = {value}" for name, value in counters.items())
+            if counters else "计数: 暂无"
+        )
+
+    def _format_ms(self, seconds):
+        if seconds is None:
+            return "-"
+        return f"{seconds * 1000:.2f}"
+
+    def on_reset(self):
+        self.app.reset()
+        self.refresh()
+        self.status_label.setText("已清零")
+
+    def on_export_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "导出 JSON", "metrics.json", "JSON (*.json)")
+        if path:
+            self._export(self.app.export_json, path)
+
+    def on_export_prometheus(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "导出 Prometheus 文本", "modelscope_manager.prom", "Prometheus (*.prom)"
+        )
+        if path:
+            self._export(self.app.export_prometheus, path)
+
+    def _export(self, export_func, path):
+        try:
+            export_func(path)
+        except Exception as e:
+            self.status_label.setText(f"导出失败: {e}")
+            return
+        self.status_label.setText(f"已导出: {path}")
@@ -1,19 +1,26 @@
 from PySide6.QtGui import QGuiApplication
 from gui.ui.ui_mainwindow import MainWindowUI
 from gui.controllers.ui_bindings.model_list_binding import ModelListTab
-from gui.controllers.ui_bindings.account_manage_binding import AccountManageTab
 from gui.controllers.app.main_window_app import MainWindowApp
 
 class MainWindow(MainWindowUI):
-    """主窗口 UI 绑定层。"""
+    """主窗口 UI 绑定层。
+
+    启动时只构建模型列表并显示缓存的目录；其余标签页在首次切换到时才构建，
+    网络初始化与目录刷新在首帧显示后由 start_background_work() 发起。
+    """
 
     def __init__(self):
         super().__init__()
         self.app = MainWindowApp()
+        self.app.load_accounts()
+        self.account_tab = None
+        self.dashboard_tab = None
+        self.diagnostics_tab = None
 
         self.init_tabs()
         self.restore_geometry()
-        self.model_tab.load_data()
+        self.model_tab.load_cached_data()
 
     def init_tabs(self):
         """初始化所有标签页。"""
@@ -22,22 +29,77 @@ class MainWindow(MainWindowUI):
         self.model_tab = ModelListTab(
             config_manager,
             get_api_key_func=self.app.get_current_api_key,
+            quota_history=self.app.get_quota_history(),
         )
         self.tab_widget.addTab(self.model_tab, "模型列表")
 
-        self.account_tab = AccountManageTab(
-            config_manager,
-            on_account_changed=self.on_account_changed,
-        )
-        self.tab_widget.addTab(self.account_tab, "账号管理")
+        self.account_container = self.add_placeholder_tab("账号管理")
+        self.dashboard_container = self.add_placeholder_tab("账号总览")
+        self.diagnostics_container = self.add_placeholder_tab("诊断")
+        self.tab_widget.currentChanged.connect(self.on_tab_changed)
+
+    def start_background_work(self):
+        """首帧显示后再初始化连接池并刷新模型目录。"""
+        self.app.setup_network()
+        self.app.setup_metrics()
+        self.model_tab.refresh_data()
+
+    def on_tab_changed(self, index):
+        widget = self.tab_widget.widget(index)
+        if widget is self.account_container:
+            self.ensure_account_tab()
+        elif widget is self.dashboard_container:
+            self.ensure_dashboard_tab()
+        elif widget is self.diagnostics_container:
+            self.ensure_diagnostics_tab()
+
+    def ensure_account_tab(self):
+        """按需构建账号管理标签页。"""
+        if self.account_tab is None:
+            from gui.controllers.ui_bindings.account_manage_binding import AccountManageTab
+
+            self.account_tab = AccountManageTab(
+                self.app.get_config_manager(),
+                on_account_changed=self.on_account_changed,
+                app=self.app.get_account_app(),
+                accounts=self.app.get_accounts(),
+            )
+            self.account_container.layout().addWidget(self.account_tab)
+        return self.account_tab
+
+    def ensure_dashboard_tab(self):
+        """按需构建账号总览标签页。"""
+        if self.dashboard_tab is None:
+            from gui.controllers.ui_bindings.dashboard_binding import DashboardTab
+
+            self.dashboard_tab = DashboardTab(
+                self.app.get_config_manager(),
+                get_accounts_func=self.app.get_accounts,
+                on_activate_account=self.on_dashboard_activate_account,
+                quota_history=self.app.get_quota_history(),
+            )
+            self.dashboard_container.layout().addWidget(self.dashboard_tab)
+        return self.dashboard_tab
+
+    def ensure_diagnostics_tab(self):
+        """按需构建诊断标签页。"""
+        if self.diagnostics_tab is None:
+            from gui.controllers.ui_bindings.diagnostics_binding import DiagnosticsTab
+
+            self.diagnostics_tab = DiagnosticsTab()
+            self.diagnostics_container.layout().addWidget(self.diagnostics_tab)
+        return self.diagnostics_tab
 
-        self.app.set_current_api_key(self.account_tab.get_active_api_key())
+    def on_dashboard_activate_account(self, account_name):
+        self.ensure_account_tab().on_activate_account(account_name)
 
     def on_account_changed(self, account_name, api_key):
         """账号切换时的回调。"""
         self.app.set_current_api_key(api_key)
         self.model_tab.status_label.setText(f"已切换到账号: {account_name}，正在刷新...")
         self.model_tab.load_data()
+        if self.dashboard_tab is not None:
+            self.dashboard_tab.refresh_active_marker()
 
     def restore_geometry(self):
         x, y, w, h = self.app.get_window_geometry()
@@ -64,4 +126,10 @@ class MainWindow(MainWindowUI):
         rect = self.geometry()
         self.app.set_window_geometry(rect.x(), rect.y(), rect.width(), rect.height())
         self.app.save_config()
+        self.app.shutdown_jobs()
+        self.app.flush_config()
+        self.app.close_network()
+        self.app.close_quota_history()
+        self.app.close_store()
+        self.app.close_metrics()
         super().closeEvent(event)
@@ -1,22 +1,31 @@
-from PySide6.QtWidgets import QMessageBox, QInputDialog, QApplication, QListWidgetItem
-from gui.ui.ui_model_list import ModelListUI, ModelItemWidget
+from PySide6.QtCore import QPoint, QPersistentModelIndex
+from PySide6.QtWidgets import QMessageBox, QInputDialog, QApplication, QAbstractItemView
+from core import metrics
+from gui.ui.ui_model_list import ModelListUI
 from gui.ui.messages import get_core_error_message
 from gui.controllers.app.model_list_app import ModelListApp
 
 class ModelListTab(ModelListUI):
     """模型列表标签页 UI 绑定层。"""
 
-    def __init__(self, config_manager, get_api_key_func=None, parent=None):
+    def __init__(self, config_manager, get_api_key_func=None, quota_history=None, parent=None):
         super().__init__(parent)
-        self.app = ModelListApp(config_manager)
+        self.app = ModelListApp(config_manager, quota_history)
         self.get_api_key = get_api_key_func  # 获取当前 API Key 的回调
         self.all_models = []  # 存储 API 返回的模型列表
+        self.streamed_models = None  # 流式加载中已收到的模型，未在加载时为 None
+        self.sweep_total = 0
+        self.sweep_done = 0
 
         self.refresh_quota_btn.clicked.connect(self.on_refresh_quota)
         self.search_input.textChanged.connect(self.on_search_changed)
         self.favorites_only_checkbox.stateChanged.connect(self.on_filter_changed)
         self.hidden_only_checkbox.stateChanged.connect(self.on_filter_changed)
         self.add_model_btn.clicked.connect(self.on_add_custom_model)
+        self.model_delegate.copy_clicked.connect(self.copy_model_id)
+        self.model_delegate.favorite_clicked.connect(self.toggle_favorite)
+        self.model_delegate.hide_clicked.connect(self.toggle_hide)
+        self.model_delegate.delete_clicked.connect(self.delete_custom_model)
 
         self.load_cached_quota()
 
@@ -29,59 +38,106 @@ class ModelListTab(ModelListUI):
             self._set_user_quota_label(user_remaining, user_limit)
 
     def load_data(self):
-        """加载模型列表。"""
-        self.load_cached_quota()
+        """加载模型列表：先显示本地缓存的目录，后台再向服务端校验是否有更新。"""
+        self.load_cached_data()
+        self.refresh_data()
+
+    def load_cached_data(self):
+        """只用本地缓存填充列表，不发起网络请求。"""
+        self.app.cancel_quota_sweep()
+        self.model_list_model.clear_quotas()
+        # 被取消的批量检查不会再回调，额度标签在这里直接换成缓存值 (没有缓存时显示 N/A)，
+        # 避免停留在 "批量检查中" 或上一个账号的额度
+        quota = self.app.get_cached_quota()
+        self._set_user_quota_label(quota.get("user_remaining", "N/A"), quota.get("user_limit", "N/A"))
 
         api_key = self.get_api_key() if self.get_api_key else None
-        self.app.load_models(api_key, self.on_data_loaded, self.on_error)
+        cached_models = self.app.get_cached_models(api_key)
+        if cached_models:
+            self.all_models = cached_models
+            self.status_label.setText(f"已加载缓存的 {len(cached_models)} 个模型，正在刷新...")
+            self.update_model_list()
+        else:
+            # 没有缓存时不保留上一个账号的列表，新目录到达后逐批显示
+            self.all_models = []
+            self.model_list_model.clear()
+            if self.streamed_models:
+                # 仍在流式加载时，已收到的部分随列表一起清空，保持两者一致
+                self.streamed_models = []
+
+    def refresh_data(self):
+        """在后台向服务端拉取最新的模型目录。"""
+        api_key = self.get_api_key() if self.get_api_key else None
+        # 同一账号的加载仍在进行时会合并到该任务，已收到的模型仍在列表中，不能清空
+        if self.streamed_models is None or not self.app.is_loading_models(api_key):
+            self.streamed_models = []
+        self.app.load_models(api_key, self.on_data_loaded, self.on_error, self.on_models_batch)
+
+    def on_models_batch(self, model_ids):
+        """目录边下载边显示：列表为空时把每批模型直接追加到末尾；
+        已显示缓存目录时忽略，等完整目录到达后再做差异更新。"""
+        if self.all_models or self.streamed_models is None:
+            return
+        self.streamed_models.extend(model_ids)
+        items = self.app.build_batch_items(
+            model_ids,
+            self.search_input.text().lower(),
+            self.favorites_only_checkbox.isChecked(),
+            self.hidden_only_checkbox.isChecked(),
+        )
+        self.model_list_model.append_items(items)
+        self.status_label.setText(f"正在加载模型列表，已收到 {len(self.streamed_models)} 个...")
 
     def on_data_loaded(self, quota_info):
-        if not self.app.is_list_worker(self.sender()):
-            return
+        self.streamed_models = None
         models = quota_info.get("models", [])
-        self.all_models = models
         self.status_label.setText(f"找到 {len(models)} 个模型")
 
         result = self.app.update_quota_from_list(quota_info)
         if result["updated"]:
             self._set_user_quota_label(result["user_remaining"], result["user_limit"])
 
-        self.update_model_list()
+        # 目录未变化 (例如 304) 时保留现有列表对象，避免重建搜索索引
+        if models != self.all_models:
+            self.all_models = models
+            self.update_model_list()
 
     def update_model_list(self):
         """根据搜索条件和收藏过滤更新模型列表。"""
-        current_scroll_value = self.model_list.verticalScrollBar().value()
+        with metrics.span("ui.update_model_list"):
+            self._update_model_list()
+
+    def _update_model_list(self):
+        # 以顶部可见行作为滚动锚点，行增删后仍停留在同一模型上
+        anchor = QPersistentModelIndex(self.model_list.indexAt(QPoint(0, 0)))
 
         search_text = self.search_input.text().lower()
         favorites_only = self.favorites_only_checkbox.isChecked()
         hidden_only = self.hidden_only_checkbox.isChecked()
 
-        self.model_list.clear()
-
-        items = self.app.build_model_items(
-            self.all_models,
-            search_text,
-            favorites_only,
-            hidden_only,
-        )
-
-        for item_data in items:
-            item = QListWidgetItem(self.model_list)
-            widget = ModelItemWidget(
-                item_data["model_id"],
-                item_data["is_favorite"],
-                item_data["is_custom"],
-                item_data["is_hidden"],
+        if not self.all_models and self.streamed_models:
+            # 流式加载中修改了筛选条件：直接筛选已收到的部分。
+            # 不完整的目录每次都不同，不为它构建搜索索引，完整目录到达后才建一次
+            items = self.app.build_batch_items(
+                self.streamed_models,
+                search_text,
+                favorites_only,
+                hidden_only,
+            )
+        else:
+            items = self.app.build_model_items(
+                self.all_models,
+                search_text,
+                favorites_only,
+                hidden_only,
             )
-            widget.copy_clicked.connect(self.copy_model_id)
-            widget.favorite_clicked.connect(self.toggle_favorite)
-            widget.hide_clicked.connect(self.toggle_hide)
-            widget.delete_clicked.connect(self.delete_custom_model)
-            item.setSizeHint(widget.sizeHint())
-            self.model_list.addItem(item)
-            self.model_list.setItemWidget(item, widget)
+        self.model_list_model.update_items(items)
 
-        self.model_list.verticalScrollBar().setValue(current_scroll_value)
+        if anchor.isValid():
+            self.model_list.scrollTo(
+                self.model_list_model.index(anchor.row()),
+                QAbstractItemView.PositionAtTop,
+            )
 
     def on_search_changed(self, text):
         self.update_model_list()
@@ -90,12 +146,42 @@ class ModelListTab(ModelListUI):
         self.update_model_list()
 
     def on_refresh_quota(self):
-        items = []
-        for i in range(self.model_list.count()):
-            widget = self.model_list.itemWidget(self.model_list.item(i))
-            if widget:
-                items.append(widget.model_id)
+        items = self.model_list_model.model_ids()
+        favorites = self.app.get_favorites()
+
+        modes = [
+            "单个模型",
+            f"全部收藏模型 ({len(favorites)} 个)",
+            f"当前列表 ({len(items)} 个)",
+            "指定模型列表...",
+        ]
+        mode, ok = QInputDialog.getItem(
+            self,
+            "刷新额度",
+            "选择额度检查范围 (每个模型消耗 1 次调用):",
+            modes,
+            0,
+            False,
+        )
+        if not ok:
+            return
+
+        if mode == modes[0]:
+            self.check_single_quota(items)
+        elif mode == modes[1]:
+            self.start_quota_sweep(favorites)
+        elif mode == modes[2]:
+            self.start_quota_sweep(items)
+        else:
+            text, ok = QInputDialog.getMultiLineText(
+                self, "指定模型列表", "每行一个模型 ID:"
+            )
+            if ok:
+                self.start_quota_sweep(
+                    [line.strip() for line in text.splitlines() if line.strip()]
+                )
 
+    def check_single_quota(self, items):
         if not items:
             QMessageBox.warning(self, "警告", "没有可供选择的模型。")
             return
@@ -113,9 +199,65 @@ class ModelListTab(ModelListUI):
             api_key = self.get_api_key() if self.get_api_key else None
             self.app.check_quota(model, api_key, self.on_quota_checked, self.on_quota_error)
 
-    def on_quota_checked(self, quota_info):
-        if not self.app.is_quota_worker(self.sender()):
+    def start_quota_sweep(self, model_ids):
+        """并发检查一组模型的额度，结果逐条显示在列表中。"""
+        model_ids = list(dict.fromkeys(model_ids))
+        if not model_ids:
+            QMessageBox.warning(self, "警告", "没有可供检查的模型。")
+            return
+
+        if self.app.is_sweep_running():
+            QMessageBox.information(self, "提示", "已有批量额度检查正在进行。")
+            return
+
+        concurrency = self.app.get_quota_sweep_concurrency()
+        reply = QMessageBox.question(
+            self,
+            "确认批量检查",
+            f"将检查 {len(model_ids)} 个模型的额度，共消耗 {len(model_ids)} 次调用"
+            f" (并发 {concurrency})。是否继续？",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if reply != QMessageBox.Yes:
             return
+
+        self.sweep_total = len(model_ids)
+        self.sweep_done = 0
+        self.model_list_model.clear_quotas()
+        self.quota_label.setText(f"额度: 批量检查中 0/{self.sweep_total}")
+        api_key = self.get_api_key() if self.get_api_key else None
+        self.app.sweep_quota(
+            model_ids,
+            api_key,
+            self.on_sweep_result,
+            self.on_sweep_finished,
+            self.on_sweep_error,
+        )
+
+    def on_sweep_result(self, result):
+        self.sweep_done += 1
+        self.quota_label.setText(f"额度: 批量检查中 {self.sweep_done}/{self.sweep_total}")
+
+        if not result.get("ok"):
+            text = "错误"
+        elif result.get("model_remaining", "N/A") != "N/A":
+            text = f"{result['model_remaining']} / {result.get('model_limit', 'N/A')}"
+        else:
+            text = f"状态 {result.get('status_code', 'Unknown')}"
+        self.model_list_model.set_model_quota(result["model_id"], text)
+
+    def on_sweep_finished(self, results):
+        summary = self.app.update_quota_from_sweep(results)
+        self._set_user_quota_label(summary["user_remaining"], summary["user_limit"])
+        self.status_label.setText(
+            f"批量额度检查完成: 成功 {summary['succeeded']} 个，失败 {summary['failed']} 个"
+        )
+
+    def on_sweep_error(self, error_info):
+        self.quota_label.setText("额度: 错误")
+        QMessageBox.critical(self, "错误", get_core_error_message(error_info))
+
+    def on_quota_checked(self, quota_info):
         result = self.app.update_quota_from_check(quota_info)
         if result["updated"]:
             self._set_user_quota_label(result["user_remaining"], result["user_limit"])
@@ -138,14 +280,11 @@ class ModelListTab(ModelListUI):
             )
 
     def on_quota_error(self, error_info):
-        if not self.app.is_quota_worker(self.sender()):
-            return
         self.quota_label.setText("额度: 错误")
         QMessageBox.critical(self, "错误", get_core_error_message(error_info))
 
     def on_error(self, error_info):
-        if not self.app.is_list_worker(self.sender()):
-            return
+        self.streamed_models = None
         self._reset_error_state()
         QMessageBox.critical(self, "错误", get_core_error_message(error_info))
 
@@ -198,7 +337,7 @@ class ModelListTab(ModelListUI):
 
     def _reset_error_state(self):
         self.all_models = []
-        self.model_list.clear()
+        self.model_list_model.clear()
         self.status_label.setText("无数据/错误状态")
         self._set_user_quota_label("N/A", "N/A")
         self.model_quota_label.setText("模型额度: N/A")
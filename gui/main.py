@@ -4,13 +4,37 @@ from pathlib import Path
 project_root = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(project_root))
 
-from PySide6.QtWidgets import QApplication
-from gui.controllers.ui_bindings.main_window_binding import MainWindow
+from gui.startup_report import StartupReport
+
+STARTUP_REPORT_FLAG = "--startup-report"
 
 def main():
-    app = QApplication(sys.argv)
-    window = MainWindow()
-    window.show()
+    # 带 --startup-report 启动时打印各阶段耗时，并在首帧显示后退出
+    report = StartupReport(STARTUP_REPORT_FLAG in sys.argv)
+    argv = [arg for arg in sys.argv if arg != STARTUP_REPORT_FLAG]
+
+    with report.phase("导入 Qt"):
+        from PySide6.QtCore import QTimer
+        from PySide6.QtWidgets import QApplication
+    with report.phase("创建 QApplication"):
+        app = QApplication(argv)
+    with report.phase("导入主窗口"):
+        from gui.controllers.ui_bindings.main_window_binding import MainWindow
+    with report.phase("构建主窗口"):
+        window = MainWindow()
+    with report.phase("显示窗口"):
+        window.show()
+
+    def on_first_frame():
+        report.mark("首帧")
+        if report.enabled:
+            print(report.format())
+            app.quit()
+            return
+        # 首帧之后再发起网络刷新等耗时工作
+        window.start_background_work()
+
+    QTimer.singleShot(0, on_first_frame)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
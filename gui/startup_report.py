@@ -0,0 +1,54 @@
+import sys
+import time
+from contextlib import contextmanager
+
+# 启动阶段常见的重量级依赖，报告中标出它们是否已在首帧前被导入
+WATCHED_MODULES = ("PySide6.QtWidgets", "requests", "aiohttp", "toml", "dotenv")
+
+
+class StartupReport:
+    """记录启动各阶段的耗时与新导入的模块数，用于 --startup-report。
+
+    未启用时 phase() 与 mark() 不做任何事，正常启动无额外开销。
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.last_modules = len(sys.modules)
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        self.last = time.perf_counter()
+        self.last_modules = len(sys.modules)
+        try:
+            yield
+        finally:
+            self.mark(name)
+
+    def mark(self, name):
+        """记录从上一个记录点到现在的耗时。"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        modules = len(sys.modules)
+        self.phases.append((name, now - self.last, modules - self.last_modules))
+        self.last = now
+        self.last_modules = modules
+
+    def format(self):
+        lines = [f"{'阶段':<20}{'耗时 (ms)':>12}{'新模块':>10}"]
+        for name, elapsed, modules in self.phases:
+            lines.append(f"{name:<20}{elapsed * 1000:>12.1f}{modules:>10}")
+        total = time.perf_counter() - self.started
+        lines.append(f"{'合计':<20}{total * 1000:>12.1f}{len(sys.modules):>10}")
+        loaded = [name for name in WATCHED_MODULES if name in sys.modules]
+        deferred = [name for name in WATCHED_MODULES if name not in sys.modules]
+        lines.append(f"首帧前已导入: {', '.join(loaded) or '无'}")
+        lines.append(f"延迟导入: {', '.join(deferred) or '无'}")
+        return "\n".join(lines)
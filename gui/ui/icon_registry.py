@@ -0,0 +1,45 @@
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QIcon
+
+from gui.ui import ui_paths
+
+# 进程内共享的图标缓存：每个图标文件只解码一次，按 (尺寸, 设备像素比) 缓存渲染好的位图
+_icons = {}
+_pixmaps = {}
+
+
+def get_icon(icon_name):
+    """获取共享的 QIcon，首次使用时才从 gui/icon 加载。"""
+    icon = _icons.get(icon_name)
+    if icon is None:
+        icon = QIcon(ui_paths.get_icon_path(icon_name))
+        _icons[icon_name] = icon
+    return icon
+
+
+def get_pixmap(icon_name, size, device_pixel_ratio=1.0):
+    """获取指定逻辑尺寸与设备像素比的位图，绘制时可直接 drawPixmap。"""
+    key = (icon_name, size, device_pixel_ratio)
+    pixmap = _pixmaps.get(key)
+    if pixmap is None:
+        pixmap = get_icon(icon_name).pixmap(QSize(size, size), device_pixel_ratio)
+        _pixmaps[key] = pixmap
+    return pixmap
+
+
+def clear_cache():
+    _icons.clear()
+    _pixmaps.clear()
+
+
+def get_cache_stats():
+    """返回已缓存的图标数、位图数与位图占用的字节数。"""
+    pixmap_bytes = sum(
+        pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        for pixmap in _pixmaps.values()
+    )
+    return {
+        "icons": len(_icons),
+        "pixmaps": len(_pixmaps),
+        "pixmap_bytes": pixmap_bytes,
+    }
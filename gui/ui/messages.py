@@ -6,6 +6,9 @@ def get_core_error_message(error_info):
     if code == "request_failed":
         status_code = context.get("status_code", "Unknown")
         return f"请求失败: {status_code}"
+    if code == "rate_limited":
+        retry_after = context.get("retry_after") or 0
+        return f"请求过于频繁，请在 {retry_after:.0f} 秒后重试"
     return context.get("message", "未知错误")
 
 
@@ -0,0 +1,54 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                               QLineEdit, QTableWidget, QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt
+
+
+class DashboardUI(QWidget):
+    """多账号总览标签页 UI。"""
+    COLUMNS = ["账号", "模型数", "用户额度", "额度趋势 (24h)", "预计耗尽", "状态"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # 标题和刷新按钮
+        header_layout = QHBoxLayout()
+
+        title_label = QLabel("账号总览")
+        title_label.setStyleSheet("font-size: 16px; font-weight: bold;")
+        header_layout.addWidget(title_label)
+
+        header_layout.addStretch()
+
+        self.refresh_btn = QPushButton("刷新全部账号")
+        header_layout.addWidget(self.refresh_btn)
+
+        layout.addLayout(header_layout)
+
+        # 账号表格
+        self.account_table = QTableWidget(0, len(self.COLUMNS))
+        self.account_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.account_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.account_table.verticalHeader().setVisible(False)
+        self.account_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.account_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.account_table.setToolTip("双击切换到该账号")
+        layout.addWidget(self.account_table)
+
+        # 模型可见性查询
+        lookup_layout = QHBoxLayout()
+        self.model_lookup_input = QLineEdit()
+        self.model_lookup_input.setPlaceholderText("输入模型 ID 查询可见账号...")
+        lookup_layout.addWidget(self.model_lookup_input)
+        layout.addLayout(lookup_layout)
+
+        self.lookup_label = QLabel("")
+        self.lookup_label.setWordWrap(True)
+        layout.addWidget(self.lookup_label)
+
+        self.status_label = QLabel("点击右上角刷新全部账号")
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
@@ -0,0 +1,56 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                               QTableWidget, QHeaderView, QAbstractItemView)
+
+
+class DiagnosticsUI(QWidget):
+    """诊断标签页 UI：展示各环节的耗时统计与计数器。"""
+    COLUMNS = ["指标", "次数", "平均 (ms)", "P50 (ms)", "P95 (ms)", "最大 (ms)", "总计 (ms)"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+
+        # 标题和操作按钮
+        header_layout = QHBoxLayout()
+
+        title_label = QLabel("性能诊断")
+        title_label.setStyleSheet("font-size: 16px; font-weight: bold;")
+        header_layout.addWidget(title_label)
+
+        header_layout.addStretch()
+
+        self.refresh_btn = QPushButton("刷新")
+        header_layout.addWidget(self.refresh_btn)
+
+        self.reset_btn = QPushButton("清零")
+        header_layout.addWidget(self.reset_btn)
+
+        self.export_json_btn = QPushButton("导出 JSON")
+        header_layout.addWidget(self.export_json_btn)
+
+        self.export_prometheus_btn = QPushButton("导出 Prometheus")
+        header_layout.addWidget(self.export_prometheus_btn)
+
+        layout.addLayout(header_layout)
+
+        # 耗时统计表格
+        self.metrics_table = QTableWidget(0, len(self.COLUMNS))
+        self.metrics_table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.metrics_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.metrics_table)
+
+        # 计数器
+        self.counters_label = QLabel("")
+        self.counters_label.setWordWrap(True)
+        layout.addWidget(self.counters_label)
+
+        # 底部状态栏
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
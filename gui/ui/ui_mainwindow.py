@@ -1,4 +1,4 @@
-from PySide6.QtWidgets import QMainWindow, QTabWidget
+from PySide6.QtWidgets import QMainWindow, QTabWidget, QWidget, QVBoxLayout
 
 class MainWindowUI(QMainWindow):
     """主窗口 UI，包含标签页容器。"""
@@ -10,3 +10,11 @@ class MainWindowUI(QMainWindow):
     def init_ui(self):
         self.tab_widget = QTabWidget()
         self.setCentralWidget(self.tab_widget)
+
+    def add_placeholder_tab(self, title):
+        """添加一个空的占位标签页，真正的内容之后再放入其布局中。"""
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.tab_widget.addTab(container, title)
+        return container
@@ -1,96 +1,272 @@
 from pathlib import Path
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
-                               QLabel, QPushButton, QLineEdit, QCheckBox, QSizePolicy)
-from PySide6.QtGui import QIcon
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView,
+                               QLabel, QPushButton, QLineEdit, QCheckBox, QApplication,
+                               QStyle, QStyledItemDelegate, QStyleOptionViewItem, QToolTip)
+from PySide6.QtGui import QPalette
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QRect, QSize, QEvent
 
+from core.model_list_logic import diff_model_ids
+from gui.ui import icon_registry
 
-from gui.ui import ui_paths
+class ModelListModel(QAbstractListModel):
+    """模型列表数据模型，每行仅保存一条轻量数据，由视图按需取用。"""
+    FavoriteRole = Qt.UserRole + 1
+    CustomRole = Qt.UserRole + 2
+    HiddenRole = Qt.UserRole + 3
+    QuotaRole = Qt.UserRole + 4
 
-class ModelItemWidget(QWidget):
-    """模型列表项 Widget。"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._ids = set()
+        self._quotas = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._items)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._items):
+            return None
+        item = self._items[index.row()]
+        if role == Qt.DisplayRole:
+            return item["model_id"]
+        if role == self.FavoriteRole:
+            return item["is_favorite"]
+        if role == self.CustomRole:
+            return item["is_custom"]
+        if role == self.HiddenRole:
+            return item["is_hidden"]
+        if role == self.QuotaRole:
+            return self._quotas.get(item["model_id"])
+        return None
+
+    def set_items(self, items):
+        """整体替换列表数据。"""
+        self.beginResetModel()
+        self._items = list(items)
+        self._ids = {item["model_id"] for item in self._items}
+        self.endResetModel()
+
+    def update_items(self, items):
+        """与当前行做差异比较，只应用插入/删除/移动，保留选中状态。"""
+        items = list(items)
+        items_by_id = {item["model_id"]: item for item in items}
+        ops = diff_model_ids(self.model_ids(), [item["model_id"] for item in items])
+
+        for op in ops:
+            if op[0] == "remove":
+                _, start, count = op
+                self.beginRemoveRows(QModelIndex(), start, start + count - 1)
+                del self._items[start:start + count]
+                self.endRemoveRows()
+            elif op[0] == "insert":
+                _, start, model_ids = op
+                self.beginInsertRows(QModelIndex(), start, start + len(model_ids) - 1)
+                self._items[start:start] = [items_by_id[model_id] for model_id in model_ids]
+                self.endInsertRows()
+            else:
+                _, src, dst = op
+                self.beginMoveRows(QModelIndex(), src, src, QModelIndex(), dst)
+                self._items.insert(dst, self._items.pop(src))
+                self.endMoveRows()
+
+        # 行不变但收藏/隐藏等状态改变时只刷新对应行
+        changed_start = None
+        for row, item in enumerate(items):
+            if self._items[row] != item:
+                self._items[row] = item
+                if changed_start is None:
+                    changed_start = row
+            elif changed_start is not None:
+                self.dataChanged.emit(self.index(changed_start), self.index(row - 1))
+                changed_start = None
+        if changed_start is not None:
+            self.dataChanged.emit(self.index(changed_start), self.index(len(items) - 1))
+        self._ids = set(items_by_id)
+
+    def append_items(self, items):
+        """在末尾追加行 (目录流式加载时逐批使用)，已在列表中的模型跳过，保证每个 ID 只有一行。"""
+        unique = []
+        for item in items:
+            if item["model_id"] not in self._ids:
+                self._ids.add(item["model_id"])
+                unique.append(item)
+        items = unique
+        if not items:
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        self._items.extend(items)
+        self.endInsertRows()
+
+    def clear(self):
+        self.set_items([])
+
+    def set_model_quota(self, model_id, text):
+        """设置某个模型的额度显示文本，仅刷新该行。"""
+        self._quotas[model_id] = text
+        for row, item in enumerate(self._items):
+            if item["model_id"] == model_id:
+                index = self.index(row)
+                self.dataChanged.emit(index, index, [self.QuotaRole])
+                break
+
+    def clear_quotas(self):
+        if not self._quotas:
+            return
+        self._quotas = {}
+        if self._items:
+            self.dataChanged.emit(self.index(0), self.index(len(self._items) - 1), [self.QuotaRole])
+
+    def model_id_at(self, row):
+        return self._items[row]["model_id"]
+
+    def model_ids(self):
+        return [item["model_id"] for item in self._items]
+
+
+class ModelItemDelegate(QStyledItemDelegate):
+    """绘制模型行及其复制/收藏/隐藏/删除按钮，并处理按钮点击。"""
     copy_clicked = Signal(str)
     favorite_clicked = Signal(str)
     hide_clicked = Signal(str)
     delete_clicked = Signal(str)
 
-    def __init__(self, model_id, is_favorite=False, is_custom=False, is_hidden=False, parent=None):
+    ROW_HEIGHT = 28
+    BUTTON_SIZE = 24
+    ICON_SIZE = 16
+    MARGIN = 4
+
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.model_id = model_id
-        self.is_favorite = is_favorite
-        self.is_custom = is_custom
-        self.is_hidden = is_hidden
-        self.init_ui()
+        self.icon_files = {
+            "copy": "Copy.png",
+            "star": "Star.png",
+            "stared": "Stared.png",
+            "eye": "Eye.png",
+            "eye_close": "EyeClose.png",
+            "delete": "Delete.png",
+        }
+        self.signals = {
+            "copy": self.copy_clicked,
+            "favorite": self.favorite_clicked,
+            "hide": self.hide_clicked,
+            "delete": self.delete_clicked,
+        }
 
-    def init_ui(self):
-        layout = QHBoxLayout(self)
-        layout.setContentsMargins(4, 2, 4, 2)
-
-        # 模型名称
-        self.label = QLabel(self.model_id)
-        self.label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Preferred)
-        layout.addWidget(self.label)
-
-        # 复制按钮
-        self.copy_btn = QPushButton()
-        self.copy_btn.setIcon(QIcon(ui_paths.get_icon_path("Copy.png")))
-        self.copy_btn.setFixedSize(24, 24)
-        self.copy_btn.setFlat(True)
-        self.copy_btn.setToolTip("复制模型 ID")
-        self.copy_btn.clicked.connect(lambda: self.copy_clicked.emit(self.model_id))
-        layout.addWidget(self.copy_btn)
-
-        # 收藏按钮
-        self.favorite_btn = QPushButton()
-        self.favorite_btn.setFixedSize(24, 24)
-        self.favorite_btn.setFlat(True)
-        self.update_favorite_icon()
-        self.favorite_btn.clicked.connect(self.on_favorite_clicked)
-        layout.addWidget(self.favorite_btn)
-
-        # 隐藏按钮
-        self.hide_btn = QPushButton()
-        self.hide_btn.setFixedSize(24, 24)
-        self.hide_btn.setFlat(True)
-        self.update_hide_icon()
-        self.hide_btn.clicked.connect(self.on_hide_clicked)
-        layout.addWidget(self.hide_btn)
-
-        # 删除按钮 (仅自定义模型显示)
-        self.delete_btn = QPushButton()
-        self.delete_btn.setIcon(QIcon(ui_paths.get_icon_path("Delete.png")))
-        self.delete_btn.setFixedSize(24, 24)
-        self.delete_btn.setFlat(True)
-        self.delete_btn.setToolTip("删除自定义模型")
-        self.delete_btn.clicked.connect(lambda: self.delete_clicked.emit(self.model_id))
-        self.delete_btn.setVisible(self.is_custom)
-        layout.addWidget(self.delete_btn)
-
-    def update_favorite_icon(self):
-        if self.is_favorite:
-            self.favorite_btn.setIcon(QIcon(ui_paths.get_icon_path("Stared.png")))
-            self.favorite_btn.setToolTip("从收藏移除")
-        else:
-            self.favorite_btn.setIcon(QIcon(ui_paths.get_icon_path("Star.png")))
-            self.favorite_btn.setToolTip("添加到收藏")
-
-    def on_favorite_clicked(self):
-        self.is_favorite = not self.is_favorite
-        self.update_favorite_icon()
-        self.favorite_clicked.emit(self.model_id)
-
-    def update_hide_icon(self):
-        if self.is_hidden:
-            self.hide_btn.setIcon(QIcon(ui_paths.get_icon_path("EyeClose.png")))
-            self.hide_btn.setToolTip("取消隐藏")
-        else:
-            self.hide_btn.setIcon(QIcon(ui_paths.get_icon_path("Eye.png")))
-            self.hide_btn.setToolTip("隐藏模型")
-
-    def on_hide_clicked(self):
-        self.is_hidden = not self.is_hidden
-        self.update_hide_icon()
-        self.hide_clicked.emit(self.model_id)
+    def button_rects(self, rect, is_custom):
+        """按从左到右的顺序返回行内按钮区域 [(名称, QRect)]。"""
+        names = ["copy", "favorite", "hide"]
+        if is_custom:
+            names.append("delete")
+
+        rects = []
+        top = rect.top() + (rect.height() - self.BUTTON_SIZE) // 2
+        right = rect.right() - self.MARGIN
+        for name in reversed(names):
+            left = right - self.BUTTON_SIZE + 1
+            rects.append((name, QRect(left, top, self.BUTTON_SIZE, self.BUTTON_SIZE)))
+            right = left - 1
+        rects.reverse()
+        return rects
+
+    def button_at(self, rect, index, pos):
+        for name, button_rect in self.button_rects(rect, index.data(ModelListModel.CustomRole)):
+            if button_rect.contains(pos):
+                return name
+        return None
+
+    def button_icon_file(self, name, index):
+        if name == "favorite":
+            return self.icon_files["stared" if index.data(ModelListModel.FavoriteRole) else "star"]
+        if name == "hide":
+            return self.icon_files["eye_close" if index.data(ModelListModel.HiddenRole) else "eye"]
+        return self.icon_files[name]
+
+    def button_tooltip(self, name, index):
+        if name == "copy":
+            return "复制模型 ID"
+        if name == "favorite":
+            return "从收藏移除" if index.data(ModelListModel.FavoriteRole) else "添加到收藏"
+        if name == "hide":
+            return "取消隐藏" if index.data(ModelListModel.HiddenRole) else "隐藏模型"
+        return "删除自定义模型"
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        text = opt.text
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, opt.widget)
+
+        rects = self.button_rects(option.rect, index.data(ModelListModel.CustomRole))
+        text_rect = QRect(option.rect)
+        text_rect.setLeft(text_rect.left() + self.MARGIN)
+        text_rect.setRight(rects[0][1].left() - self.MARGIN)
+        text_role = QPalette.HighlightedText if option.state & QStyle.State_Selected else QPalette.Text
+
+        # 批量额度检查的结果显示在按钮左侧
+        quota_text = index.data(ModelListModel.QuotaRole)
+        if quota_text:
+            quota_width = opt.fontMetrics.horizontalAdvance(quota_text)
+            quota_rect = QRect(text_rect)
+            quota_rect.setLeft(text_rect.right() - quota_width)
+            text_rect.setRight(quota_rect.left() - self.MARGIN)
+            style.drawItemText(
+                painter,
+                quota_rect,
+                Qt.AlignRight | Qt.AlignVCenter,
+                opt.palette,
+                True,
+                quota_text,
+                text_role if option.state & QStyle.State_Selected else QPalette.PlaceholderText,
+            )
+        style.drawItemText(
+            painter,
+            text_rect,
+            Qt.AlignLeft | Qt.AlignVCenter,
+            opt.palette,
+            True,
+            opt.fontMetrics.elidedText(text, Qt.ElideRight, text_rect.width()),
+            text_role,
+        )
+
+        # 位图按设备像素比缓存在图标注册表中，绘制时不再逐行缩放
+        device_pixel_ratio = painter.device().devicePixelRatioF()
+        for name, button_rect in rects:
+            icon_rect = QRect(0, 0, self.ICON_SIZE, self.ICON_SIZE)
+            icon_rect.moveCenter(button_rect.center())
+            pixmap = icon_registry.get_pixmap(
+                self.button_icon_file(name, index), self.ICON_SIZE, device_pixel_ratio
+            )
+            painter.drawPixmap(icon_rect, pixmap)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease):
+            return super().editorEvent(event, model, option, index)
+        if event.button() != Qt.LeftButton:
+            return False
+
+        name = self.button_at(option.rect, index, event.position().toPoint())
+        if name is None:
+            return False
+        if event.type() == QEvent.MouseButtonRelease:
+            self.signals[name].emit(index.data(Qt.DisplayRole))
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        if event.type() == QEvent.ToolTip and index.isValid():
+            name = self.button_at(option.rect, index, event.pos())
+            if name is not None:
+                QToolTip.showText(event.globalPos(), self.button_tooltip(name, index), view)
+                return True
+        return super().helpEvent(event, view, option, index)
 
 
 class ModelListUI(QWidget):
@@ -136,13 +312,18 @@ class ModelListUI(QWidget):
         filter_layout.addWidget(self.hidden_only_checkbox)
         
         self.add_model_btn = QPushButton()
-        self.add_model_btn.setIcon(QIcon(ui_paths.get_icon_path("Add.png")))
+        self.add_model_btn.setIcon(icon_registry.get_icon("Add.png"))
         self.add_model_btn.setFixedSize(28, 28)
         self.add_model_btn.setToolTip("添加自定义模型")
         filter_layout.addWidget(self.add_model_btn)
         
         layout.addLayout(filter_layout)
 
-        # Model List
-        self.model_list = QListWidget()
+        # Model List (仅可见行参与绘制)
+        self.model_list_model = ModelListModel(self)
+        self.model_delegate = ModelItemDelegate(self)
+        self.model_list = QListView()
+        self.model_list.setUniformItemSizes(True)
+        self.model_list.setModel(self.model_list_model)
+        self.model_list.setItemDelegate(self.model_delegate)
         layout.addWidget(self.model_list)
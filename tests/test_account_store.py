@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+from core import api_key_provider
+from core.account_store import AccountStore
+from core.env_file import EnvFile
+
+
+class AccountStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env_path = Path(self.tmp.name) / ".env"
+        # 隔离运行环境中已有的账号变量
+        environ = {key: value for key, value in os.environ.items() if not key.startswith("API_KEY")}
+        patcher = mock.patch.dict(os.environ, environ, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_env(self, text):
+        self.env_path.write_text(text, encoding="utf-8")
+
+    def read_env(self):
+        return self.env_path.read_text(encoding="utf-8")
+
+    def test_mutation_without_load_keeps_existing_entries(self):
+        self.write_env("# 注释\nAPI_KEY='ms-default'\nOTHER=1\n")
+        store = AccountStore(self.env_path)
+        store.add_account("work", "ms-work")
+        self.assertEqual(self.read_env(), "# 注释\nAPI_KEY='ms-default'\nOTHER=1\nAPI_KEY_work='ms-work'\n")
+        self.assertEqual(AccountStore(self.env_path).load_accounts(), {"默认": "ms-default", "work": "ms-work"})
+
+    def test_delete_without_load(self):
+        self.write_env("API_KEY='ms-default'\nAPI_KEY_work='ms-work'\n")
+        AccountStore(self.env_path).delete_account("work")
+        self.assertEqual(self.read_env(), "API_KEY='ms-default'\n")
+
+    def test_duplicate_keys(self):
+        self.write_env("API_KEY_work=old\nOTHER=1\nAPI_KEY_work=new\n")
+        with self.assertLogs(level="WARNING"):
+            env_file = EnvFile(self.env_path)
+            env_file.load()
+        self.assertEqual(env_file.get("API_KEY_work"), "new")
+        self.assertEqual(env_file.items(), [("OTHER", "1"), ("API_KEY_work", "new")])
+
+        # 修改其他键时重复行原样保留
+        store = AccountStore(self.env_path)
+        store.add_account("home", "ms-home")
+        self.assertEqual(self.read_env(), "API_KEY_work=old\nOTHER=1\nAPI_KEY_work=new\nAPI_KEY_home='ms-home'\n")
+
+        # 删除时所有重复行一起删除，旧值不会重新生效
+        store.delete_account("work")
+        self.assertEqual(self.read_env(), "OTHER=1\nAPI_KEY_home='ms-home'\n")
+        self.assertEqual(AccountStore(self.env_path).load_accounts(), {"home": "ms-home"})
+
+
+    def test_environment_accounts_merged_under_file(self):
+        self.write_env("API_KEY_work='ms-file'\n")
+        with mock.patch.dict(os.environ, {"API_KEY": "ms-env-default", "API_KEY_work": "ms-env", "API_KEY_ci": "ms-ci"}):
+            accounts = AccountStore(self.env_path).load_accounts()
+        self.assertEqual(accounts, {"默认": "ms-env-default", "work": "ms-file", "ci": "ms-ci"})
+
+
+    def test_default_env_path_found_after_creation(self):
+        api_key_provider.invalidate_api_key_cache()
+        self.addCleanup(api_key_provider.invalidate_api_key_cache)
+        with mock.patch.object(api_key_provider, "find_dotenv", return_value="") as find_dotenv:
+            self.assertIsNone(api_key_provider.resolve_api_key())
+            # 未找到 .env 的结果不缓存，文件创建后可以被发现
+            self.write_env("API_KEY='ms-default'\n")
+            find_dotenv.return_value = str(self.env_path)
+            self.assertEqual(api_key_provider.resolve_api_key(), "ms-default")
+
+
+if __name__ == "__main__":
+    unittest.main()
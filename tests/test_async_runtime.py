@@ -0,0 +1,31 @@
+import unittest
+from core import async_runtime
+
+
+class FakeClient:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class AsyncRuntimeTest(unittest.TestCase):
+    def tearDown(self):
+        async_runtime.close()
+
+    def test_client_reused_across_runs_and_closed(self):
+        async def get_client():
+            return async_runtime.get_client("key", FakeClient)
+
+        first = async_runtime.run(get_client())
+        self.assertIs(async_runtime.run(get_client()), first)
+
+        async_runtime.close()
+        self.assertTrue(first.closed)
+        # 关闭后再次使用会重新启动事件循环并创建新的客户端
+        self.assertIsNot(async_runtime.run(get_client()), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
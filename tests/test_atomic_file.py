@@ -0,0 +1,39 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from core.atomic_file import atomic_write_text
+
+
+@unittest.skipUnless(os.name == "posix", "file modes are only meaningful on POSIX")
+class AtomicWriteModeTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "config.toml"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def mode(self):
+        return stat.S_IMODE(self.path.stat().st_mode)
+
+    def test_keeps_existing_mode(self):
+        self.path.write_text("a = 1\n", encoding="utf-8")
+        for mode in (0o644, 0o600, 0o640):
+            with self.subTest(mode=oct(mode)):
+                os.chmod(self.path, mode)
+                atomic_write_text(self.path, "a = 2\n")
+                self.assertEqual(self.mode(), mode)
+                self.assertEqual(self.path.read_text(encoding="utf-8"), "a = 2\n")
+
+    def test_new_file_uses_umask(self):
+        mask = os.umask(0)
+        os.umask(mask)
+        atomic_write_text(self.path, "a = 1\n")
+        self.assertEqual(self.mode(), 0o666 & ~mask)
+        self.assertEqual(list(self.path.parent.iterdir()), [self.path])
+
+
+if __name__ == "__main__":
+    unittest.main()
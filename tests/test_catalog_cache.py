@@ -0,0 +1,124 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from bench.catalog_data import generate_catalog
+from bench.stub_server import StubOptions, StubServer
+from core import metrics
+from core.catalog_cache import CatalogCache
+from core.modelscope_client import ModelScopeClient
+from core.modelscope_service import ModelScopeService
+from core.rate_limiter import RateLimiter
+
+API_KEY = "ms-test-key"
+
+
+class CatalogCacheStubTest(unittest.TestCase):
+    """对本地替身服务验证目录缓存的写入、条件请求复用与损坏文件的处理。"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StubServer(options=StubOptions(catalog_size=50)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self.tmp.name)
+        metrics.reset()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def create_service(self):
+        client = ModelScopeClient(base_url=self.server.base_url, rate_limiter=RateLimiter())
+        return ModelScopeService(client=client, catalog_cache=CatalogCache(self.cache_dir))
+
+    def parse_count(self):
+        return metrics.snapshot()["histograms"].get("json.parse_models", {}).get("count", 0)
+
+    def test_200_writes_cache(self):
+        result = self.create_service().list_models(API_KEY)
+        self.assertFalse(result["from_cache"])
+        self.assertEqual(len(result["models"]), 50)
+
+        # 新实例从磁盘读取，确认条目确实写入了文件
+        entry = CatalogCache(self.cache_dir).load(API_KEY)
+        self.assertEqual(entry["models"], result["models"])
+        self.assertEqual(entry["etag"], self.server.state.catalog_etag)
+
+    def test_304_reuses_cache_without_parsing(self):
+        first = self.create_service().list_models(API_KEY)
+        self.assertEqual(self.parse_count(), 1)
+
+        second = self.create_service().list_models(API_KEY)
+        self.assertTrue(second["not_modified"])
+        self.assertTrue(second["from_cache"])
+        self.assertEqual(second["models"], first["models"])
+        self.assertEqual(self.parse_count(), 1)
+        self.assertEqual(metrics.snapshot()["counters"].get("http.not_modified"), 1)
+
+    def test_changed_catalog_replaces_cache(self):
+        self.create_service().list_models(API_KEY)
+        self.server.state.set_catalog(["org/new-model"])
+        try:
+            result = self.create_service().list_models(API_KEY)
+        finally:
+            self.server.state.set_catalog(generate_catalog(50, 0))
+        self.assertFalse(result["from_cache"])
+        self.assertEqual(result["models"], ["org/new-model"])
+
+    def test_last_modified_alone_revalidates(self):
+        client = ModelScopeClient(base_url=self.server.base_url, rate_limiter=RateLimiter())
+        first = client.list_models(API_KEY)
+        self.assertEqual(first["last_modified"], self.server.state.catalog_last_modified)
+
+        self.assertTrue(client.list_models(API_KEY, last_modified=first["last_modified"])["not_modified"])
+        self.server.state.set_catalog(["org/new-model"])
+        try:
+            result = client.list_models(API_KEY, last_modified=first["last_modified"])
+        finally:
+            self.server.state.set_catalog(generate_catalog(50, 0))
+        self.assertFalse(result["not_modified"])
+        self.assertEqual(result["models"], ["org/new-model"])
+
+    def test_corrupt_cache_file(self):
+        cache = CatalogCache(self.cache_dir)
+        path = cache._entry_path(API_KEY)
+        path.write_text('{"models": ["org/a", ', encoding="utf-8")
+        self.assertIsNone(cache.load(API_KEY))
+
+        # 损坏的缓存不带校验信息，服务端返回完整目录并覆盖坏文件
+        result = self.create_service().list_models(API_KEY)
+        self.assertFalse(result["from_cache"])
+        self.assertEqual(len(result["models"]), 50)
+        self.assertEqual(CatalogCache(self.cache_dir).load(API_KEY)["models"], result["models"])
+
+    def test_cache_entry_without_model_list(self):
+        cache = CatalogCache(self.cache_dir)
+        cache._entry_path(API_KEY).write_text('{"models": null, "etag": "x"}', encoding="utf-8")
+        self.assertIsNone(cache.load(API_KEY))
+
+    def test_concurrent_saves_of_one_key(self):
+        cache = CatalogCache(self.cache_dir)
+        catalogs = [[f"org/model-{writer}-{index}" for index in range(2000)] for writer in range(4)]
+
+        def save(models):
+            for _ in range(10):
+                cache.save(API_KEY, models, etag="x")
+
+        threads = [threading.Thread(target=save, args=(models,)) for models in catalogs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # 文件始终是某一次完整写入的内容，也不留下临时文件
+        self.assertIn(CatalogCache(self.cache_dir).load(API_KEY)["models"], catalogs)
+        self.assertEqual([path.name for path in self.cache_dir.iterdir()], [cache._entry_path(API_KEY).name])
+
+
+if __name__ == "__main__":
+    unittest.main()
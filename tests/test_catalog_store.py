@@ -0,0 +1,111 @@
+import itertools
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+import toml
+from bench.catalog_data import generate_catalog
+from core.catalog_store import MEMORY_DATABASE, CatalogStore
+from core.config_manager import ConfigManager
+from core.model_list_logic import filter_models, get_org, merge_models
+from core.model_service import ModelService
+
+SEARCHES = ["", "qwen", "INSTRUCT", "-7b", "/", "no-such-model"]
+
+
+class CatalogStoreEquivalenceTest(unittest.TestCase):
+    """SQLite 存储的筛选与统计结果必须与内存中的 filter_models 一致。"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.tmp.name) / "config.toml"
+        self.api_models = generate_catalog(2000, 7) + ["NoOrgModel", "Qwen/Mixed-Case-Instruct"]
+        self.config_path.write_text(
+            toml.dumps(
+                {
+                    # 收藏与隐藏有交集，也包含目录中不存在的模型
+                    "favorites": self.api_models[::7] + ["ghost/favorite"],
+                    "invisible": self.api_models[::11] + ["ghost/hidden"],
+                    "custom_models": ["custom/my-instruct-7b", self.api_models[3]],
+                }
+            ),
+            encoding="utf-8",
+        )
+        self.memory_config = ConfigManager(self.config_path)
+        self.store_config = ConfigManager(self.config_path)
+        self.store = CatalogStore(MEMORY_DATABASE)
+        self.store_config.attach_store(self.store)
+        self.memory_service = ModelService(self.memory_config)
+        self.store_service = ModelService(self.store_config)
+        self.store_service.sync_store(self.store, self.api_models)
+        self.merged = merge_models(self.api_models, self.memory_config.get_custom_models())
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def expected(self, search_text, favorites_only, hidden_only):
+        return filter_models(
+            self.merged,
+            search_text.lower(),
+            favorites_only,
+            hidden_only,
+            self.memory_config.is_favorite,
+            self.memory_config.is_invisible,
+        )
+
+    def combinations(self):
+        return itertools.product(SEARCHES, (False, True), (False, True))
+
+    def test_search_matches_filter_models(self):
+        for search_text, favorites_only, hidden_only in self.combinations():
+            with self.subTest(search=search_text, favorites=favorites_only, hidden=hidden_only):
+                expected = self.expected(search_text, favorites_only, hidden_only)
+                self.assertEqual(self.store.search(search_text, favorites_only, hidden_only), expected)
+                self.assertEqual(self.store.count(search_text, favorites_only, hidden_only), len(expected))
+
+    def test_count_by_org_matches_filter_models(self):
+        for search_text, favorites_only, hidden_only in self.combinations():
+            with self.subTest(search=search_text, favorites=favorites_only, hidden=hidden_only):
+                counts = Counter(get_org(model_id) for model_id in self.expected(search_text, favorites_only, hidden_only))
+                expected = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+                self.assertEqual(self.store.count_by_org(search_text, favorites_only, hidden_only), expected)
+
+    def test_org_filter(self):
+        for org in ("qwen", "Qwen", ""):
+            with self.subTest(org=org):
+                expected = [model_id for model_id in self.expected("", False, False) if get_org(model_id) == org.casefold()]
+                self.assertEqual(self.store.search("", org=org), expected)
+
+    def test_service_paths_agree(self):
+        for search_text, favorites_only, hidden_only in self.combinations():
+            with self.subTest(search=search_text, favorites=favorites_only, hidden=hidden_only):
+                args = (self.api_models, search_text, favorites_only, hidden_only)
+                self.assertEqual(
+                    self.store_service.build_model_items(*args),
+                    self.memory_service.build_model_items(*args),
+                )
+                self.assertEqual(
+                    self.store_service.count_models_by_org(*args),
+                    self.memory_service.count_models_by_org(*args),
+                )
+
+    def test_flag_changes_are_mirrored(self):
+        model_id = self.api_models[1]
+        for config in (self.memory_config, self.store_config):
+            config.add_favorite(model_id)
+            config.add_invisible(model_id)
+        self.assertEqual(self.store.search("", True, True), self.expected("", True, True))
+        for config in (self.memory_config, self.store_config):
+            config.remove_invisible(model_id)
+        self.assertEqual(self.store.search("", True, False), self.expected("", True, False))
+
+    def test_invalidate_catalog(self):
+        self.assertFalse(self.store.replace_catalog(self.merged))
+        self.store.invalidate_catalog()
+        self.assertTrue(self.store.replace_catalog(self.merged))
+        self.assertEqual(self.store.search(""), self.expected("", False, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import json
+import unittest
+from core import metrics
+from core.catalog_stream import ModelListStreamParser
+from core.modelscope_client import ModelScopeClient
+
+MODEL_IDS = ["Qwen/Qwen3-8B", "深度求索/模型-β", "org/emoji-😀", "a/b", "x/y12"]
+BODY = json.dumps(
+    {
+        "object": "list",
+        "data": [{"id": model_id, "object": "model", "created": 1234567} for model_id in MODEL_IDS],
+        "meta": {"note": "尾部字段", "count": 12345},
+    },
+    ensure_ascii=False,
+).encode("utf-8")
+
+
+def parse_chunks(chunks):
+    parser = ModelListStreamParser()
+    model_ids = []
+    for chunk in chunks:
+        model_ids.extend(parser.feed(chunk))
+    model_ids.extend(parser.close())
+    return model_ids
+
+
+class FakeResponse:
+    def __init__(self, chunks, error=None):
+        self.chunks = chunks
+        self.error = error
+        self.closed = False
+
+    def iter_content(self, chunk_size):
+        yield from self.chunks
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+
+class ModelListStreamParserTest(unittest.TestCase):
+    def test_split_at_every_offset(self):
+        # 切分点会落在多字节 UTF-8 字符、字符串、数字与结构符号的中间
+        for offset in range(len(BODY) + 1):
+            with self.subTest(offset=offset):
+                self.assertEqual(parse_chunks([BODY[:offset], BODY[offset:]]), MODEL_IDS)
+
+    def test_single_byte_chunks(self):
+        self.assertEqual(parse_chunks([BODY[i:i + 1] for i in range(len(BODY))]), MODEL_IDS)
+
+    def test_truncated_input(self):
+        for offset in range(len(BODY)):
+            with self.subTest(offset=offset):
+                with self.assertRaises(ValueError):
+                    parse_chunks([BODY[:offset]])
+
+    def test_data_null(self):
+        body = b'{"object": "list", "data": null, "meta": 1}'
+        self.assertEqual(parse_chunks([body]), [])
+        self.assertEqual(parse_chunks([body[i:i + 1] for i in range(len(body))]), [])
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            parse_chunks([b'{"data": {"id": "a/b"}}'])
+        with self.assertRaises(ValueError):
+            parse_chunks([b'{"data": []} trailing'])
+
+
+class StreamModelIdsTest(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_batches(self):
+        batches = []
+        response = FakeResponse([BODY[:40], BODY[40:]])
+        model_ids = ModelScopeClient()._stream_model_ids(response, batches.append, 2)
+        self.assertEqual(model_ids, MODEL_IDS)
+        self.assertEqual(sum(batches, []), MODEL_IDS)
+
+    def test_transport_error_counted(self):
+        response = FakeResponse([BODY[:40]], error=ConnectionError("reset"))
+        with self.assertRaises(ConnectionError):
+            ModelScopeClient()._stream_model_ids(response, lambda batch: None, 2)
+        self.assertTrue(response.closed)
+        self.assertEqual(metrics.snapshot()["counters"].get("http.errors"), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+from core import config_manager
+from core.config_manager import ConfigManager
+
+
+class ConfigJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = Path(self.tmp.name) / "config.toml"
+        self.journal_path = Path(self.tmp.name) / "config.journal"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def create_manager(self, compact_threshold=5):
+        return ConfigManager(
+            self.config_path,
+            journal_path=self.journal_path,
+            compact_threshold=compact_threshold,
+        )
+
+    def test_compaction_writes_snapshot_and_empties_journal(self):
+        manager = self.create_manager()
+        for index in range(5):
+            manager.add_favorite(f"org/model-{index}")
+            manager.save_config()
+        manager.journal.close()
+
+        self.assertIn("org/model-4", self.config_path.read_text(encoding="utf-8"))
+        self.assertFalse(manager.journal.rotated_path.exists())
+        self.assertEqual(manager.journal.replay(), [])
+        self.assertEqual(self.create_manager().get_favorites(), [f"org/model-{index}" for index in range(5)])
+
+    def test_snapshot_written_outside_config_lock(self):
+        manager = self.create_manager()
+        lock_free = []
+
+        def write(path, text):
+            # 在其他线程中尝试获取配置锁，模拟快照落盘期间界面线程的修改
+            thread = threading.Thread(target=lambda: lock_free.append(manager._lock.acquire(timeout=1)))
+            thread.start()
+            thread.join()
+            manager._lock.release()
+            Path(path).write_text(text, encoding="utf-8")
+
+        with mock.patch.object(config_manager, "atomic_write_text", write):
+            for index in range(5):
+                manager.add_favorite(f"org/model-{index}")
+            manager.flush_config()
+        self.assertEqual(lock_free, [True])
+
+    def test_crash_between_rotation_and_snapshot(self):
+        manager = self.create_manager(compact_threshold=100)
+        manager.add_favorite("org/a")
+        manager.add_favorite("org/b")
+        manager.save_config()
+        # 轮换之后、快照写入之前崩溃：修改只存在于 .old 中
+        manager.journal.rotate()
+        manager.add_invisible("org/c")
+        manager.remove_favorite("org/a")
+        manager.save_config()
+        manager.journal.close()
+
+        reloaded = self.create_manager(compact_threshold=100)
+        self.assertEqual(reloaded.get_favorites(), ["org/b"])
+        self.assertEqual(reloaded.get_invisible(), ["org/c"])
+
+        # 下一次压缩把两个日志合并进快照并删除 .old
+        reloaded.flush_config()
+        reloaded.journal.close()
+        self.assertFalse(reloaded.journal.rotated_path.exists())
+        snapshot = ConfigManager(self.config_path)
+        self.assertEqual(snapshot.get_favorites(), ["org/b"])
+        self.assertEqual(snapshot.get_invisible(), ["org/c"])
+
+    def test_journal_disabled_by_default(self):
+        self.assertFalse(ConfigManager(self.config_path).get_journal_config()["enabled"])
+
+    def test_load_journal_is_read_only(self):
+        writer = self.create_manager(compact_threshold=100)
+        writer.add_favorite("org/a")
+        writer.save_config()
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write('{"op": "add"')
+        journal_bytes = self.journal_path.read_bytes()
+
+        reader = ConfigManager(self.config_path)
+        reader.load_journal(self.journal_path)
+        self.assertEqual(reader.get_favorites(), ["org/a"])
+        # 半条记录可能是写入进程尚未写完的内容，只读重放不截断
+        self.assertEqual(self.journal_path.read_bytes(), journal_bytes)
+        writer.journal.close()
+
+    def test_fold_journal_writes_snapshot_and_removes_journal(self):
+        writer = self.create_manager(compact_threshold=100)
+        writer.add_favorite("org/a")
+        writer.add_invisible("org/b")
+        writer.save_config()
+        writer.journal.close()
+
+        manager = ConfigManager(self.config_path)
+        manager.fold_journal(self.journal_path)
+        self.assertFalse(self.journal_path.exists())
+        snapshot = ConfigManager(self.config_path)
+        self.assertEqual(snapshot.get_favorites(), ["org/a"])
+        self.assertEqual(snapshot.get_invisible(), ["org/b"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import asyncio
+import socket
+import unittest
+from core import metrics
+from core.async_modelscope_client import AsyncModelScopeClient
+from core.modelscope_client import ModelScopeClient
+from core.rate_limiter import RateLimiter
+
+
+def unused_base_url():
+    # 绑定后立即关闭，得到一个没有服务监听的端口
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/v1"
+
+
+class TransportErrorMetricsTest(unittest.TestCase):
+    """连接失败等传输错误也要计入 http.errors。"""
+
+    def setUp(self):
+        metrics.reset()
+        self.base_url = unused_base_url()
+
+    def errors(self):
+        return metrics.snapshot()["counters"].get("http.errors", 0)
+
+    def test_sync_client(self):
+        client = ModelScopeClient(request_timeout=2, base_url=self.base_url, rate_limiter=RateLimiter())
+        with self.assertRaises(Exception):
+            client.list_models("ms-test-key")
+        with self.assertRaises(Exception):
+            client.check_quota("org/model", "ms-test-key")
+        self.assertEqual(self.errors(), 2)
+
+    def test_async_client(self):
+        async def run():
+            async with AsyncModelScopeClient(2, base_url=self.base_url, rate_limiter=RateLimiter()) as client:
+                with self.assertRaises(Exception):
+                    await client.list_models("ms-test-key")
+                with self.assertRaises(Exception):
+                    await client.check_quota("org/model", "ms-test-key")
+
+        asyncio.run(run())
+        self.assertEqual(self.errors(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import random
+import unittest
+from core.model_list_logic import diff_model_ids
+from gui.ui.ui_model_list import ModelListModel
+
+
+def apply_ops(ids, ops):
+    ids = list(ids)
+    for op in ops:
+        if op[0] == "remove":
+            del ids[op[1]:op[1] + op[2]]
+        elif op[0] == "insert":
+            ids[op[1]:op[1]] = op[2]
+        else:
+            ids.insert(op[2], ids.pop(op[1]))
+    return ids
+
+
+def item(model_id):
+    return {"model_id": model_id, "is_favorite": False, "is_custom": False, "is_hidden": False}
+
+
+class DiffModelIdsTest(unittest.TestCase):
+    def test_random_lists_with_duplicate_old_ids(self):
+        rng = random.Random(0)
+        universe = [f"org/m{i}" for i in range(12)]
+        for case in range(3000):
+            with self.subTest(case=case):
+                old_ids = [rng.choice(universe) for _ in range(rng.randint(0, 15))]
+                # 新列表是保持合并顺序的筛选结果，不含重复
+                new_ids = [model_id for model_id in universe if rng.random() < 0.5]
+                self.assertEqual(apply_ops(old_ids, diff_model_ids(old_ids, new_ids)), new_ids)
+
+
+class ModelListModelTest(unittest.TestCase):
+    def test_duplicate_id_across_batches(self):
+        model = ModelListModel()
+        model.append_items([item("org/a"), item("org/b")])
+        model.append_items([item("org/b"), item("org/c"), item("org/c")])
+        self.assertEqual(model.model_ids(), ["org/a", "org/b", "org/c"])
+        self.assertEqual(model.rowCount(), 3)
+
+        # 完整目录到达后的差异更新不留下多余的行
+        model.update_items([item("org/a"), item("org/c"), item("custom/x")])
+        self.assertEqual(model.model_ids(), ["org/a", "org/c", "custom/x"])
+        model.append_items([item("custom/x"), item("org/d")])
+        self.assertEqual(model.model_ids(), ["org/a", "org/c", "custom/x", "org/d"])
+
+
+if __name__ == "__main__":
+    unittest.main()
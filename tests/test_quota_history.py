@@ -0,0 +1,119 @@
+import tempfile
+import unittest
+from pathlib import Path
+from core.quota_history import QuotaHistory
+
+DAY = 86400
+HOUR = 3600
+NOW = 1000 * DAY
+
+
+class FakeClock:
+    def __init__(self, now=NOW):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class QuotaHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.history = QuotaHistory(Path(self.tmp.name) / "quota_history.db", clock=self.clock)
+
+    def tearDown(self):
+        self.history.close()
+        self.tmp.cleanup()
+
+    def record_at(self, ts, remaining, limit=2000, account="work"):
+        self.clock.now = ts
+        self.history.record(account, str(remaining), str(limit))
+
+    def series_ts(self, account="work"):
+        return [ts for ts, _, _ in self.history.get_series(account)]
+
+    def test_compaction_buckets(self):
+        expired = NOW - 200 * DAY
+        daily = NOW - 40 * DAY
+        hourly = NOW - 10 * DAY + 5 * HOUR
+        recent = NOW - HOUR
+        samples = [
+            (expired, 1990),
+            # 超过 30 天：同一天只保留最后一个
+            (daily + 100, 1900), (daily + 200, 1890), (daily + 300, 1880),
+            # 2 到 30 天之间：同一小时只保留最后一个
+            (hourly + 10, 1800), (hourly + 20, 1790), (hourly + HOUR, 1780),
+            # 最近 2 天：原样保留
+            (recent, 1700), (recent + 600, 1690), (recent + 1200, 1680),
+        ]
+        for ts, remaining in samples:
+            self.record_at(ts, remaining)
+
+        self.clock.now = NOW
+        self.history.compact()
+        self.assertEqual(
+            self.series_ts(),
+            [daily + 300, hourly + 20, hourly + HOUR, recent, recent + 600, recent + 1200],
+        )
+
+    def test_forecast_without_data(self):
+        self.assertIsNone(self.history.forecast("work"))
+
+    def test_forecast_needs_ten_minutes(self):
+        self.record_at(NOW - 300, 1000)
+        self.record_at(NOW, 990)
+        forecast = self.history.forecast("work")
+        self.assertEqual(forecast["remaining"], 990)
+        self.assertIsNone(forecast["burn_rate"])
+        self.assertIsNone(forecast["seconds_left"])
+        self.assertIsNone(forecast["exhausted_at"])
+
+    def test_forecast_steady_burn(self):
+        # 一小时内每 5 分钟观测一次，每分钟消耗 1 次
+        for minute in range(0, 61, 5):
+            self.record_at(NOW - HOUR + minute * 60, 1000 - minute)
+        forecast = self.history.forecast("work")
+        self.assertEqual(forecast["remaining"], 940)
+        self.assertAlmostEqual(forecast["burn_rate"], 60.0)
+        self.assertAlmostEqual(forecast["seconds_left"], 940 * 60)
+        self.assertAlmostEqual(forecast["exhausted_at"], NOW + 940 * 60)
+
+    def test_forecast_without_consumption(self):
+        self.record_at(NOW - HOUR, 500)
+        self.record_at(NOW, 500)
+        forecast = self.history.forecast("work")
+        self.assertEqual(forecast["burn_rate"], 0.0)
+        self.assertIsNone(forecast["seconds_left"])
+
+    def test_forecast_after_reset(self):
+        # 恢复之前消耗很快，恢复之后每分钟消耗 1 次，只有恢复后的样本参与估算
+        for minute in range(0, 31, 5):
+            self.record_at(NOW - 2 * HOUR + minute * 60, 500 - minute * 10)
+        for minute in range(0, 21, 5):
+            self.record_at(NOW - 20 * 60 + minute * 60, 2000 - minute)
+        forecast = self.history.forecast("work")
+        self.assertEqual(forecast["remaining"], 1980)
+        self.assertAlmostEqual(forecast["burn_rate"], 60.0)
+        self.assertAlmostEqual(forecast["seconds_left"], 1980 * 60)
+
+    def test_forecast_shortly_after_reset(self):
+        for minute in range(0, 31, 5):
+            self.record_at(NOW - HOUR + minute * 60, 500 - minute)
+        self.record_at(NOW - 120, 2000)
+        self.record_at(NOW, 1999)
+        forecast = self.history.forecast("work")
+        self.assertEqual(forecast["remaining"], 1999)
+        self.assertIsNone(forecast["burn_rate"])
+
+    def test_sparkline_carries_value_from_before_window(self):
+        self.record_at(NOW - 3 * DAY, 1500)
+        self.record_at(NOW - 6 * HOUR + 1, 1400)
+        self.clock.now = NOW
+        values = self.history.get_sparkline_values("work", span=DAY, buckets=4)
+        self.assertEqual(values, [1500, 1500, 1500, 1400])
+        self.assertEqual(self.history.get_sparkline_values("other", span=DAY, buckets=4), [None] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
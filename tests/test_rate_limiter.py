@@ -0,0 +1,47 @@
+import unittest
+from core.errors import RequestCancelledError
+from core.rate_limiter import RateLimiter, WAIT_STEP
+
+EXHAUSTED = {
+    "modelscope-ratelimit-requests-limit": "100",
+    "modelscope-ratelimit-requests-remaining": "0",
+}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class RateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.limiter = RateLimiter(clock=self.clock)
+
+    def test_exhausted_daily_quota_does_not_refill_over_time(self):
+        self.assertEqual(self.limiter.acquire("key"), 0.0)
+        self.limiter.observe("key", None, 200, EXHAUSTED)
+        self.clock.now += 3600
+        # 额度耗尽后只放行一个探测请求，其余请求等待它的响应
+        self.assertEqual(self.limiter.acquire("key"), 0.0)
+        self.assertEqual(self.limiter.acquire("key"), WAIT_STEP)
+
+        self.limiter.observe("key", None, 429, {**EXHAUSTED, "Retry-After": "120"})
+        self.assertEqual(self.limiter.time_until_next("key"), 120.0)
+        self.clock.now += 120
+        self.assertEqual(self.limiter.acquire("key"), 0.0)
+
+    def test_wait_raises_when_cancelled(self):
+        self.limiter.acquire("key", "org/model")
+        self.limiter.observe("key", "org/model", 429, {"Retry-After": "5"})
+        with self.assertRaises(RequestCancelledError):
+            self.limiter.wait("key", "org/model", is_cancelled=lambda: True)
+        # 被取消的等待不预留令牌
+        self.assertEqual(self.limiter._bucket(("user", "key")).inflight, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()